@@ -0,0 +1,58 @@
+"""
+Compares the data file tokenizer (gtool.core.types.core.parseLoadstring) with the pyparsing based
+implementation it replaced. Run from the repository root:
+
+    python benchmark.py [lines]
+"""
+import sys
+import timeit
+from collections import defaultdict
+
+import pyparsing as p
+
+import gtool.core.utils
+from gtool.core.types.core import parseLoadstring
+
+
+def pyparsingLoadstring(loadstring):
+    # reference implementation, as previously found in DynamicType.loads
+    attributeStartMarker = p.LineStart() + p.Literal('@')
+    attributeStopMarker = p.Literal(':')
+    exp = attributeStartMarker.suppress() + p.Word(p.alphanums + '_') + attributeStopMarker.suppress()
+
+    ret = defaultdict(list)
+    for index, line in enumerate(loadstring.splitlines()):
+        result = list(exp.scanString(line))
+        if len(result) > 0:
+            attribname = result[0][0][0]
+            matchstart = result[0][1]
+            matchend = result[0][2] + 1
+            if matchstart == 0:
+                ret[attribname].append(line[matchend:])
+            else:
+                raise Exception('attrib not at the start of the line')
+        else:
+            ret[attribname][-1:] = [ret[attribname][-1:][0] + "" + line.strip()]
+    return ret
+
+
+def sampledata(lines):
+    _ret = []
+    for i in range(lines):
+        if i % 5 == 0:
+            _ret.append('@attrib%s: value %s' % (i % 20, i))
+        else:
+            _ret.append('    continued text on line %s' % i)
+    return '\n'.join(_ret)
+
+
+if __name__ == '__main__':
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = sampledata(lines)
+
+    if dict(pyparsingLoadstring(data)) != parseLoadstring(data):
+        raise SystemExit('tokenizers disagree')
+
+    old = min(timeit.repeat(lambda: pyparsingLoadstring(data), number=1, repeat=3))
+    new = min(timeit.repeat(lambda: parseLoadstring(data), number=1, repeat=3))
+    print('%s lines: pyparsing %.3fs, parseLoadstring %.3fs (%.0fx faster)' % (lines, old, new, old / new))
@@ -0,0 +1,4 @@
+# keep in line with the version in setup.py
+__version__ = '0.1.12'
+
+from gtool.core.project import Project
@@ -1,3 +1,4 @@
+import io
 import os
 
 import patricia as pt
@@ -7,10 +8,14 @@ from functools import lru_cache
 
 # --- static ---
 __DYNAMIC_CLASS = 'filematches'
+__OBJECT_MEMO = '__objectmemo'
 
 def filematcher():
     return __DYNAMIC_CLASS
 
+def objectmemoname():
+    return __OBJECT_MEMO
+
 # a shared globals ala...
 # http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
 
@@ -32,6 +37,34 @@ def filematch(exp):
     except KeyError:
         return None
 
+def registerObjectMemo(memo):
+    """
+    Registers a dict that keeps the object loaded from every node by node path. While a memo is registered,
+    nodes that were loaded before return the same object instead of loading (and registering) it again, so
+    a project structure can be walked and rendered more than once. Entries are removed by whoever changes
+    the data (see gtool.core.utils.watcher).
+    """
+    if globals()[objectmemoname()] is not None:
+        raise KeyError('An object memo has already been registered')
+    else:
+        globals()[objectmemoname()] = memo
+        return True
+
+def unregisterObjectMemo():
+    """
+    Removes the registered object memo, nodes are loaded (and registered) again from then on
+
+    :return: the memo that was registered
+    """
+    _memo = globals()[objectmemoname()]
+    if _memo is None:
+        raise KeyError('No object memo has been registered')
+    globals()[objectmemoname()] = None
+    return _memo
+
+def objectmemo():
+    return globals()[objectmemoname()]
+
 #--- classes ---
 
 def striptoclassname(fullclassstring):
@@ -78,13 +111,40 @@ class StructureFactory(object):
 
     class File(Inode):
 
+        def __init__(self, nodepath=None, nodename=None, parent=None):
+            super().__init__(nodepath=nodepath, nodename=nodename, parent=parent)
+            self.__content__ = None
+            self.__lines__ = None
+
+        @property
+        def content(self):
+            """
+            text of the file, it is only read and decoded the first time it is requested
+            :return: str
+            """
+            if self.__content__ is None:
+                if self.path is None:
+                    raise AttributeError('The file path was not provided when the File object was created')
+                with open(self.path, mode='r') as f:
+                    self.__content__ = f.read()
+            return self.__content__
+
         def read(self):
+            if self.__lines__ is None:
+                self.__lines__ = io.StringIO(self.content).readlines()
+            return self.__lines__
+
+        def startswith(self, prefix):
+            """
+            header sniff that only reads the first characters of the file unless its content is already cached
+            :return: True if the file starts with prefix
+            """
+            if self.__content__ is not None:
+                return self.__content__.startswith(prefix)
             if self.path is None:
                 raise AttributeError('The file path was not provided when the File object was created')
             with open(self.path, mode='r') as f:
-                _ret = f.readlines()
-                f.close()
-            return _ret
+                return f.read(len(prefix)) == prefix
 
 
     class Directory(Inode):
@@ -92,13 +152,27 @@ class StructureFactory(object):
         def __init__(self, nodename=None, parent=None, nodepath=None):
             super().__init__(nodename=nodename, parent=parent, nodepath=nodepath)
             self.__children__ = []
+            self.__names__ = set()
+            # set by the walker, also counts ignored (!) directories
+            self.__containsdirectory__ = False
 
         @property
         def children(self):
             return self.__children__
 
+        @property
+        def names(self):
+            return self.__names__
+
+        @property
+        def containsdirectory(self):
+            return self.__containsdirectory__
+
         def addchild(self, child):
             self.__children__.append(child)
+            self.__names__.add(child.name)
+            if isinstance(child, StructureFactory.Directory):
+                self.__containsdirectory__ = True
             child.addparent(self)
 
         def __repr__(self):
@@ -190,18 +264,23 @@ class StructureFactory(object):
         @property
         def __data__(self):
             if isinstance(self.__inode__, StructureFactory.File):
-                return ''.join(self.__inode__.read())
+                return self.__inode__.content
             else:
                 raise TypeError('%s is not a file' % self.__inode__.path)
 
         @property
         def dataasobject(self):
+            _memo = objectmemo()
+            if _memo is not None and self.path in _memo:
+                return _memo[self.path]
             _retclass = self.__objectmatch__()
             _retobject = _retclass()
             context = {'file': self.path,
                        'parent': self.parent,
                        'class': self.name} #also set in core.DynamicObject.load and CNode below
             if _retobject.loads(self.__data__, context=context): # True if loadstring works
+                if _memo is not None:
+                    _memo[self.path] = _retobject
                 return _retobject
             else:
                 raise TypeError('Could not parse the data from %s into a %s class' % (self.path, type(_retobject)))
@@ -253,16 +332,15 @@ class StructureFactory(object):
             # TODO does not need to be a for loop - can just check if it exists
             _coredata = [f for f in _filelist if f.name == "_.txt"]
             if len(_coredata) == 1:
-                _ret += ''.join(_coredata[0].read())
+                _ret += _coredata[0].content
             else:
                 raise FileNotFoundError('In %s the _.txt file was expected' % self.fileobject.path)
 
             # iterate files that contain a single attribute value
             for _file in (f for f in _filelist if f.name != "_.txt"):
-                _data = ''.join(_file.read())
-                if '@' not in _data[0]:
+                if not _file.startswith('@'):
                     _ret += '\n@%s: ' % _file.name.split('.')[:-1][0]
-                    _ret += _data
+                    _ret += _file.content
                 #TODO find a way to reinstate this code block below (possibly move it into dataasobject)
                 """
                 else:
@@ -273,9 +351,9 @@ class StructureFactory(object):
             for subdir in (f for f in self.fileobject.children if isinstance(f, StructureFactory.Directory)):
                 subfilelist = [subfile for subfile in subdir.children if isinstance(subfile, StructureFactory.File)]
 
-                if '_.txt' not in (subfile.name for subfile in subfilelist) and any('@' not in subfile.read()[0] for subfile in subfilelist):
+                if '_.txt' not in (subfile.name for subfile in subfilelist) and any(not subfile.startswith('@') for subfile in subfilelist):
                     for subfile in subfilelist:
-                        _data = ''.join(subfile.read())
+                        _data = subfile.content
                         #if '@' not in _data[0]: #implemented above in the 'any' condition
                         _ret += '\n@%s: ' % subdir.name
                         if not len(_data) > 0:
@@ -295,7 +373,7 @@ class StructureFactory(object):
 
                 for dynamicproperty in obj.dynamicproperties:
                     if dynamicproperty not in _missingoptional:
-                        _prop = obj.__list_slots__[dynamicproperty].__lazyloadclass__()
+                        _prop = getattr(obj, dynamicproperty).__lazyloadclass__()
                         if _prop in dynamics:
                             _obj = getattr(obj, dynamicproperty)
                             if _obj is not None:
@@ -315,6 +393,9 @@ class StructureFactory(object):
         @property
         @lru_cache() # caches results for when .treestructure calls
         def dataasobject(self):
+            _memo = objectmemo()
+            if _memo is not None and self.path in _memo:
+                return _memo[self.path]
             _retclass = self.__objectmatch__()
             _retobject = _retclass()
             _softload = True
@@ -322,11 +403,14 @@ class StructureFactory(object):
             context = {'file': self.path,
                        'parent': self.__parent__,
                        'class': self.name}  # also set in core.DynamicObject.load and Node aboce
-            if not _retobject.loads(self.__data__, softload=_softload, context=context) and len(self.__data__) > 0:
+            _data = self.__data__
+            if not _retobject.loads(_data, softload=_softload, context=context) and len(_data) > 0:
                 # True if loadstring works but can only be false if self.__data__ has some content
                 # TODO .loads should return true if it functioned correctly, even if self.__data__ is empty
                 raise TypeError('Could not parse the data from %s into a %s class' % (self.path, type(_retobject)))
             if len(_retobject.missingproperties) == 0 and len(_retobject.missingoptionalproperties) == 0:
+                if _memo is not None:
+                    _memo[self.path] = _retobject
                 return _retobject
 
             # --- load missing elements from subfiles if needed
@@ -334,8 +418,7 @@ class StructureFactory(object):
 
             # TODO lots of spaghetti code in here, cleanup up and consolidate (Carefully)
             for _file in (f for f in _filelist if f.name != "_.txt"): # "_.txt" is already loadeded via self.__data__
-                _data = ''.join(_file.read())
-                if '@' in _data[0]:
+                if _file.startswith('@'):
                     # this is an attribute class object (not a common object)
                     _filenamewithoutext = _file.name.split('.')[:-1][0]
                     _attrclassobj = getattr(_retobject, _filenamewithoutext)
@@ -359,7 +442,7 @@ class StructureFactory(object):
                 #print('subfilelist:', subfilelist)
 
                 # handles subdirectories with root file
-                if '_.txt' in (subfile.name for subfile in subfilelist):
+                if '_.txt' in subdir.names:
                     """
                     for subfile in subfilelist:
                         objectname = getattr(_retobject, subfile.parent.name).attrtype.classfile()
@@ -400,7 +483,7 @@ class StructureFactory(object):
                 # handles subdirectories without a root file
 
                 else: #if any('@' in subfile.read()[0] for subfile in subfilelist if isinstance(subfile, StructureFactory.File)):
-                    objectsInFiles = any('@' in subfile.read()[0] for subfile in subfilelist if
+                    objectsInFiles = any(subfile.startswith('@') for subfile in subfilelist if
                         isinstance(subfile, StructureFactory.File))
                     objectsInDirectories = all(isinstance(subfile, StructureFactory.Directory) for subfile in subfilelist)
                     # TODO True and True probably should not happen - make a check
@@ -409,7 +492,7 @@ class StructureFactory(object):
                     if objectsInFiles or objectsInDirectories:
                         for subfile in subfilelist:
                             objectname = getattr(_retobject, subfile.parent.name).attrtype.classfile()
-                            if any(os.path.isdir(os.path.join(subdir.path, f)) for f in os.listdir(subdir.path)):
+                            if subdir.containsdirectory:
                                 _attrobj = StructureFactory.CNode(name=objectname, fileobject=subfile)
                             else:
                                 _attrobj = StructureFactory.Node(name=objectname, fileobject=subfile)
@@ -430,6 +513,8 @@ class StructureFactory(object):
                 raise TypeError('The following mandatory attributes are missing %s for the %s class at %s' %
                                 (_retobject.missingproperties, type(_retobject), self.path))
 
+            if _memo is not None:
+                _memo[self.path] = _retobject
             return _retobject
 
         def dataaslist(self, returnmatrix):
@@ -440,15 +525,18 @@ class StructureFactory(object):
 
     @staticmethod
     def __treewalk__(root):
-        inodes = os.listdir(root.path)
-        for inode in inodes:
-            if not inode.startswith('!'):
-                fullpath = os.path.join(root.path, inode)
-                if os.path.isfile(fullpath):
-                    _f = StructureFactory.File(nodename=inode, nodepath=fullpath)  # parent=root,
+        # single pass with scandir, the entry types are cached so no extra stat calls are made per inode.
+        # Nothing after the walk needs to go back to the file system except for reading file contents
+        with os.scandir(root.path) as inodes:
+            for inode in inodes:
+                if inode.name.startswith('!'):
+                    if inode.is_dir():
+                        root.__containsdirectory__ = True
+                elif inode.is_file():
+                    _f = StructureFactory.File(nodename=inode.name, nodepath=inode.path)  # parent=root,
                     root.addchild(_f)
-                elif os.path.isdir(fullpath):
-                    _d = StructureFactory.Directory(nodename=inode, nodepath=fullpath)  # , parent=root
+                elif inode.is_dir():
+                    _d = StructureFactory.Directory(nodename=inode.name, nodepath=inode.path)  # , parent=root
                     root.addchild(_d)
                     StructureFactory.__treewalk__(_d)
 
@@ -458,7 +546,7 @@ class StructureFactory(object):
         def recursivewalk(location=None, isroot=False):
             #TODO deal with multiple files in a dir and multiple dirs at the root
             if isinstance(location, StructureFactory.Directory):
-                if '_.txt' in [f.name for f in location.children]:
+                if '_.txt' in location.names:
                     return StructureFactory.CNode(fileobject=location, name=location.name)
                 else:
                     # special handler for root of structure
@@ -487,3 +575,4 @@ class StructureFactory(object):
 
 #--- initialize namespace
 globals()[filematcher()] = pt.trie('_')
+globals()[objectmemoname()] = None
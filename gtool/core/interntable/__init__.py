@@ -0,0 +1,44 @@
+# --- static ---
+__INTERN_TABLE = '__interntable'
+
+def interntablename():
+    return __INTERN_TABLE
+
+# a shared globals ala...
+# http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
+
+def registerInternTable(table):
+    if globals()[interntablename()] is not None:
+        raise KeyError('An intern table has already been registered')
+    else:
+        globals()[interntablename()] = table
+        return True
+
+def interntable():
+    return globals()[interntablename()]
+
+
+def internvalue(item):
+    """
+    Values of a type that can be interned (see CoreType.__internkey__) are shared by all attributes that hold an
+    equal value once an intern table is registered
+
+    :param item: a validated value
+    :return: the instance of an equal value seen before, item if there is none or it cannot be interned
+    """
+    _table = interntable()
+    if _table is None:
+        return item
+
+    _key = item.__internkey__() if hasattr(item, '__internkey__') else None
+    if _key is None:
+        return item
+
+    try:
+        return _table.setdefault((type(item), _key), item)
+    except TypeError:
+        # values that are not hashable are not shared
+        return item
+
+
+globals()[interntablename()] = None
@@ -1,5 +1,8 @@
 from gtool.core.utils.config import namespace
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from fnmatch import fnmatchcase
+from functools import lru_cache
 from gtool.core.utils.misc import striptoclassname
 
 # --- statics ---
@@ -16,6 +19,22 @@ def attribindex():
     __ATTRIB_INDEX = '__attribindex'
     return __ATTRIB_INDEX
 
+def valueindex():
+    __VALUE_INDEX = '__valueindex'
+    return __VALUE_INDEX
+
+def rangeindex():
+    __RANGE_INDEX = '__rangeindex'
+    return __RANGE_INDEX
+
+def uriindex():
+    __URI_INDEX = '__uriindex'
+    return __URI_INDEX
+
+# kinds of value index that can be set for an attribute in [index] of gtool.cfg
+VALUEINDEX = 'value'
+RANGEINDEX = 'range'
+
 # a shared globals ala...
 # http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
 
@@ -28,6 +47,190 @@ def convert(path):
 
     return path.lower()
 
+@lru_cache(maxsize=None)
+def typename(objecttype):
+    """
+    :return: the lower case class name of a type, as used by the indexes
+    """
+    return striptoclassname(objecttype).lower()
+
+def objectkey(obj):
+    """
+    Objects are kept once per attribute by the attribute index, objects of the same type loaded from the same file
+    are equal (see DynamicType.__eq__)
+    """
+    _file = (obj.__context__ or {}).get('file', None)
+    return (type(obj), _file) if _file is not None else id(obj)
+
+def normalize(value):
+    """
+    :return: the value as it is kept by the value indexes, strings are stripped and compared in lower case
+    """
+    return value.strip().lower() if isinstance(value, str) else value
+
+def attribvalues(obj, attribname):
+    """
+    :return: the normalized raw values held by an attribute of an object, values that are objects are skipped
+    """
+    for name, _attribute in zip(obj.__dynamic_properties__, obj.__values__):
+        if name.lower() == attribname:
+            return [normalize(item.raw()) for item in _attribute if hasattr(item, 'raw')]
+    return []
+
+def convertvalue(attribname, value):
+    """
+    Converts a value written as text (e.g. in an aggregator selector) to the raw type of an attribute, with the
+    converter of the type the attribute has in the class of the first registered object that has it
+
+    :return: the converted value, value if no registered object has the attribute or its type has no converter
+    """
+    _attribname = attribname.lower()
+    for obj in attribnamespace().get(_attribname, {}).values():
+        for name, schema in type(obj).__attribute_schema__.items():
+            if name.lower() == _attribname:
+                schema.__lazyloadclass__()
+                if schema.converter is None:
+                    return value
+                try:
+                    return schema.converter(value)
+                except (TypeError, ValueError) as err:
+                    raise ValueError('%s cannot be converted to the type of @%s: %s' % (value, attribname, err))
+        # the attribute is a method of the object
+        return value
+    return value
+
+class sortedindex(object):
+    """
+    The values of an attribute in order, for range lookups with bisect. Values are appended as objects are
+    registered and sorted on the first lookup after a change.
+    """
+
+    def __init__(self, attribname):
+        self.attribname = attribname
+        self.entries = [] # (value, sequence, object), the sequence keeps equal values in order of registration
+        self.keys = []
+        self.sequence = 0
+        self.sorted = True
+
+    def add(self, value, obj):
+        self.entries.append((value, self.sequence, obj))
+        self.sequence += 1
+        self.sorted = False
+
+    def remove(self, obj):
+        self.entries = [entry for entry in self.entries if entry[2] is not obj]
+        self.sorted = False
+
+    def __sort__(self):
+        try:
+            self.entries.sort(key=lambda entry: entry[:2])
+        except TypeError:
+            raise TypeError('The values of @%s cannot be ordered for a range lookup' % self.attribname)
+        self.keys = [entry[0] for entry in self.entries]
+        self.sorted = True
+
+    def range(self, low=None, high=None, includelow=True, includehigh=True):
+        """
+        :return: objects with a value between low and high (None for no bound) ordered by value
+        """
+        if not self.sorted:
+            self.__sort__()
+        try:
+            _start = 0 if low is None else (bisect_left if includelow else bisect_right)(self.keys, low)
+            _end = len(self.keys) if high is None else (bisect_right if includehigh else bisect_left)(self.keys,
+                                                                                                       high)
+        except TypeError:
+            raise TypeError('The values of @%s cannot be compared with %s/%s' % (self.attribname, low, high))
+        return uniqueobjects(entry[2] for entry in self.entries[_start:_end])
+
+class uritrie(object):
+    """
+    A node of the trie of the registered URI's by path segment, /risks/r1 is kept as risks -> r1. Prefix and
+    pattern lookups only visit the nodes below the matching paths.
+    """
+
+    __slots__ = ('children', 'obj')
+
+    def __init__(self):
+        self.children = {}
+        self.obj = None
+
+    def insert(self, segments, obj):
+        _node = self
+        for segment in segments:
+            _node = _node.children.setdefault(segment, uritrie())
+        _node.obj = obj
+
+    def remove(self, segments, obj):
+        _path = [self]
+        for segment in segments:
+            _path.append(_path[-1].children.get(segment, None))
+            if _path[-1] is None:
+                return False
+        if _path[-1].obj is not obj:
+            return False
+        _path[-1].obj = None
+        # drop the nodes that lead to nothing anymore
+        for parent, segment, node in reversed(list(zip(_path, segments, _path[1:]))):
+            if node.obj is not None or len(node.children) > 0:
+                break
+            del parent.children[segment]
+        return True
+
+    def node(self, segments):
+        _node = self
+        for segment in segments:
+            _node = _node.children.get(segment, None)
+            if _node is None:
+                break
+        return _node
+
+    def objects(self):
+        """
+        :return: the objects of this node and all nodes below it, parents before children
+        """
+        _stack = [self]
+        while len(_stack) > 0:
+            _node = _stack.pop()
+            if _node.obj is not None:
+                yield _node.obj
+            _stack.extend(reversed(list(_node.children.values())))
+
+    def match(self, segments):
+        """
+        :param segments: path segments, * (or another fnmatch pattern) matches one segment, ** any number of them
+        :return: the matching objects, parents before children
+        """
+        if len(segments) == 0:
+            if self.obj is not None:
+                yield self.obj
+            return
+        _segment, _rest = segments[0], segments[1:]
+        if _segment == '**':
+            if len(_rest) == 0:
+                yield from self.objects()
+                return
+            yield from self.match(_rest)
+            for child in self.children.values():
+                yield from child.match(segments)
+        elif '*' in _segment or '?' in _segment or '[' in _segment:
+            for name, child in self.children.items():
+                if fnmatchcase(name, _segment):
+                    yield from child.match(_rest)
+        else:
+            _child = self.children.get(_segment, None)
+            if _child is not None:
+                yield from _child.match(_rest)
+
+def urisegments(uri):
+    return [segment for segment in convert(uri).split('/') if segment != '']
+
+def uniqueobjects(objects):
+    _unique = {}
+    for obj in objects:
+        _unique.setdefault(objectkey(obj), obj)
+    return list(_unique.values())
+
 def stripToUri(objectPath):
     if objectPath.endswith('.txt'):
         objectPath = objectPath[:-4]
@@ -56,38 +259,125 @@ def registerObject(objectPath, obj):
     else:
         # store an object by URI
         nodenamespace()[convert(objectPath)] = obj
+        uritrienamespace().insert(urisegments(objectPath), obj)
         # store all URI's by object
-        _key = striptoclassname(type(obj)).lower()
+        _key = typename(type(obj))
         nodenamespacereverse()[_key].append(convert(objectPath))
-        # store objects by attribute name
+        # store objects by attribute name, in the order they are registered
+        _objkey = objectkey(obj)
+        _attribnamespace = attribnamespace()
         for k, v in obj:
-            if k.lower() not in attribnamespace():
-                attribnamespace()[k.lower()].append(obj)
-            else:
-                _objlist = attribnamespace()[k.lower()]
-                if obj not in _objlist:
-                    attribnamespace()[k.lower()].append(obj)
+            _attribnamespace[k.lower()].setdefault(_objkey, obj)
+        # store objects by the values of the attributes set in [index] of gtool.cfg
+        for _attribname, _values in valuenamespace().items():
+            _sorted = rangenamespace().get(_attribname, None)
+            for _value in attribvalues(obj, _attribname):
+                if _values[_value].setdefault(_objkey, obj) is obj and _sorted is not None:
+                    _sorted.add(_value, obj)
+        return True
+
+def unregisterObject(obj):
+    """
+    Removes an object that was registered by registerObject from all indexes.
+    """
+    _uri = objectUri(obj)
+
+    if nodenamespace().get(_uri, None) is not obj:
+        raise KeyError('Tried to remove a node that is not registered. node name: %s' % _uri)
+    else:
+        del nodenamespace()[_uri]
+        uritrienamespace().remove(urisegments(_uri), obj)
+        _key = typename(type(obj))
+        if _uri in nodenamespacereverse().get(_key, []):
+            nodenamespacereverse()[_key].remove(_uri)
+        _objkey = objectkey(obj)
+        for k, v in obj:
+            _objects = attribnamespace().get(k.lower(), None)
+            # compare by identity, an equal object may have been registered instead of this one
+            if _objects is not None and _objects.get(_objkey, None) is obj:
+                del _objects[_objkey]
+        for _attribname, _values in valuenamespace().items():
+            for _value in attribvalues(obj, _attribname):
+                if _values.get(_value, {}).get(_objkey, None) is obj:
+                    del _values[_value][_objkey]
+            if _attribname in rangenamespace():
+                rangenamespace()[_attribname].remove(obj)
+        return True
+
+def registerAttribIndex(attribname, indextype):
+    """
+    Keeps the objects registered from now on by the values of an attribute, for searchByAttribValue and (for a
+    range index) searchByAttribRange. Attributes are indexed by name whatever the class of the object.
+
+    :param indextype: VALUEINDEX for lookups of equal values, RANGEINDEX for range lookups as well
+    """
+    _attribname = attribname.lower()
+    if indextype not in (VALUEINDEX, RANGEINDEX):
+        raise ValueError('The index of @%s should be %s or %s but got %s' % (attribname, VALUEINDEX, RANGEINDEX,
+                                                                              indextype))
+    if _attribname in valuenamespace():
+        raise KeyError('One index tried to overwrite an existing one. attribute name: %s' % attribname)
+    else:
+        valuenamespace()[_attribname] = defaultdict(dict)
+        if indextype == RANGEINDEX:
+            rangenamespace()[_attribname] = sortedindex(_attribname)
         return True
 
 # I want all the objects with a certain attribute
 def searchByAttrib(attribname):
-    return attribnamespace()[attribname.lower()]
+    return list(attribnamespace().get(attribname.lower(), {}).values())
+
+# I want all the objects with a certain value for an attribute
+def searchByAttribValue(attribname, value):
+    _attribname = attribname.lower()
+    _value = normalize(value)
+    if _attribname in valuenamespace():
+        return list(valuenamespace()[_attribname].get(_value, {}).values())
+    return [obj for obj in searchByAttrib(_attribname) if _value in attribvalues(obj, _attribname)]
+
+# I want all the objects with a value for an attribute between two values, ordered by value
+def searchByAttribRange(attribname, low=None, high=None, includelow=True, includehigh=True):
+    _attribname = attribname.lower()
+    _low, _high = normalize(low), normalize(high)
+    if _attribname in rangenamespace():
+        return rangenamespace()[_attribname].range(_low, _high, includelow=includelow, includehigh=includehigh)
+    # without a range index the values are sorted here, the same way
+    _sorted = sortedindex(_attribname)
+    for obj in searchByAttrib(_attribname):
+        for _value in attribvalues(obj, _attribname):
+            _sorted.add(_value, obj)
+    return _sorted.range(_low, _high, includelow=includelow, includehigh=includehigh)
 
 # I want all the objects with a certain attribute but only of a certain type
 def searchByAttribAndObjectType(attribname, objecttype):
-    return [obj for obj in searchByAttrib(attribname) if striptoclassname(type(obj)).lower() == objecttype.lower()]
+    _objecttype = objecttype.lower()
+    return [obj for obj in searchByAttrib(attribname) if typename(type(obj)) == _objecttype]
 
 # return object at specific URI
 def getObjectByUri(uri):
     return nodenamespace().get(convert(uri), None)
 
+# return the object at a URI and all objects below it
+def getObjectsByUriPrefix(uri):
+    _node = uritrienamespace().node(urisegments(uri))
+    return list(_node.objects()) if _node is not None else []
+
+# return objects at URI's that match a pattern such as /risks/*/r1 or /risks/** (see uritrie.match)
+def getObjectsByUriPattern(pattern):
+    return uniqueobjects(uritrienamespace().match(urisegments(pattern)))
+
+# return objects at URI's that match a pattern that have a certain attribute
+def searchByUriPatternAndAttrib(pattern, attribname):
+    _objects = attribnamespace().get(attribname.lower(), {})
+    return [obj for obj in getObjectsByUriPattern(pattern) if _objects.get(objectkey(obj), None) is obj]
+
 # return objects that match the URI fragment
 def getObjectByUriElement(urielement):
     return [v for k, v in nodenamespace().items() if convert(urielement) in k]
 
 # return objects that match the URI fragment only if they are of a specific type
 def getObjectByUriElementAndType(urielement, objectype):
-    return [obj for path, obj in nodenamespace().items() if convert(urielement) in path and striptoclassname(type(obj)).lower() == objectype.lower()]
+    return [obj for path, obj in nodenamespace().items() if convert(urielement) in path and typename(type(obj)) == objectype.lower()]
 
 def objectUri(obj):
     return convert(stripToUri(obj.__context__['file']))
@@ -108,10 +398,25 @@ def nodenamespacereverse():
     return globals()[nodeindexreverse()]
 
 def attribnamespace():
-    # store objects by attribute name
+    # store objects by attribute name, as dicts of objectkey -> object
     return globals()[attribindex()]
 
+def uritrienamespace():
+    # store objects by the path segments of their URI
+    return globals()[uriindex()]
+
+def valuenamespace():
+    # store objects by attribute name and normalized value, for the attributes in [index] of gtool.cfg
+    return globals()[valueindex()]
+
+def rangenamespace():
+    # store the values of attributes with a range index in order (see sortedindex)
+    return globals()[rangeindex()]
+
 #--- initialize namespace
 globals()[nodeindex()] = dict()
 globals()[nodeindexreverse()] = defaultdict(list)
-globals()[attribindex()] = defaultdict(list)
\ No newline at end of file
+globals()[attribindex()] = defaultdict(dict)
+globals()[valueindex()] = dict()
+globals()[rangeindex()] = dict()
+globals()[uriindex()] = uritrie()
\ No newline at end of file
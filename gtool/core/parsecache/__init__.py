@@ -0,0 +1,203 @@
+import os
+import json
+import hashlib
+
+# --- static ---
+__PARSE_CACHE = '__parsecache'
+CACHEDIR = '.gtool-cache'
+CACHEVERSION = 1
+
+def parsecachename():
+    return __PARSE_CACHE
+
+# a shared globals ala...
+# http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
+
+def registerParseCache(cache):
+    if globals()[parsecachename()] is not None:
+        raise KeyError('A parse cache has already been registered')
+    else:
+        globals()[parsecachename()] = cache
+        return True
+
+def parsecache():
+    return globals()[parsecachename()]
+
+
+def contenthash(loadstring):
+    return hashlib.sha1(loadstring.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def filestat(path):
+    """
+    mtime and size of a data file, None for directories (CNodes) which are only checked by content hash
+    """
+    if path is not None and os.path.isfile(path):
+        _stat = os.stat(path)
+        return [_stat.st_mtime_ns, _stat.st_size]
+    return None
+
+
+def fingerprint(classdict):
+    """
+    Hashes a class definition (as returned by readClass) so that cached data can be tied to the
+    exact class it was loaded with.
+
+    :param classdict: dict describing a single class
+    :return: hex digest string
+    """
+    def _normalize(item):
+        if hasattr(item, 'asList'):
+            return item.asList()
+        return '%s' % item
+
+    return hashlib.sha1(json.dumps(classdict, sort_keys=True, default=_normalize).encode('utf-8')).hexdigest()
+
+
+class ParseCache(object):
+    """
+    Keeps the parsed and converted attribute map of every data file loaded by DynamicType.loads so that
+    unchanged files do not have to go through the parser again.
+
+    Entries are stored per class in <projectroot>/.gtool-cache/parse/<CLASSNAME>.json and are keyed by
+    file path. An entry is only reused when the file's mtime, size and content hash and the fingerprint
+    of the class definition all match, so editing a class file only invalidates the objects of that class.
+    A cache created without a path lives in memory only.
+
+    Entries merged from the worker processes of gtool.core.utils.parallel.prefetch were loaded (and validated)
+    by the worker during this run, they are reused when the file's mtime and size match without hashing it again.
+    """
+
+    def __init__(self, cachepath=None):
+        self.__cachepath__ = cachepath
+        self.__classes__ = {}
+        self.__dirty__ = set()
+        self.__seen__ = {}
+        self.__prefetched__ = {}
+
+    def __classfile__(self, classname):
+        return os.path.join(self.__cachepath__, 'parse', '%s.json' % classname)
+
+    def __read__(self, classname):
+        if self.__cachepath__ is None:
+            return None
+        try:
+            with open(self.__classfile__(classname), mode='r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            # a missing or damaged cache file is simply rebuilt
+            return None
+
+    def __classcache__(self, classname, classfingerprint):
+        _cache = self.__classes__.get(classname, None)
+        if _cache is None:
+            _cache = self.__read__(classname)
+        if _cache is None or \
+                _cache.get('version', None) != CACHEVERSION or \
+                _cache.get('fingerprint', None) != classfingerprint:
+            _cache = {'version': CACHEVERSION, 'fingerprint': classfingerprint, 'entries': {}}
+            self.__dirty__.add(classname)
+        self.__classes__[classname] = _cache
+        return _cache
+
+    def fetch(self, path, classname, classfingerprint, loadstring):
+        """
+        :return: the cached attribute map for path or None if there is no valid entry
+        """
+        _entry = self.__classcache__(classname, classfingerprint)['entries'].get(path, None)
+        if _entry is None:
+            return None
+        if _entry['stat'] != filestat(path):
+            return None
+        # directories (CNodes) have no stat and are always checked by content hash
+        if (_entry['stat'] is None or not self.prefetched(path, classname)) and \
+                _entry['hash'] != contenthash(loadstring):
+            return None
+        self.__seen__.setdefault(classname, set()).add(path)
+        return _entry['data']
+
+    def prefetched(self, path, classname):
+        """
+        :return: True if the entry for path was merged from a prefetch worker, its values passed the validation of
+        the class there and do not need to be validated again
+        """
+        return path in self.__prefetched__.get(classname, ())
+
+    def store(self, path, classname, classfingerprint, loadstring, data):
+        """
+        Adds or replaces the entry for path. Values that cannot be serialized (e.g. produced by a custom
+        converter) are not cached.
+
+        :return: True if the entry was stored
+        """
+        try:
+            json.dumps(data)
+        except (TypeError, ValueError):
+            return False
+        self.__classcache__(classname, classfingerprint)['entries'][path] = {
+            'stat': filestat(path),
+            'hash': contenthash(loadstring),
+            'data': data
+        }
+        self.__seen__.setdefault(classname, set()).add(path)
+        self.__dirty__.add(classname)
+        return True
+
+    def export(self):
+        """
+        Returns the entries used or stored since the last export so that they can be shipped to another process.
+
+        :return: list of (classname, fingerprint, path, entry) tuples
+        """
+        _ret = []
+        for classname, paths in self.__seen__.items():
+            _cache = self.__classes__[classname]
+            for path in paths:
+                _ret.append((classname, _cache['fingerprint'], path, _cache['entries'][path]))
+        self.__seen__ = {}
+        return _ret
+
+    def merge(self, entries, prefetched=False):
+        """
+        Adds entries produced by ParseCache.export in another process
+
+        :param prefetched: the entries were loaded and validated by the other process (see prefetched)
+        """
+        for classname, classfingerprint, path, entry in entries:
+            self.__classcache__(classname, classfingerprint)['entries'][path] = entry
+            self.__dirty__.add(classname)
+            if prefetched:
+                self.__prefetched__.setdefault(classname, set()).add(path)
+        return True
+
+    def save(self, prune=False):
+        """
+        Writes changed classes to disk.
+
+        :param prune: drop entries that were not used during this run (only safe after a complete run)
+        """
+        if self.__cachepath__ is None:
+            return False
+
+        if prune:
+            for classname, _cache in self.__classes__.items():
+                _seen = self.__seen__.get(classname, set())
+                if len(_seen) != len(_cache['entries']):
+                    _cache['entries'] = {k: v for k, v in _cache['entries'].items() if k in _seen}
+                    self.__dirty__.add(classname)
+
+        if len(self.__dirty__) == 0:
+            return True
+
+        os.makedirs(os.path.join(self.__cachepath__, 'parse'), exist_ok=True)
+        for classname in self.__dirty__:
+            _classfile = self.__classfile__(classname)
+            with open(_classfile + '.tmp', mode='w', encoding='utf-8') as f:
+                json.dump(self.__classes__[classname], f)
+            os.replace(_classfile + '.tmp', _classfile)
+        self.__dirty__ = set()
+        return True
+
+
+#--- initialize namespace
+globals()[parsecachename()] = None
@@ -1,19 +1,207 @@
 from pluginbase import PluginBase
+from importlib.machinery import PathFinder
+from gtool.core.parsecache import CACHEDIR
+import ast
+import inspect
+import json
 import os
 
+INDEXFILE = 'plugins.json'
+INDEXVERSION = 1
+
 def loadplugins(pluginbasepath, verbose=False, silent=False):
-    plugin_base = PluginBase(package='gtool.plugins')
-    plugin_source = plugin_base.make_plugin_source(searchpath=__enumerateplugins(pluginbasepath), identifier='gtool', persist=True)
-
-    _plugins = plugin_source.list_plugins()
-    for plugin_name in _plugins:  #plugin_source.list_plugins():
-        if verbose:
-            print('[VERBOSE] loading plug-in:', plugin_name)
-        _plugin = plugin_source.load_plugin(plugin_name)
-        registerPlugin(plugin_name.upper(), _plugin.load())
+    # the gtool plugins and the plugins of a project come from separate sources, so that projects loaded into one
+    # interpreter import the gtool plugins (and the libraries they use) once. A gtool plugin takes precedence over
+    # a project plugin with the same name
+    _gtoolplugins, _projectplugins = __enumerateplugins(pluginbasepath)
+    _sources = [__pluginsource('gtool', [_gtoolplugins]),
+                __pluginsource('gtool|%s' % os.path.abspath(_projectplugins), [_projectplugins])]
+
+    # plugins are registered from an index and imported when they are first used (see PluginNamespace)
+    _indexpath = os.path.join(pluginbasepath, CACHEDIR, INDEXFILE)
+    _index = __readindex(_indexpath)
+    _entries = {}
+
+    _plugins = []
+    for plugin_source in _sources:
+        for plugin_name in plugin_source.list_plugins():
+            if plugin_name in _plugins:
+                continue
+            _plugins.append(plugin_name)
+            if verbose:
+                print('[VERBOSE] loading plug-in:', plugin_name)
+            _plugin, _entry = __indexplugin(plugin_source, plugin_name, _index)
+            if _entry is not None:
+                _entries[_entry['path']] = _entry
+            registerPlugin(plugin_name.upper(), _plugin)
     if not verbose and not silent:
             print('Loaded %s plugins (use verbose mode to list them)' % len(_plugins))
 
+    if _entries != _index:
+        __writeindex(_indexpath, _entries)
+
+class LazyPlugin(object):
+    """
+    Stands in for a plugin in the plugin namespace until the plugin is first used
+
+    :param bases: names of the gtool classes (CoreType, FunctionType, Aggregator, Output, GridOutput,
+    TreeOutput) the plugin derives from
+    """
+
+    def __init__(self, source, name, bases):
+        self.source = source
+        self.name = name
+        self.bases = bases
+
+    def __repr__(self):
+        return '%s: %s' % (type(self), self.name)
+
+    def load(self):
+        return self.source.load_plugin(self.name).load()
+
+class PluginNamespace(dict):
+    """
+    Plugins by name. A plugin module (and the libraries it uses) is imported when the plugin is first looked up,
+    listing the values or items imports all plugins.
+    """
+
+    def __getitem__(self, pluginName):
+        _plugin = dict.__getitem__(self, pluginName)
+        if isinstance(_plugin, LazyPlugin):
+            _plugin = _plugin.load()
+            dict.__setitem__(self, pluginName, _plugin)
+        return _plugin
+
+    def get(self, pluginName, default=None):
+        if pluginName in self:
+            return self[pluginName]
+        return default
+
+    def values(self):
+        return [self[pluginName] for pluginName in self]
+
+    def items(self):
+        return [(pluginName, self[pluginName]) for pluginName in self]
+
+    def loaded(self, pluginName):
+        return not isinstance(dict.__getitem__(self, pluginName), LazyPlugin)
+
+def pluginbases(pluginName):
+    """
+    Names of the gtool classes a plugin derives from, without importing the plugin if it was not used yet
+
+    :return: list, e.g. ['Output', 'TreeOutput'] for the json plugin
+    """
+    _plugin = dict.__getitem__(globals()[plugins()], pluginName)
+    if isinstance(_plugin, LazyPlugin):
+        return _plugin.bases
+    return __classbases(_plugin)
+
+def __gtoolbases():
+    # imported here, the type modules import the plugin namespace
+    import gtool.core.types.core as coretypes
+    import gtool.core.types.output as outputtypes
+    return {cls.__name__: cls for cls in (coretypes.CoreType, coretypes.FunctionType, coretypes.Aggregator,
+                                          outputtypes.Output, outputtypes.GridOutput, outputtypes.TreeOutput)}
+
+def __classbases(pluginclass):
+    _gtoolbases = __gtoolbases()
+    return [cls.__name__ for cls in inspect.getmro(pluginclass) if _gtoolbases.get(cls.__name__, None) is cls]
+
+def __parsebases(path):
+    """
+    Finds the gtool classes the class returned by load() of a plugin module derives from by reading its source
+
+    :return: list of class names, None if they cannot be told without importing the module
+    """
+    with open(path, mode='r', encoding='utf-8') as f:
+        _module = ast.parse(f.read(), filename=path)
+
+    _classes = {node.name: node for node in _module.body if isinstance(node, ast.ClassDef)}
+    _loaders = [node for node in _module.body if isinstance(node, ast.FunctionDef) and node.name == 'load']
+    if len(_loaders) != 1 or len(_loaders[0].body) != 1 or not isinstance(_loaders[0].body[0], ast.Return) \
+            or not isinstance(_loaders[0].body[0].value, ast.Name):
+        return None
+
+    _gtoolbases = __gtoolbases()
+
+    def _bases(classname, seen):
+        if classname in seen or classname not in _classes:
+            return None
+        _ret = []
+        for base in _classes[classname].bases:
+            _name = base.id if isinstance(base, ast.Name) else base.attr if isinstance(base, ast.Attribute) else None
+            if _name in _gtoolbases:
+                _ret.extend(cls.__name__ for cls in inspect.getmro(_gtoolbases[_name]) if cls.__name__ in _gtoolbases)
+            elif _name == 'object':
+                continue
+            else:
+                _inherited = _bases(_name, seen | {classname})
+                if _inherited is None:
+                    return None
+                _ret.extend(_inherited)
+        # keep the order of the method resolution, without duplicates
+        return [name for i, name in enumerate(_ret) if name not in _ret[:i]]
+
+    return _bases(_loaders[0].body[0].value.id, frozenset())
+
+def __indexplugin(plugin_source, plugin_name, index):
+    """
+    :return: tuple of the plugin (a LazyPlugin unless the module had to be imported to index it) and its
+    index entry, None if the plugin is not a source file
+    """
+    _spec = PathFinder.find_spec(plugin_name, plugin_source.mod.__path__)
+    _path = None if _spec is None or _spec.origin is None or not _spec.origin.endswith('.py') \
+        else os.path.abspath(_spec.origin)
+    if _path is None:
+        _plugin = plugin_source.load_plugin(plugin_name).load()
+        return _plugin, None
+
+    _stat = os.stat(_path)
+    _entry = index.get(_path, None)
+    if _entry is not None and _entry['name'] == plugin_name and _entry['mtime'] == _stat.st_mtime \
+            and _entry['size'] == _stat.st_size:
+        return LazyPlugin(plugin_source, plugin_name, _entry['bases']), _entry
+
+    _entry = {'path': _path, 'name': plugin_name, 'mtime': _stat.st_mtime, 'size': _stat.st_size}
+    _bases = __parsebases(_path)
+    if _bases is None:
+        # the plugin does not derive from gtool classes in a way that can be read from its source
+        _plugin = plugin_source.load_plugin(plugin_name).load()
+        _entry['bases'] = __classbases(_plugin)
+        return _plugin, _entry
+
+    _entry['bases'] = _bases
+    return LazyPlugin(plugin_source, plugin_name, _bases), _entry
+
+def __readindex(indexpath):
+    try:
+        with open(indexpath, mode='r', encoding='utf-8') as f:
+            _index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(_index, dict) or _index.get('version', None) != INDEXVERSION:
+        return {}
+    return _index.get('plugins', {})
+
+def __writeindex(indexpath, entries):
+    # the index only saves time, a project folder that cannot be written to is not an error
+    try:
+        os.makedirs(os.path.dirname(indexpath), exist_ok=True)
+        with open(indexpath, mode='w', encoding='utf-8') as f:
+            json.dump({'version': INDEXVERSION, 'plugins': entries}, f, indent=1)
+    except OSError:
+        pass
+
+def __pluginsource(identifier, searchpath):
+    # a plugin source can only be made once per identifier
+    if identifier not in globals()[pluginsources()]:
+        plugin_base = PluginBase(package='gtool.plugins')
+        globals()[pluginsources()][identifier] = plugin_base.make_plugin_source(searchpath=searchpath,
+                                                                               identifier=identifier,
+                                                                               persist=True)
+    return globals()[pluginsources()][identifier]
+
 def __enumerateplugins(pluginbasepath):
     # TODO enumerate subdirs
     here = os.path.abspath(os.path.dirname(__file__))
@@ -27,6 +215,10 @@ def plugins():
     __PLUGINS = '__plugins__'  # TODO singleton pattern for multiple global directories --> dynamicClasses, URN, instancenames (type aware), plugins
     return __PLUGINS
 
+def pluginsources():
+    __PLUGIN_SOURCES = '__pluginsources__'
+    return __PLUGIN_SOURCES
+
 # a shared globals ala...
 # http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
 
@@ -44,4 +236,5 @@ def pluginnamespace():
 
 #--- initialize namespace
 
-globals()[plugins()] = dict()
\ No newline at end of file
+globals()[plugins()] = PluginNamespace()
+globals()[pluginsources()] = dict()
@@ -0,0 +1,259 @@
+from collections import defaultdict
+
+import patricia as pt
+
+import gtool.core.utils
+from gtool.core.utils import (loadconfig,
+                              __loadplugins,
+                              __configloader,
+                              __loadindexes,
+                              __loadclasses,
+                              __loadaggregators,
+                              __outputparser,
+                              __enablecache,
+                              process,
+                              loadobjects)
+import gtool.core.namespace
+import gtool.core.filewalker
+import gtool.core.plugin
+import gtool.core.noderegistry
+import gtool.core.aggregatorregistry
+import gtool.core.parsecache
+import gtool.core.interntable
+import gtool.core.utils.runtime
+import gtool.core.utils.config
+import gtool.core.utils.output
+
+# --- static ---
+__ACTIVE_PROJECT = '__activeproject'
+__DEFAULT_PROJECT = '__defaultproject'
+
+def activeprojectname():
+    return __ACTIVE_PROJECT
+
+def defaultprojectname():
+    return __DEFAULT_PROJECT
+
+def projectregistries():
+    """
+    Lists the module level registries that make up a project
+
+    :return: list of (module, global name, factory returning an empty registry) tuples
+    """
+    return [
+        (gtool.core.namespace, gtool.core.namespace.dynamicclass(), dict),
+        (gtool.core.filewalker, gtool.core.filewalker.filematcher(), lambda: pt.trie('_')),
+        (gtool.core.filewalker, gtool.core.filewalker.objectmemoname(), dict),
+        (gtool.core.plugin, gtool.core.plugin.plugins(), gtool.core.plugin.PluginNamespace),
+        (gtool.core.noderegistry, gtool.core.noderegistry.nodeindex(), dict),
+        (gtool.core.noderegistry, gtool.core.noderegistry.nodeindexreverse(), lambda: defaultdict(list)),
+        (gtool.core.noderegistry, gtool.core.noderegistry.attribindex(), lambda: defaultdict(dict)),
+        (gtool.core.noderegistry, gtool.core.noderegistry.valueindex(), dict),
+        (gtool.core.noderegistry, gtool.core.noderegistry.rangeindex(), dict),
+        (gtool.core.noderegistry, gtool.core.noderegistry.uriindex(), gtool.core.noderegistry.uritrie),
+        (gtool.core.aggregatorregistry, gtool.core.aggregatorregistry.aggregatorindex(), dict),
+        (gtool.core.parsecache, gtool.core.parsecache.parsecachename(), lambda: None),
+        (gtool.core.interntable, gtool.core.interntable.interntablename(), lambda: None),
+        (gtool.core.utils.runtime, gtool.core.utils.runtime.namespacename(), dict),
+        (gtool.core.utils.config, gtool.core.utils.config.namespacename(), dict),
+        (gtool.core.utils.output, gtool.core.utils.output.formatters(), dict),
+    ]
+
+def activeproject():
+    return globals()[activeprojectname()]
+
+def defaultproject():
+    """
+    The project that owns the registries the modules were imported with. The module level functions
+    (namespace(), pluginnamespace(), projectloader() etc.) work on it unless another project is active.
+    """
+    return globals()[defaultprojectname()]
+
+#--- classes ---
+
+class Project(object):
+    """
+    A project with registries of its own, so that several projects can be loaded into one interpreter.
+
+    The module level registry functions always work on the active project. A project is activated for the
+    duration of a with block (and by load and render), one project is active at a time per interpreter.
+
+        project = Project('c:\\projects\\risks').load()
+        project.render('1', output='risks.xlsx')
+        project.render('2', output='risks.json')
+
+    Objects are loaded, and their deferred methods computed, on the first render and reused by later renders.
+    """
+
+    def __init__(self, path, cache=False, jobs=None, verbose=False, silent=True, registries=None):
+        """
+        :param path: project folder
+        :param cache: reuse parsed data of unchanged files (stored in .gtool-cache in the project folder)
+        :param jobs: number of worker processes used to read and parse the data files
+        :param registries: dict of (module, global name) -> registry to use instead of empty registries
+        """
+        self.path = path
+        self.cache = cache
+        self.jobs = jobs
+        self.verbose = verbose
+        self.silent = silent
+        self.__structure__ = None
+        self.__previous__ = []
+
+        if registries is None:
+            self.__registries__ = {(module, name): factory() for module, name, factory in projectregistries()}
+        else:
+            self.__registries__ = dict(registries)
+
+    def __enter__(self):
+        self.__previous__.append(self.activate())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _project, _registries = self.__previous__.pop()
+        _project.activate()
+        return False
+
+    def __repr__(self):
+        return '%s: %s' % (type(self), self.path)
+
+    def activate(self):
+        """
+        Installs the registries of this project in their modules
+
+        :return: tuple of the project that was active before and its registries
+        """
+        _active = activeproject()
+        # some registries are replaced rather than filled (e.g. registerParseCache), keep what is installed
+        _active.__registries__ = {(module, name): vars(module)[name] for module, name in _active.__registries__}
+        for (module, name), registry in self.__registries__.items():
+            vars(module)[name] = registry
+        globals()[activeprojectname()] = self
+        return _active, _active.__registries__
+
+    @property
+    def loaded(self):
+        return self.__structure__ is not None
+
+    @property
+    def structure(self):
+        if self.__structure__ is None:
+            raise ValueError('Project %s is not loaded' % self.path)
+        return self.__structure__
+
+    def load(self):
+        """
+        Loads the configuration, plugins, classes and aggregators and walks the data folder
+
+        :return: self
+        """
+        if self.loaded:
+            raise ValueError('Project %s is already loaded' % self.path)
+        with self:
+            self.__structure__ = loadproject(self.path, cache=self.cache, jobs=self.jobs, verbose=self.verbose,
+                                             silent=self.silent)
+        return self
+
+    def render(self, scheme, output=None):
+        """
+        Renders the project with the output plugin of an output scheme
+
+        :param scheme: output scheme, e.g. 1 for [output.1]
+        :param output: location to output data, None returns the output instead where supported by the plugin
+        :return: the result of the output plugin
+        """
+        with self, gtool.core.utils.runtime.runtimeoverride('outputscheme', scheme):
+            usescheme(scheme)
+            _plugin = self.config['output.%s' % scheme].get('plugin', None)
+            if _plugin is None:
+                raise KeyError('An output plugin is not specified in [output.%s] in gtool.cfg' % scheme)
+            outputprocessor = self.plugins[_plugin.upper()]()
+            # renders see the same complete objects, whatever was rendered before
+            loadobjects(self.structure)
+            _ret = outputprocessor.output(self.structure, output=output)
+            if gtool.core.parsecache.parsecache() is not None:
+                # entries of objects loaded by an earlier render are not seen again, so the cache is not pruned
+                gtool.core.parsecache.parsecache().save()
+            return _ret
+
+    def __registry__(self, module, name):
+        return self.__registries__[(module, name)]
+
+    @property
+    def classes(self):
+        return self.__registry__(gtool.core.namespace, gtool.core.namespace.dynamicclass())
+
+    @property
+    def plugins(self):
+        return self.__registry__(gtool.core.plugin, gtool.core.plugin.plugins())
+
+    @property
+    def aggregators(self):
+        return self.__registry__(gtool.core.aggregatorregistry, gtool.core.aggregatorregistry.aggregatorindex())
+
+    @property
+    def config(self):
+        return self.__registry__(gtool.core.utils.config, gtool.core.utils.config.namespacename())
+
+    @property
+    def options(self):
+        return self.__registry__(gtool.core.utils.runtime, gtool.core.utils.runtime.namespacename())
+
+    @property
+    def formatters(self):
+        """
+        Formatters by output scheme and class name
+        """
+        return self.__registry__(gtool.core.utils.output, gtool.core.utils.output.formatters())
+
+    @property
+    def objects(self):
+        """
+        Objects loaded so far by uri
+        """
+        return self.__registry__(gtool.core.noderegistry, gtool.core.noderegistry.nodeindex())
+
+    def object(self, uri):
+        with self:
+            return gtool.core.noderegistry.getObjectByUri(uri)
+
+#--- functions ---
+
+def loadproject(projectroot, cache=False, jobs=None, verbose=False, silent=False):
+    """
+    Loads a project into the active registries, like gtool.core.utils.projectloader but without registering
+    an output scheme (see usescheme)
+
+    :return: project structure
+    """
+    projectconfig = loadconfig(projectroot)
+
+    if cache:
+        __enablecache(projectconfig['root'])
+
+    __loadplugins(projectconfig['root'], verbose=verbose, silent=silent)
+    __configloader(projectconfig['configpath'])
+    __loadindexes()
+    __loadclasses(projectconfig['classes'], verbose=verbose, silent=silent)
+    __loadaggregators(projectconfig['aggregators'], verbose=verbose, silent=silent)
+
+    return process(projectconfig['dataroot'], jobs=jobs)
+
+def usescheme(scheme):
+    """
+    Registers the formatters of the classes for an output scheme in the active registries unless they are
+    registered already, the formatters of all schemes are kept side by side
+    """
+    if 'output.%s' % scheme not in gtool.core.utils.config.namespace():
+        raise KeyError('Could not find [output.%s] in gtool.cfg' % scheme)
+
+    if scheme in gtool.core.utils.output.formatterschemes():
+        return False
+
+    __outputparser(outputscheme=scheme)
+    return True
+
+#--- initialize namespace
+globals()[defaultprojectname()] = Project(None, registries={(module, name): vars(module)[name]
+                                                            for module, name, factory in projectregistries()})
+globals()[activeprojectname()] = defaultproject()
@@ -1,33 +1,61 @@
 from gtool.core.namespace import namespace
+from gtool.core.interntable import interntable, internvalue
 from gtool.core.plugin import pluginnamespace
 from gtool.core.types.core import DynamicType
 
-class attribute(object):
+class attributeschema(object):
+    """
+    What a class definition says about an attribute (its type, arguments and whether it is a singleton or
+    required). A class keeps one schema per attribute, it is shared by the attributes of all objects of the class.
+    """
 
     def __init__(self, *pargs, typeclass=None, singleton=True, required=True,
                  posargs=None, kwargs=None, parent=None,
                  attributename=None, **keywordargs):
 
         self.args = pargs
-        self.kwargs = keywordargs
-        self.__init__ = dict()
-        initdict = self.__init__
-        initdict['singleton'] = singleton
-        initdict['validatedict'] = None
-        initdict['__class__'] = typeclass
-        initdict['class'] = self.__lazyloadclass__
-        initdict['posargs'] = posargs
-        initdict['kwargs'] = kwargs # TODO should preprocess into dict
-        # make each storage list unique, do not load with values on init
-        self.__storage__ = [] # prevents weakly referenced shared list problem
-        self.__parent__ = parent
-        self.__attributename__ = attributename
-        self.__required__ = required # TODO do something with this (in classgen have mandatoryproperties query this)
+        self.keywordargs = keywordargs
+        self.typeclass = typeclass # name of the type, resolved on use by __lazyloadclass__
+        self.singleton = singleton
+        self.posargs = posargs
+        self.kwargs = kwargs # TODO should preprocess into dict
+        self.parent = parent
+        self.attributename = attributename
+        self.required = required # TODO do something with this (in classgen have mandatoryproperties query this)
+
+        # set by resolve
+        self.typeobject = None
+        self.converter = None
+        self.dynamic = None
+        self.validationrequired = None
+        self.validator = None
+
+    def attribute(self):
+        """
+        :return: an empty attribute of this schema
+        """
+        return attribute(schema=self)
+
+    def resolve(self):
+        """
+        Looks up the type of the attribute and keeps it, with its converter, whether it is a user created class
+        and whether its values are validated. Types are looked up on first use, once all classes and plugins
+        are registered.
+
+        :return: the type, None if it cannot be found (it is looked up again on the next use)
+        """
+        _class = self.__lookupclass__()
+        if _class is not None:
+            self.dynamic = isinstance(_class, type) and issubclass(_class, DynamicType)
+            _converter = getattr(_class, '__converter__', None)
+            self.converter = _converter() if _converter is not None else None
+            self.validationrequired = self.__validationrequired__
+            self.typeobject = _class
+        return _class
 
     @property
     def attrfilematch(self):
-        _class = self.__init__['__class__']
-        return namespace()[_class.upper()].classfile()
+        return namespace()[self.typeclass.upper()].classfile()
 
     @property
     def __validationrequired__(self):
@@ -36,7 +64,7 @@ class attribute(object):
         Should always be true except for classes that handle their own validation
         :return: True if attribute validation routines should be called when data is loaded.
         """
-        _class = self.__init__['__class__']
+        _class = self.typeclass
         if _class in globals():
             # user created class
             return True
@@ -49,13 +77,15 @@ class attribute(object):
         else:
             raise TypeError('I cannot find %s in the globals, plugins or class namespaces' % _class)
 
-
     def __lazyloadclass__(self):
         """
         defers evaluation of the attribute class. If it occured during init there would be unresolved dependencies
         :return: object
         """
-        _class = self.__init__['__class__']
+        return self.typeobject if self.typeobject is not None else self.resolve()
+
+    def __lookupclass__(self):
+        _class = self.typeclass
         if _class in globals():
             return globals()[_class]
         elif _class.upper() in namespace():
@@ -65,58 +95,135 @@ class attribute(object):
 
     @property
     def attrtype(self):
-        return self.__init__['class']()
+        return self.__lazyloadclass__()
 
     @property
     def isdynamic(self):
-        # do a lazy load and initialize the object otherwise type returns type
-        return isinstance(self.__lazyloadclass__()(), DynamicType)
+        if self.__lazyloadclass__() is None:
+            raise TypeError('I cannot find %s in the globals, plugins or class namespaces' % self.typeclass)
+        return self.dynamic
 
     def __convert__(self, value):
-        return self.__init__['class']().__converter__()(value) # return a type from type definition (such at gtool.types.common)
+        if self.converter is None:
+            self.__lazyloadclass__()
+        if self.converter is not None:
+            return self.converter(value)
+        # raises for types that have no converter
+        return self.__lazyloadclass__()().__converter__()(value) # return a type from type definition (such at gtool.types.common)
 
     def __validators__(self, item):
         # need to extract the provided validators but only return those that the type uses
         # kwargs will contain other values that aren't used for validation
-        _kwargDict = {pair[0]:pair[1] for pair in self.__init__['kwargs']}
+        _kwargDict = {pair[0]:pair[1] for pair in self.kwargs}
         validatorDict = {}
         for validator in item.__validators__:
             validatorDict[validator] = _kwargDict.get(validator, None)
         return validatorDict
 
+    def __validator__(self):
+        """
+        The validator of the attribute is made by its type from the validation options of the attribute on first
+        use (see CoreType.__validator__) and kept for all values
+
+        :return: function that raises a ValueError for an invalid value, None if values are not validated
+        """
+        if self.validator is None and self.kwargs is not None and self.validationrequired is True:
+            _class = self.typeobject
+            _validatedict = self.__validators__(_class())
+            if hasattr(_class, '__validator__'):
+                self.validator = _class.__validator__(_validatedict)
+            else:
+                self.validator = lambda item: item.__validate__(_validatedict)
+        return self.validator
+
     def __validate__(self, item):
-        _class = self.__init__['class']()
-        if not isinstance(item, _class):
-            raise TypeError('%s can only hold %s but got %s' % (
-                self.__context__(),
-                self.__init__['class'](),
-                type(item)
-            )
-                            )
-        if self.__init__['kwargs'] is not None and  self.__validationrequired__ is True:
-            try:
-                item.__validate__(self.__validators__(item))
-            except ValueError as verror:
-                # TODO fix this error message generation, it doesn't look like the others
-                errormsg = ('For {0}: {1}'.format(self.__context__(), verror))
-                raise ValueError(errormsg)
+        return self.__validateall__([item])
+
+    def __validateall__(self, items):
+        """
+        Checks the type of values and runs the validator of the attribute over them
+        """
+        _class = self.__lazyloadclass__()
+        try:
+            _validator = self.__validator__()
+            for item in items:
+                if not isinstance(item, _class):
+                    raise TypeError('%s can only hold %s but got %s' % (
+                        self.__context__(),
+                        _class,
+                        type(item)
+                    )
+                                    )
+                if _validator is not None:
+                    _validator(item)
+        except ValueError as verror:
+            # TODO fix this error message generation, it doesn't look like the others
+            errormsg = ('For {0}: {1}'.format(self.__context__(), verror))
+            raise ValueError(errormsg)
         return True
 
-    def __load__(self, item):
+    def __context__(self):
+        return '%s::%s' % (self.parent, self.attributename)
+
+
+class attribute(object):
+    """
+    The values of an attribute of one object. Everything else is read from the schema of the attribute
+    (see attributeschema), an attribute made from class definition arguments gets a schema of its own.
+    """
+
+    __slots__ = ('__schema__', '__storage__')
+
+    def __init__(self, *pargs, schema=None, **keywordargs):
+        self.__schema__ = schema if schema is not None else attributeschema(*pargs, **keywordargs)
+        # make each storage list unique, do not load with values on init
+        self.__storage__ = [] # prevents weakly referenced shared list problem
+
+    @property
+    def attrfilematch(self):
+        return self.__schema__.attrfilematch
+
+    @property
+    def __validationrequired__(self):
+        return self.__schema__.__validationrequired__
+
+    def __lazyloadclass__(self):
+        return self.__schema__.__lazyloadclass__()
+
+    @property
+    def attrtype(self):
+        return self.__schema__.attrtype
+
+    @property
+    def isdynamic(self):
+        return self.__schema__.isdynamic
+
+    def __convert__(self, value):
+        return self.__schema__.__convert__(value)
+
+    def __validators__(self, item):
+        return self.__schema__.__validators__(item)
+
+    def __validate__(self, item):
+        return self.__schema__.__validate__(item)
+
+    def __load__(self, item, validate=True):
         # should be called by load from dynamically generated class
         # __load__ overwrites the storage while append adds to it
+        # validate is False for values that were already validated by a prefetch worker (see ParseCache.prefetched),
+        # they are only validated again if validating changes them (see CoreType.__checkonly__)
         # TODO merge/refactor __load__ and append
-        _storage = []
         if isinstance(item, list):
             if self.issingleton() and len(item) > 1:
                 raise ValueError('For %s: Cannot add multiple items to a singleton attribute' % self.__context__())
-            for itemiter in item:
-                self.__validate__(itemiter)
-                _storage.append(itemiter)
+            _storage = list(item)
         else:
             # TODO check if we still need this else block given the issingleton + len > 1 check
-            self.__validate__(item)
-            _storage.append(item)
+            _storage = [item]
+        if validate or not getattr(self.__schema__.__lazyloadclass__(), '__checkonly__', False):
+            self.__schema__.__validateall__(_storage)
+        if interntable() is not None:
+            _storage = [internvalue(itemiter) for itemiter in _storage]
         self.__storage__ = _storage
         return True
 
@@ -150,11 +257,6 @@ class attribute(object):
     def __len__(self):
         return len(self.__storage__)
 
-    """
-    def __getattr__(self, attr):
-        return self.init[attr]
-    """
-
     def __repr__(self):
         #return '%s' % ['%s' % f for f in self.__storage__]
         return '%s' % self.__storage__
@@ -170,7 +272,7 @@ class attribute(object):
         return retBool
 
     def issingleton(self):
-        return self.__init__['singleton']
+        return self.__schema__.singleton
 
     def __context__(self):
-        return '%s::%s' % (self.__parent__, self.__attributename__)
+        return self.__schema__.__context__()
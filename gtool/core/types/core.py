@@ -1,13 +1,44 @@
 from gtool.core.utils.output import formatternamespace
 from gtool.core.filewalker import registerFileMatcher
 from gtool.core.utils.misc import striptoclassname
-from collections import defaultdict
-from copy import deepcopy
-import pyparsing as p
+import re
 from gtool.core.plugin import pluginnamespace
 from abc import abstractmethod
 from gtool.core.noderegistry import registerObject
-from gtool.core.noderegistry import getObjectByUri, searchByAttribAndObjectType, searchByAttrib
+from gtool.core.noderegistry import (searchByAttribAndObjectType, searchByAttrib, searchByAttribValue,
+                                     searchByAttribRange, searchByUriPatternAndAttrib, convertvalue)
+from gtool.core.parsecache import parsecache
+
+
+# "@name:" at the very start of a line, blanks are allowed around the name
+ATTRIBUTE_MARKER = re.compile(r'@ *([A-Za-z0-9_]+) *:')
+
+
+def parseLoadstring(loadstring):
+    """
+    Splits a load string into attribute values. A line starting with "@name:" starts a new value for that
+    attribute (the character following the colon is skipped), any other line is stripped and appended to
+    the value started last.
+
+    :param loadstring: str
+    :return: dict of attribute name -> list of raw (unconverted) values, in order of appearance
+    """
+    _ret = {}
+    _pieces = None
+
+    for line in loadstring.splitlines():
+        # positions are taken from the tab expanded line, as the previous pyparsing based parser did
+        _match = ATTRIBUTE_MARKER.match(line.expandtabs() if '\t' in line else line)
+        if _match is not None:
+            _pieces = [line[_match.end() + 1:]]
+            _ret.setdefault(_match.group(1), []).append(_pieces)
+        elif _pieces is None:
+            raise ValueError('Found data before the first attribute declaration: "%s"' % line)
+        else:
+            _pieces.append(line.strip())
+
+    # values are only joined once all of their lines have been read
+    return {attribname: [''.join(_value) for _value in _values] for attribname, _values in _ret.items()}
 
 
 class NotComputed(Exception):
@@ -21,8 +52,21 @@ class HiddenObject(Exception):
 class CoreType(object):
     """
     CoreType is the base object for all attribute types (except user created classes)
+
+    There is an instance per value, types keep what is the same for all their values on the class (e.g.
+    __validators__) and declare __slots__ for the rest.
     """
 
+    __slots__ = ('__valuetype__', '__value__')
+
+    # names of the validation options read by the type (see __validator__)
+    __validators__ = ()
+
+    # True if validating a value only checks it, values of these types that were validated by a prefetch worker are
+    # not validated again when they are loaded (see gtool.core.parsecache.ParseCache.prefetched), types that change
+    # the value while validating it (e.g. Date formats it) are always validated
+    __checkonly__ = False
+
     def __init__(self, *args, **kwargs):
         self.__valuetype__ = kwargs.pop('valuetype', None)
         if self.__valuetype__ == None:
@@ -56,6 +100,26 @@ class CoreType(object):
         """
         raise NotImplementedError('Please implement a __validate__ method for your class %s' % self.__class__)
 
+    @classmethod
+    def __validator__(cls, validatedict):
+        """
+        Makes the validator of an attribute (see gtool.core.types.attributes.attributeschema) from its validation
+        options: a function that takes a value of the type and raises a ValueError if it does not match them.
+        Sub-classes whose options need parsing override it so that they are parsed once per attribute instead of
+        once per value, by default the options are handed to __validate__.
+        """
+        def validate(item):
+            return item.__validate__(validatedict)
+        return validate
+
+    def __internkey__(self):
+        """
+        Values of types that return a key here are shared by the attributes that hold equal values if values are
+        interned (see gtool.core.interntable), the key must tell apart all values that do not behave the same.
+        Types whose values are changed after they are loaded must return None, as the default does.
+        """
+        return None
+
     @classmethod
     def __convert__(cls, item):
         try:
@@ -67,14 +131,27 @@ class CoreType(object):
 class DynamicType(object): # TODO look at deriving this class from the ABC.mutablecollections
     """
     base object for dynamically generated classes
+
+    What the class definition says about the attributes is kept once by the class in __attribute_schema__, an
+    object only keeps the values of its attributes in __values__ (in the order of __dynamic_properties__).
+    Attributes and methods are read through the properties made by gtool.core.utils.classgen.factory.
     """
 
+    __slots__ = ('__values__',
+                 'kwargs',
+                 '__context__',
+                 '__missing_mandatory_properties__',
+                 '__missing_optional_properties__',
+                 '__method_results__',
+                 '__method_deferred__')
+
     def __init__(self, **kwargs):
-        # Deepcopy required otherwise list gets shared across instances of generated objects
-        self.__list_slots__ = deepcopy(self.__list_slots__)
+        # every object gets attributes of its own, the schemas are shared
+        self.__values__ = [schema.attribute() for schema in self.__attribute_schema__.values()]
         self.kwargs = kwargs
         self.__context__ = None
-        self.__createattrs__(self.kwargs)
+        if len(kwargs) > 0:
+            self.__createattrs__(kwargs)
         if not (isinstance(self, DynamicType)):
             # all dynamic classes must inherit from gtool's Dynamic type found in gtool.core.types.core
             raise TypeError(
@@ -112,11 +189,9 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
         return _retDict
 
     def __createattrs__(self, kwargs):
-        for attribClass in self.__list_slots__.keys():
+        for attribClass, base in self.__list_slots__.items():
             # TODO these should be explicity passed in
-            # TODO __line_slots__ should be a class to ensure data integrity
             # TODO we're assuming that that attribclass is properly setup... need to check before reading
-            base = self.__list_slots__[attribClass]
             classObject = base.attrtype
 
             if attribClass in kwargs.keys():
@@ -142,72 +217,36 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
         _dict = {prop: getattr(self, prop) for prop in self.dynamicproperties}
         return '%s: %s' % (strclass, _dict)
 
-    def __getattribute__(self, name):
+    @property
+    def __list_slots__(self):
         """
-        an "anonymous" function that will be included into the dynamically generated class to made dynamically
-        generated properties exist.
-        :param self: object instance
-        :param name: name of object attribute after the dot notation
-        :return: list
+        :return: dict of attribute name -> attribute of the object
         """
-        try:
-            listslots = object.__getattribute__(self, '__list_slots__')
-            return listslots[name]
-        except Exception:
-            pass
+        return dict(zip(self.__dynamic_properties__, self.__values__))
 
-        try:
-            #self.__method_results__[name]
-            methodresults = object.__getattribute__(self, '__method_results__')
+    def __methodresult__(self, name):
+        """
+        The result of a method, as read by the method properties of the class. A method that was deferred while
+        loading is computed on first use.
+        """
+        methodresults = self.__method_results__
+        if name in methodresults:
             return methodresults[name]
-        except Exception:
-            pass
 
         try:
-            methodlist = object.__getattribute__(self, '__methods__')
-            methodresults = object.__getattribute__(self, '__method_results__')
-            methoddeferred = object.__getattribute__(self, '__method_deferred__')
-
-            if name in methodlist and methoddeferred: #assume it's not in method_results because that would have returned
-                #attempt to compute because it was deferred before
-                self.loadmethod(name, methodlist[name], force=True)
+            if self.__method_deferred__:
+                self.loadmethod(name, self.__methods__[name], force=True)
                 if name in methodresults:
                     return methodresults[name]
                 else:
                     raise SyntaxError('In %s a method called %s is being consumed before it is initialized. '
                                       'Make sure you declare your methods in order.' % (striptoclassname(type(self)), name))
-
-
         except NotComputed:
             print('could not compute')
         except AttributeError:
             pass
 
-        return super(DynamicType, self).__getattribute__(name)
-
-        #return object.__getattribute__(self, name)
-
-
-    def __setattr__(self, attr, item):
-        """
-        Replace an existing dynamic property or set it. Will only allow the property to set with a fully
-        formed object instance that matches the required dynamic properties set by classgen
-        :param self:
-        :param attr:
-        :param item:
-        :return:
-        """
-
-        if attr in self.__list_slots__.keys():
-            self.__list_slots__[attr].__set__(item)
-        # TODO find a way to throw an error if caller attempts to override method attrib
-        #elif attr in self.__method_results__:
-        #    raise AttributeError('%s is the output from a method plugin and cannot be set' % attr)
-        else:
-            # setting a method using dot notation (self.attr) will trigger recursion unless we have this
-            # else handler
-            #self.__dict__[attr] = item
-            super(DynamicType, self).__setattr__(attr, item)
+        raise AttributeError("'%s' object has no attribute '%s'" % (striptoclassname(type(self)), name))
 
     def __eq__(self, other):
         """
@@ -271,6 +310,18 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
         else:
             self.__method_results__[key] = _result
 
+    def resolvemethods(self):
+        """
+        Computes the methods that were deferred while loading (because they depend on objects that were not loaded
+        yet), as reading them would. Methods that still cannot be computed are left deferred.
+        """
+        for name in list(self.__method_deferred__):
+            if name not in self.__method_results__:
+                try:
+                    getattr(self, name)
+                except AttributeError:
+                    pass
+
     def loads(self, loadstring, softload=False, context=None): # TODO make use of context in error reporting
         """
         Method to read in a correctly structured string and load it into the object attributes
@@ -278,44 +329,35 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
         :return: True if data loaded
         """
 
-        def parseLoadstring(loadstring):
-            attributeStartMarker = p.LineStart() + p.Literal('@')
-            attributeStopMarker = p.Literal(':')
-            exp = attributeStartMarker.suppress() + p.Word(p.alphanums + '_') + attributeStopMarker.suppress()
-
-            # ret = {}
-            ret = defaultdict(list)
-
-            for index, line in enumerate(loadstring.splitlines()):
-                # print(line)
-                # TODO switch from scanString to full parsing
-                result = list(exp.scanString(line))
-                if len(result) > 0:
-                    # TODO this is kludgy
-                    attribname = result[0][0][0]
-                    matchstart = result[0][1]
-                    matchend = result[0][2] + 1
-                    if matchstart == 0:
-                        # print('matched on line %s' % index)
-                        # print('%s: %s' % (attribname, line[matchend:]))
-                        ret[attribname].append(line[matchend:])
-                    else:
-                        raise Exception('attrib not at the start of the line')
-                else:
-                    # print('no match on line %s' % index)
-                    # last = len(ret) - 1
-                    ret[attribname][-1:] = [ret[attribname][-1:][0] + "" + line.strip()]
+        _slots = self.__list_slots__
+
+        def convert(_self, attrname, attrval):
+            cfunc = _slots[attrname].__convert__
 
-            return ret
+            return [cfunc(s.strip()) for s in attrval]
 
-        def convertandload(_self, attrname, attrval):
-            cfunc = _self.__list_slots__[attrname].__convert__
-            attrfunc = _self.__list_slots__[attrname].attrtype
+        def load(_self, attrname, values):
+            attrfunc = _slots[attrname].attrtype
 
-            return [attrfunc(cfunc(s.strip())) for s in attrval]
+            return [attrfunc(v) for v in values]
 
         self.__context__ = context
-        ret = parseLoadstring(loadstring)
+
+        # reuse the converted values of an unchanged file if a parse cache is registered
+        _cache = parsecache()
+        _file = self.__context__.get('file', None) if self.__context__ is not None else None
+        _fingerprint = getattr(self, '__fingerprint__', None)
+        _cacheable = _cache is not None and _file is not None and _fingerprint is not None
+
+        ret = None
+        if _cacheable:
+            ret = _cache.fetch(_file, striptoclassname(self.__class__), _fingerprint, loadstring)
+        _cached = ret is not None
+        if not _cached:
+            ret = parseLoadstring(loadstring)
+        # values loaded by a prefetch worker were validated there
+        _validate = not (_cached and _cache.prefetched(_file, striptoclassname(self.__class__)))
+        _converted = {}
 
         attriblist = [k for k in ret.keys()]
         # check if all attribs required by class definition are in the data file
@@ -347,7 +389,8 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
                 # TODO load into object attribs
                 # TODO pass in args (also refactor load so dict args are correct)
                 try:
-                    self.__list_slots__[attrname].__load__(convertandload(self, attrname, attrval))
+                    _converted[attrname] = attrval if _cached else convert(self, attrname, attrval)
+                    _slots[attrname].__load__(load(self, attrname, _converted[attrname]), validate=_validate)
                 except Exception as err:
                     raise TypeError('got an error when trying to load data for %s from %s: %s'
                                     % (
@@ -356,6 +399,9 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
                                         err
                                     ))
 
+        if _cacheable and not _cached:
+            _cache.store(_file, striptoclassname(self.__class__), _fingerprint, loadstring, _converted)
+
         for k, v in self.__methods__.items():
             self.loadmethod(k,v)
 
@@ -451,9 +497,8 @@ class DynamicType(object): # TODO look at deriving this class from the ABC.mutab
         """
 
     def __iter__(self):
-        for item in self.__list_slots__.keys(): #TODO switch to .items
-            _value = self.__list_slots__[item]
-            yield (item, _value) # self.__list_slots__[item])
+        for item, _value in zip(self.__dynamic_properties__, self.__values__):
+            yield (item, _value)
 
         for k, v in self.__method_results__.items():
             yield (k, v)
@@ -546,10 +591,51 @@ class AttrByObjectSelector(Selector):
         self.__method__ = searchByAttribAndObjectType
 
 
+class AttrValueSelector(Selector):
+    """
+    Selects the objects with a value of an attribute, e.g. @status=open. The value is converted to the type of the
+    attribute, so @code=42 matches the text 42 of a String and the number 42 of a Number
+    """
+
+    def __init__(self):
+        self.__method__ = self.__value__
+
+    @staticmethod
+    def __value__(attribname, value):
+        return searchByAttribValue(attribname, convertvalue(attribname, value))
+
+
+class AttrRangeSelector(Selector):
+    """
+    Selects the objects with a value of an attribute that compares to a bound, e.g. @likelihood>=4. The bound is
+    converted to the type of the attribute (see AttrValueSelector)
+    """
+
+    def __init__(self):
+        self.__method__ = self.__range__
+
+    @staticmethod
+    def __range__(attribname, operator, value):
+        value = convertvalue(attribname, value)
+        if operator == '>':
+            return searchByAttribRange(attribname, low=value, includelow=False)
+        elif operator == '>=':
+            return searchByAttribRange(attribname, low=value)
+        elif operator == '<':
+            return searchByAttribRange(attribname, high=value, includehigh=False)
+        elif operator == '<=':
+            return searchByAttribRange(attribname, high=value)
+        raise ValueError('A range selector can use >, >=, < or <= but got %s' % operator)
+
+
 class FullPathSelector(Selector):
+    """
+    Selects the objects at a path that have an attribute, e.g. /tf1/@attr. The path may use * for any one
+    segment and ** for any number of them, e.g. /risks/*/@score or /risks/**/@score
+    """
 
     def __init__(self):
-        self.__method__ = getObjectByUri
+        self.__method__ = searchByUriPatternAndAttrib
 
 
 class Aggregator(object):
@@ -585,6 +671,7 @@ class Aggregator(object):
         self.selecttype = _payload.get('select', None).get('type', None)
         self.selectors = _payload.get('select', None).get('config', None)
         self.targetattribute = _payload.get('select', None).get('attribute', None)
+        self.__selection__ = None
 
         if self.function is None or not isinstance(self.function, str):
             raise TypeError('Aggregator function value, received via config dict, '
@@ -602,6 +689,23 @@ class Aggregator(object):
             raise TypeError('select.attribute, received via config dict, should be a '
                             'string but got a', type(self.selecttype))
 
+    def selectorkey(self):
+        """
+        :return: key that is the same for aggregators that select the same objects
+        """
+        return (type(self.selecttype), tuple(self.selectors))
+
+    def select(self):
+        """
+        Runs the selector once. The selection may be shared with other aggregators that have the same selector
+        (see gtool.core.types.output.Output.__aggregateresults__), it must not be changed
+
+        :return: list of the selected objects
+        """
+        if self.__selection__ is None:
+            self.__selection__ = self.selecttype.method(*self.selectors)
+        return self.__selection__
+
     @abstractmethod
     def compute(self):
-        return {self.name if self.name is not None else self.id : self.selecttype.method(*self.selectors)}
\ No newline at end of file
+        return {self.name if self.name is not None else self.id : self.select()}
\ No newline at end of file
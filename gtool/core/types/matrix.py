@@ -1,7 +1,25 @@
 class Matrix(object):
+    """
+    Grid of cells with a cursor.
+
+    Cells are stored sparsely: only rows that have been written to are kept, in a dict keyed by row number,
+    and a stored row only reaches as far as its last written cell. Every row also keeps a high-water mark
+    (one past its last cell that is not None) so that trimming looks at rows, not cells.
+    Width and height are the capacity of the matrix, cells that were never written read as None.
+
+    The used width and height of the whole matrix are tracked on insert, which makes utilization checks O(1).
+    Capacity grows by doubling, so the cost of growing is amortized like list growth.
+    """
 
     def __init__(self, startwidth=100, startheight=100, threshold=.75):
-        self.__storage__ = [[None for i in range(startwidth)] for i in range(startheight)]
+        self.__rows__ = {}
+        self.__marks__ = {}
+        # used height and width, recomputed from the row marks only after a mark went down
+        self.__usedrows__ = 0
+        self.__usedcols__ = 0
+        self.__stale__ = False
+        self.__rowcount__ = max(0, startheight)
+        self.__colcount__ = max(0, startwidth)
         self.__current_row__ = 0
         self.__current_col__ = 0
         self.__utilization_threshold__ = threshold
@@ -52,16 +70,16 @@ class Matrix(object):
     x = property(get_currentcol, set_currentcol)
 
     def __height__(self):
-        return len(self.__storage__)
+        return self.__rowcount__
 
     @property
     def height(self):
         return self.__height__()
 
     def __width__(self):
-        #assumes matrix is uniformly sized
-        if len(self.__storage__) > 0:
-            return len(self.__storage__[0])
+        # a matrix without rows has no columns
+        if self.__rowcount__ > 0:
+            return self.__colcount__
         else:
             return 0
 
@@ -72,39 +90,49 @@ class Matrix(object):
     def dimensions(self):
         return (self.__width__(), self.__height__())
 
+    def __mark__(self, y):
+        # recompute the high-water mark of a row from its cells
+        _row = self.__rows__.get(y, [])
+        _end = len(_row)
+        while _end > 0 and _row[_end - 1] is None:
+            _end -= 1
+        self.__setmark__(y, _end)
+
+    def __setmark__(self, y, mark):
+        if mark < self.__marks__.get(y, 0):
+            self.__stale__ = True
+        if mark > 0:
+            self.__marks__[y] = mark
+            self.__usedrows__ = max(self.__usedrows__, y + 1)
+            self.__usedcols__ = max(self.__usedcols__, mark)
+        else:
+            self.__marks__.pop(y, None)
+
+    def __used__(self):
+        # used (width, height) of the matrix
+        if self.__stale__:
+            self.__usedrows__ = max(self.__marks__.keys(), default=-1) + 1
+            self.__usedcols__ = max(self.__marks__.values(), default=0)
+            self.__stale__ = False
+        return self.__usedcols__, self.__usedrows__
+
     def __h_utilization__(self):
-        _result = 0
-        rowlength = self.__width__()
-        for row in self.__storage__:
-            endoflist = 0
-            for i, cell in enumerate(row):
-                x = i+1
-                if row[-x] is not None:
-                    endoflist = rowlength - x
-                    break # avoids unnecesary interations
-            _result = max(endoflist, _result)
-        # calculate utlization
-        if _result is None:
-            _result = 0
-        return _result
+        # x coordinate of the right most cell that is not None
+        return max(self.__used__()[0], 1) - 1
 
     def __h_utilization_percentage__(self):
         return round(self.__h_utilization__() / self.__width__(), 2)
 
     def __v_utilization__(self):
-        colheight = len(self.__storage__)
-        for i, row in enumerate(reversed(self.__storage__)):
-            if any(x is not None for x in row): #self.__storage__[-(i+1)]):
-                #print('colheight:', colheight - (i+1), 'i:', -(i+1))
-                return colheight - i
-        return 0 #default if no utilization
+        # number of rows up to and including the last row that is not empty
+        return self.__used__()[1]
 
     def __v_utilization_percentage__(self):
         colheight = self.__v_utilization__()
         if colheight == 0:
             return 0
         else:
-            return round(colheight/ colheight, 2)
+            return round(colheight / self.__height__(), 2)
 
     def utilization(self):
         # return x,y utilization
@@ -117,12 +145,13 @@ class Matrix(object):
         _v_use = self.__v_utilization_percentage__()
         threshold = self.__utilization_threshold__
 
+        # double the capacity, see __grow__
         if _v_use > threshold:
-            if not self.append_rows(rows=(int(_v_use / (threshold - .05))) - self.__height__()):
+            if not self.append_rows(rows=self.__height__()):
                 raise Exception('could not expand the matrix with additional rows')
 
         if _h_use > threshold:
-            if not self.append_cols(cols=(int(_h_use / (threshold - .05))) - self.__width__()):
+            if not self.append_cols(cols=self.__width__()):
                 raise Exception('could not expand the matrix with additional columns')
 
         return True
@@ -143,18 +172,15 @@ class Matrix(object):
 
         if v_use < self.__height__():
             _ret = True
-            try:
-                del self.__storage__[v_use:] #+1:]
-            except:
-                raise IndexError('Could not delete row %s from the matrix' % v_use)
+            # rows past v_use hold no data but may have been stored when they were read
+            self.__rows__ = {y: row for y, row in self.__rows__.items() if y < v_use}
+            self.__rowcount__ = v_use
 
         if h_use < self.__width__():
             _ret = True
-            for i, row in enumerate(self.__storage__):
-                try:
-                    del row[h_use+1:]
-                except:
-                    raise IndexError('Could not delete columns in row %s from the matrix' % i)
+            self.__colcount__ = h_use + 1
+            for row in self.__rows__.values():
+                del row[h_use+1:]
 
         """
         # check that Matrix still exists and if not rebuild it to a single column and cell
@@ -176,12 +202,8 @@ class Matrix(object):
         return _ret
 
     def append_cols(self, cols=10):
-        rowlength = self.__width__()
-        for i, row in enumerate(self.__storage__):
-            if len(row) == rowlength:
-                row.extend([None] * cols)
-            else:
-                raise IndexError('Row %s is not the same length as the other rows in the matrix' % i)
+        if cols > 0:
+            self.__colcount__ = self.__width__() + cols
         return True
 
     def insert_cols(self, x, cols=10):
@@ -190,11 +212,11 @@ class Matrix(object):
             raise ValueError('cannot insert less than 1 column.')
         if x < 0 or x >= self.__width__():
             raise IndexError('cannot insert cols outside the x range of the matrix. Use append instead')
-        try:
-            for row in self.__storage__:
+        for y, row in self.__rows__.items():
+            if len(row) > x:
                 row[x:x] = [None] * cols
-        except:
-            raise Exception('could not insert %s columns at column %s in the matrix' % (cols, x))
+                self.__mark__(y)
+        self.__colcount__ += cols
 
         return True
 
@@ -204,34 +226,120 @@ class Matrix(object):
             raise ValueError('cannot insert less than 1 row.')
         if y < 0 or y >= self.__height__():
             raise IndexError('cannot insert rows outside the y range of the matrix. Use append instead')
-        try:
-            self.__storage__[y:y] = [[None] * self.__width__()] * rows
-            #.insert(y, [[None for j in range(self.width)] for i in range(rows)]):
-        except:
-            raise Exception('could not insert %s rows at row %s in the matrix' % (rows, y))
+        self.__rows__ = {(i + rows if i >= y else i): row for i, row in self.__rows__.items()}
+        self.__marks__ = {(i + rows if i >= y else i): mark for i, mark in self.__marks__.items()}
+        self.__rowcount__ += rows
+        self.__stale__ = True
 
         return True
 
 
     def append_rows(self, rows=10):
-        rowlength = self.__width__()
-        _newrows = [[None] * rowlength] * rows
-        self.__storage__.extend(_newrows)
+        if rows > 0:
+            self.__colcount__ = self.__width__()
+            self.__rowcount__ += rows
         return True
 
+    def pop_rows(self, rows=1):
+        """
+        Removes rows from the top of the matrix and returns them. The matrix keeps its height, empty rows
+        are appended at the bottom, and the cursor moves up with the remaining data.
+        :param rows: number of rows to remove
+        :return: list of rows (lists)
+        """
+        if rows < 0 or rows > self.__height__():
+            raise IndexError('cannot pop %s rows from a matrix with a height of %s' % (rows, self.__height__()))
+        _ret = [self.row(y) for y in range(rows)]
+        self.__rows__ = {y - rows: row for y, row in self.__rows__.items() if y >= rows}
+        self.__marks__ = {y - rows: mark for y, mark in self.__marks__.items() if y >= rows}
+        self.__stale__ = True
+        self.__current_row__ = max(0, self.__current_row__ - rows)
+        return _ret
+
+    def __position__(self, i, length, axis):
+        # list style indexing (negative values count from the end)
+        _i = i + length if i < 0 else i
+        if _i < 0 or _i >= length:
+            raise IndexError('%s %s is outside of the matrix' % (axis, i))
+        return _i
+
+    def __view__(self, y):
+        """
+        A stored row is padded to the width of the matrix and returned as is (no copy), an empty row is
+        returned as a new list. Rows must only be changed through insert.
+        """
+        _width = self.__width__()
+        _row = self.__rows__.get(y, None)
+        if _row is None:
+            return [None] * _width
+        if len(_row) < _width:
+            _row.extend([None] * (_width - len(_row)))
+        return _row
+
     def getrow(self, y):
-        return self.__storage__[y]
+        return self.__view__(self.__position__(y, self.__height__(), 'row'))
 
     def getcol(self, x):
-        return [row[x] for row in self.__storage__]
+        if self.__height__() == 0:
+            return []
+        x = self.__position__(x, self.__width__(), 'column')
+        _ret = []
+        for y in range(self.__height__()):
+            _row = self.__rows__.get(y, None)
+            _ret.append(_row[x] if _row is not None and x < len(_row) else None)
+        return _ret
 
     def getcell(self, x, y):
-        return self.__storage__[y][x]
+        _row = self.__rows__.get(self.__position__(y, self.__height__(), 'row'), None)
+        x = self.__position__(x, self.__width__(), 'column')
+        return _row[x] if _row is not None and x < len(_row) else None
 
     def __iter__(self):
         # return storage one row at a time iter generator
-        for row in self.__storage__:
-            yield row
+        for y in range(self.__height__()):
+            yield self.__view__(y)
+
+    def __grow__(self, capacity, needed):
+        """
+        Number of rows or columns to add to a capacity so that it can hold needed. The capacity is at least
+        doubled so that repeated growth is amortized.
+        """
+        return max(capacity, needed - capacity)
+
+    def __write__(self, x, y, datalist):
+        # writes datalist into row y starting at column x, growing the matrix if needed
+
+        # grow rows if needed, keeping some headroom below the cursor
+        if y > int(self.__height__() * self.__utilization_threshold__):
+            _needed = int(y / self.__utilization_threshold__) + 1
+            if not self.append_rows(rows=self.__grow__(self.__height__(), _needed)):
+                raise Exception('Could not append more rows to the matrix')
+
+        # grow columns if needed
+        if x + len(datalist) > self.__width__():
+            if not self.append_cols(cols=self.__grow__(self.__width__(), x + len(datalist))):
+                raise Exception('Could not append more columns to the matrix')
+
+        if y >= self.__height__():
+            raise Exception('An error occured when attempting to insert data into the matrix')
+
+        _x_end = x + (len(datalist))
+        _row = self.__rows__.get(y, None)
+        if _row is None:
+            _row = self.__rows__[y] = []
+        if len(_row) < x:
+            _row.extend([None] * (x - len(_row)))
+        _row[x:_x_end] = datalist
+
+        # cells past the written slice are unchanged, so the mark only moves if it was within reach
+        if self.__marks__.get(y, 0) <= _x_end:
+            _last = len(datalist)
+            while _last > 0 and datalist[_last - 1] is None:
+                _last -= 1
+            if _last > 0:
+                self.__setmark__(y, x + _last)
+            else:
+                self.__mark__(y)
 
     def insert(self, cursor=(0,0), datalist=None, healthcheck=True):
         """
@@ -256,30 +364,8 @@ class Matrix(object):
         if y < 0:
             raise IndexError('A coordinate outside the y axis of the matrix was provided')
 
-        # grow columns if needed
-        if y > int(self.__height__() * self.__utilization_threshold__):
-            # grow enough so that we're back to ~70% vertical utilization
-            _delta = int(y / (self.__utilization_threshold__ - .05) - self.__height__()) + 1
-            #print(_delta)
-            if not self.append_rows(rows=_delta):
-                raise Exception('Could not append more rows to the matrix')
-
-        # grow rows if needed
-        if x + len(datalist) > self.__width__():
-            #print('expanding x')
-            _delta = int((x + len(datalist)) / (self.__utilization_threshold__ - .05) - self.__width__()) + 1
-            #print(_delta)
-            if not self.append_cols(cols=_delta):
-                raise Exception('Could not append more columns to the matrix')
-
-        # TODO secondary safety check to make sure we'll be in range
         # TODO call healthcheck (don't if being called by bulk_insert)
-
-        _x_end = x + (len(datalist))
-        try:
-            self.__storage__[y][x:_x_end] = datalist
-        except:
-            raise Exception('An error occured when attempting to insert data into the matrix')
+        self.__write__(x, y, datalist)
 
         # update cursor
         self.__current_row__ = y
@@ -290,7 +376,6 @@ class Matrix(object):
         return True
 
     def bulk_insert(self, cursor=(0,0), rows=None):
-        # TODO can we make bulk insert more efficient, currently it's just a wrapper
         #insert multiple rows, all must start at the same column
         x, y = cursor
         if rows is None or not (isinstance(rows, list) or isinstance(rows, Matrix)):
@@ -300,8 +385,18 @@ class Matrix(object):
         for i, row in enumerate(rows):
             if not len(row) > 0:
                 raise ValueError('Cannot insert row %s as it has zero length' % i)
-            if not self.insert(cursor=(x,y+i), datalist=row, healthcheck=False):
-                raise Exception('Could not insert row %s into the matrix' % i)
+        if x < 0:
+            raise IndexError('A coordinate outside the x axis of the matrix was provided')
+        if y < 0:
+            raise IndexError('A coordinate outside the y axis of the matrix was provided')
+
+        # rows are validated once and written straight into storage, the cursor ends up behind the last row
+        _rows = list(rows)
+        for i, row in enumerate(_rows):
+            self.__write__(x, y + i, row)
+        if len(_rows) > 0:
+            self.__current_row__ = y + len(_rows) - 1
+            self.__current_col__ = x + len(_rows[-1])
 
         self.healthcheck() #do healthcheck here instead of inside insert so that we don't call healthcheck repeatedly
         return True
@@ -314,7 +409,7 @@ class Matrix(object):
         """
         if not isinstance(x, int):
             raise TypeError('Was expecting an integer but got a', type(x))
-        return [row[x] for row in self.__storage__]
+        return self.getcol(x)
 
     def row(self, y):
         """
@@ -324,7 +419,7 @@ class Matrix(object):
         """
         if not isinstance(y, int):
             raise TypeError('Was expecting an integer but got a', type(y))
-        return self.__storage__[y]
+        return self.getrow(y)
 
     def nextrow(self):
         """
@@ -358,7 +453,7 @@ class Matrix(object):
     def __matrixmap__(self, trim=True):
         # returns a matrix of the same size but shows how much data is
         _retmatrix = Matrix(startwidth=self.__h_utilization__(), startheight=self.__v_utilization__())
-        _mmap = [[len(x) if x is not None else 0 for x in y] for y in self.__storage__]
+        _mmap = [[len(x) if x is not None else 0 for x in y] for y in self]
 
         _retmatrix.bulk_insert(rows=_mmap)
         if trim:
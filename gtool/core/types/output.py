@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from gtool.core.utils.output import checkalignment, recursioncheck
 import sys
+import warnings
 from gtool.core.filewalker import StructureFactory
 from gtool.core.utils.output import outputconfigname
 from gtool.core.utils.runtime import runtimenamespace
 from gtool.core.utils.config import namespace as confignamespace
 from gtool.core.types.outputmanagers import Filler, AttributeMatch
 from gtool.core.types.matrix import Matrix
-from gtool.core.filewalker import striptoclassname
+from gtool.core.filewalker import striptoclassname, objectmemo, registerObjectMemo, unregisterObjectMemo
 from gtool.core.aggregatorregistry import aggregatornamespace
 from gtool.core.plugin import pluginnamespace
 from collections import defaultdict
@@ -16,14 +17,20 @@ class Output(ABC):
 
     """
     Output object, override __aligned__ on init
+
+    extension is the file extension of the output written to disk, e.g. when an output directory is given for
+    several output schemes. None means that the output is returned rather than written.
     """
 
+    extension = None
+
     # TODO create params to receive config variables - *arg, **kwarg
     def __init__(self, aligned=None, recursionpermitted=False):
         if aligned is None:
             raise NotImplemented('Output classes must explicitly set keyword arg aligned as True or False')
         self.__aligned__ = aligned
         self.__recursionpermitted__ = recursionpermitted
+        self.__aggregatememo__ = None
 
     def output(self, projectstructure, output=None):
         """
@@ -41,7 +48,22 @@ class Output(ABC):
             self.isnotrecursive(projectstructure)
         self.isaligned(projectstructure)
 
-        return self.__output__(projectstructure, output=output)
+        # aggregates are computed once per output, whatever number of grids or worksheets use them
+        self.__aggregatememo__ = {}
+        _memo = False
+        try:
+            if self.__aggregates__() is not None:
+                # grids and worksheets load their objects as they are rendered but aggregates select from all of
+                # them, the memo lets the render reuse the objects loaded (and registered) here. A memo registered
+                # here only lasts for this output
+                if objectmemo() is None:
+                    _memo = registerObjectMemo({})
+                projectstructure.dataasobject
+
+            return self.__output__(projectstructure, output=output)
+        finally:
+            if _memo:
+                unregisterObjectMemo()
 
     def isnotrecursive(self, projectstructure):
         try:
@@ -93,6 +115,44 @@ class Output(ABC):
         else:
             return [aggregate.strip() for aggregate in  _aggregates.split(',')]
 
+    def __aggregateresults__(self):
+        """
+        Computes the aggregators of the output scheme. Aggregators with the same selector share one selection,
+        so each selector runs once, and the results are kept for the rest of the output (see output).
+
+        :return: list of (target attribute, aggregator result) in the order of the output scheme, None if the
+        scheme has no aggregates
+        """
+        _aggreagatorlist = self.__aggregates__()
+        if _aggreagatorlist is None or len(_aggreagatorlist) == 0:
+            return None
+
+        _memo = self.__aggregatememo__
+        _memokey = tuple(_aggreagatorlist)
+        if _memo is not None and _memokey in _memo:
+            return _memo[_memokey]
+
+        _selections = {}
+        _results = []
+        for aggregator in _aggreagatorlist:
+            _aggregatorconfig = aggregatornamespace().get(aggregator.upper(), None)
+            _aggregatorfunctionname = _aggregatorconfig.get('function', None)
+            _aggregatortargetattribute = _aggregatorconfig.get('select', None).get('attribute', None)
+            _aggregatorfunction = None
+            if _aggregatorfunctionname is not None:
+                _aggregatorfunction = pluginnamespace().get(_aggregatorfunctionname.upper(), None)
+            if _aggregatorfunction is not None:
+                _aggregator = _aggregatorfunction(config={aggregator:_aggregatorconfig})
+                _selectorkey = _aggregator.selectorkey()
+                if _selectorkey not in _selections:
+                    _selections[_selectorkey] = _aggregator.select()
+                _aggregator.__selection__ = _selections[_selectorkey]
+                _results.append((_aggregatortargetattribute, _aggregator.compute()))
+
+        if _memo is not None:
+            _memo[_memokey] = _results
+        return _results
+
     @abstractmethod
     def aggregates(self):
         pass
@@ -130,6 +190,20 @@ class GridOutput(Output):
         _grid.trim()
         return _grid
 
+    def rows(self, projectstructure):
+        """
+        Row sink version of __output__. Yields the rows of the trimmed grid one at a time, objects are
+        loaded on the first iteration and each row is released as soon as the object that wrote it is done,
+        so the whole grid is never held in memory.
+
+        Rows are padded to the width of the header row, a wider row is yielded as is with a warning (see
+        __gridrows__).
+        :param projectstructure: StructureFactory.Container
+        :return: generator of lists
+        """
+        structure = projectstructure.dataasobject
+        yield from self.__gridrows__(structure)
+
     class Separator(object):
 
         def __repr__(self):
@@ -232,7 +306,7 @@ class GridOutput(Output):
                 outputconfig[mergekey]) if mergekey in outputconfig else mergeconstant
 
             for i, dynobj in enumerate(getattr(obj, element.__attrname__)):
-                _grid = self.__gridoutput__(dynobj, headers=False)  # , grid=result)
+                _grid = self.__gridoutput__(dynobj, headers=False, aggregates=False)  # , grid=result)
                 _grid.trim()
                 if _grid.height > 1:
                     # TODO make this an assert
@@ -303,7 +377,7 @@ class GridOutput(Output):
 
 
             for i, dynobj in enumerate(_obj):
-                _grid = self.__gridoutput__(dynobj, headers=False)  # , grid=result)
+                _grid = self.__gridoutput__(dynobj, headers=False, aggregates=False)  # , grid=result)
                 _grid.trim()
                 if _grid.height > 1:
                     # TODO make this an assert
@@ -323,17 +397,14 @@ class GridOutput(Output):
             return depth
 
         def __integrateemptysingle__(element, obj, grid):
-            count = 0
             c = grid.cursor
             if element.isconcatter:
                 _x = ['']
             else:
+                # one empty cell per column the attribute has in the headers
                 _obj = getattr(obj, element.__attrname__)
                 _attrtype = _obj.attrtype()
-                _formatlist = _attrtype.__classoutputscheme__()
-                for _element in _formatlist:
-                    count += 1
-                _x = [''] * count
+                _x = [''] * len(self.__getheaders__(_attrtype))
             grid.insert(datalist=_x, cursor=c)
 
         #_obj = obj
@@ -373,19 +444,12 @@ class GridOutput(Output):
 
     def aggregates(self):
         _retdict = defaultdict(list)
-        _aggreagatorlist = self.__aggregates__()
-        if _aggreagatorlist is None or len(_aggreagatorlist) == 0:
+        _results = self.__aggregateresults__()
+        if _results is None:
             return None
         else:
-            for aggregator in _aggreagatorlist:
-                _aggregatorconfig = aggregatornamespace().get(aggregator.upper(), None)
-                _aggregatorfunctionname = _aggregatorconfig.get('function', None)
-                _aggregatortargetattribute = _aggregatorconfig.get('select', None).get('attribute', None)
-                if _aggregatorfunctionname is not None:
-                    _aggregatorfunction = pluginnamespace().get(_aggregatorfunctionname.upper(), None)
-                if _aggregatorfunction is not None:
-                    aggregator = _aggregatorfunction(config={aggregator:_aggregatorconfig})
-                    _retdict[_aggregatortargetattribute].append(aggregator.compute())
+            for _aggregatortargetattribute, _result in _results:
+                _retdict[_aggregatortargetattribute].append(_result)
 
         return _retdict
 
@@ -458,7 +522,7 @@ class GridOutput(Output):
 
         return _retgrid
 
-    def __gridoutput__(self, obj, separatoroverride=None, grid=None, headers=True): #TODO is grid kwarg needed?
+    def __gridoutput__(self, obj, separatoroverride=None, grid=None, headers=True, aggregates=True): #TODO is grid kwarg needed?
 
         """
         Processes data into a grid. Returns data via reference.
@@ -467,21 +531,12 @@ class GridOutput(Output):
         :param separatoroverride: string to use for separating output
         :param flat: Boolean; merge the output
         :param grid: Matrix object to write results into
+        :param aggregates: Boolean; add the aggregates of the output scheme below the data, False for the objects
+        held by the attributes of an object (they are rendered into a single row)
         :return:
         """
         def sub(self, obj, separatoroverride=None, grid=None, headers=headers):
-            outputconfig = self.__outputconfig__()
-
-            separatorname = 'separator'
-
-            if separatorname in outputconfig and separatoroverride is None:
-                separator = self.__separatorstrip__(outputconfig[separatorname])
-            else:
-                separator = separatoroverride
-
-            _formatlist = obj.__classoutputscheme__()['format']
-            # TODO add a len() method to dynamic class type to help with matrix width sizing
-            self.integrate(obj, formatlist=_formatlist, separator=separator, grid=grid)
+            self.__gridintegrate__(obj, grid, separatoroverride=separatoroverride)
 
         if grid is None:
             grid = Matrix(startheight=20, startwidth=20)
@@ -500,7 +555,7 @@ class GridOutput(Output):
         else:
             sub(self, obj, separatoroverride=separatoroverride, grid=grid, headers=headers)
 
-        if self.__aggregates__() is not None:
+        if aggregates and self.__aggregates__() is not None:
             _obj = obj[0] if isinstance(obj, list) else obj
             grid.carriagereturn()
             _aggregatesgrid = self.integrateaggregates(_obj)
@@ -512,6 +567,78 @@ class GridOutput(Output):
 
         return grid
 
+    def __gridintegrate__(self, obj, grid, separatoroverride=None):
+        outputconfig = self.__outputconfig__()
+
+        separatorname = 'separator'
+
+        if separatorname in outputconfig and separatoroverride is None:
+            separator = self.__separatorstrip__(outputconfig[separatorname])
+        else:
+            separator = separatoroverride
+
+        _formatlist = obj.__classoutputscheme__()['format']
+        # TODO add a len() method to dynamic class type to help with matrix width sizing
+        self.integrate(obj, formatlist=_formatlist, separator=separator, grid=grid)
+
+    def __gridrows__(self, obj, separatoroverride=None, headers=True):
+        """
+        Processes data into rows, see __gridoutput__. Each object is integrated into a small Matrix that
+        only holds the rows of the object being processed; the rows above the cursor are finished once the
+        object is done and are yielded.
+
+        Yields the same rows as a trimmed __gridoutput__ grid: blank rows are held back until a row with
+        data follows them so that trailing blank rows are dropped, and rows are padded to the width of the first
+        row (the header row). Rows above are already yielded when a wider row comes up, unlike the grid they are
+        not widened, so a wider row is yielded as is with a warning that the columns are misaligned.
+
+        :param obj: a DynamicType object or a list of DynamicType objects
+        :param separatoroverride: string to use for separating output
+        :param headers: Boolean; start with a header row
+        :return: generator of lists
+        """
+        grid = Matrix(startheight=20, startwidth=20)
+        _state = {'width': None, 'blanks': 0}
+
+        def finished(rows):
+            for row in rows:
+                _end = len(row)
+                while _end > 0 and row[_end - 1] is None:
+                    _end -= 1
+                if _end == 0:
+                    _state['blanks'] += 1
+                    continue
+                if _state['width'] is None:
+                    _state['width'] = _end
+                elif _end > _state['width']:
+                    warnings.warn('A row of %s cells is wider than the %s cells of the header row, the columns of '
+                                  'the output are misaligned' % (_end, _state['width']))
+                for i in range(_state['blanks']):
+                    yield [None] * _state['width']
+                _state['blanks'] = 0
+                yield row[:_end] + [None] * (_state['width'] - _end)
+
+        _objs = obj if isinstance(obj, list) else [obj]
+
+        if headers:
+            grid.insert(datalist=self.__getheaders__(_objs[0]))
+            grid.carriagereturn()
+
+        for _obj in _objs:
+            self.__gridintegrate__(_obj, grid, separatoroverride=separatoroverride)
+            yield from finished(grid.pop_rows(grid.y))
+
+        if self.__aggregates__() is not None:
+            grid.carriagereturn()
+            _aggregatesgrid = self.integrateaggregates(_objs[0])
+            if _aggregatesgrid is not None:
+                for row in _aggregatesgrid:
+                    _cursor = grid.cursor
+                    grid.insert(cursor=_cursor, datalist=row)
+                    grid.carriagereturn()
+
+        yield from finished(grid.pop_rows(grid.height))
+
 # WARNING DO NOT RENAME THIS CLASS - there is a static text value in
 # core.utils.output.checkalignment that is used to determine class lineage
 # without a circular import occuring
@@ -653,19 +780,12 @@ class TreeOutput(Output):
 
     def aggregates(self):
         _retlist = []
-        _aggreagatorlist = self.__aggregates__()
-        if _aggreagatorlist is None or len(_aggreagatorlist) == 0:
+        _results = self.__aggregateresults__()
+        if _results is None:
             return None
         else:
-            for aggregator in _aggreagatorlist:
-                _aggregatorconfig = aggregatornamespace().get(aggregator.upper(), None)
-                _aggregatorfunctionname = _aggregatorconfig.get('function', None)
-                if _aggregatorfunctionname is not None:
-                    _aggregatorfunction = pluginnamespace().get(_aggregatorfunctionname.upper(), None)
-                if _aggregatorfunction is not None:
-                    aggregator = _aggregatorfunction(config={aggregator:_aggregatorconfig})
-                    _resultdict = aggregator.compute()
-                    _retlist.append({_resultdict.get('name', None):_resultdict.get('result', None)})
+            for _aggregatortargetattribute, _resultdict in _results:
+                _retlist.append({_resultdict.get('name', None):_resultdict.get('result', None)})
 
         return _retlist
 
@@ -693,14 +813,13 @@ class TreeOutput(Output):
             raise TypeError('unexpected type in _tree')
         return _tree
 
-    def __output__(self, projectstructure, output=None): # TODO use output
-
+    def tree(self, projectstructure):
         """
-        Processes data into a tree in accordance with outputscheme.
+        Loads the objects of the project into a tree of dicts keyed by node name. The tree holds references
+        to the loaded objects only, conversion is left to outputprocessor.
 
-        :param obj: a DynamicType object that will be processed for output
-        :param output: Output target location (not used by base class, should be used by inheriting class)
-        :return: list or dict
+        :param projectstructure: StructureFactory.Container
+        :return: dict with a single 'Data' key
         """
 
         def _sub(tree):
@@ -724,5 +843,17 @@ class TreeOutput(Output):
 
         _output = _sub(projectstructure)
 
-        return self.outputprocessor({'Data': _output})
+        return {'Data': _output}
+
+    def __output__(self, projectstructure, output=None): # TODO use output
+
+        """
+        Processes data into a tree in accordance with outputscheme.
+
+        :param obj: a DynamicType object that will be processed for output
+        :param output: Output target location (not used by base class, should be used by inheriting class)
+        :return: list or dict
+        """
+
+        return self.outputprocessor(self.tree(projectstructure))
 
@@ -1,9 +1,12 @@
 import os
+from distutils.util import strtobool
 
 from gtool.core.filewalker import StructureFactory
 from gtool.core.plugin import loadplugins
 from .classgen import generateClass
-from .classprocessor import readClass, processClass, debugClass
+from .classgen.compiler import prunecompiled
+from .classprocessor import (readClass, readClassCached, readClassCache, writeClassCache, classcachekey,
+                             processClass, debugClass, CLASSCACHEFILE)
 from .config import configloader, register
 from gtool.core.utils.config import namespace as confignamespace
 from gtool.core.namespace import namespace
@@ -11,6 +14,10 @@ from gtool.core.utils.output import parseformat, registerFormatter
 from gtool.core.utils.runtime import registerruntimeoption
 from gtool.core.utils.aggregatorprocessor import loadaggregators
 from gtool.core.aggregatorregistry import registerAggregator
+from gtool.core.parsecache import ParseCache, registerParseCache, CACHEDIR
+from gtool.core.interntable import interntable, registerInternTable
+from gtool.core.utils.parallel import prefetch
+from gtool.core.noderegistry import nodenamespace, registerAttribIndex
 
 def loadconfig(projectroot):
     PROJECTDATA = "data"
@@ -38,12 +45,23 @@ def loadconfig(projectroot):
 
     return confignamespace()['config']
 
-def projectloader(projectroot, dbg=False, outputscheme=None):
+def projectloader(projectroot, dbg=False, outputscheme=None, cache=False, jobs=None):
+    """
+    Loads a project and returns its data structure. Objects are loaded lazily when the structure is consumed.
+
+    :param cache: reuse parsed data of unchanged files from the project's .gtool-cache directory.
+    The cache is written by calling gtool.core.parsecache.parsecache().save() once the data has been consumed.
+    :param jobs: number of worker processes used to read and parse the data files (see process)
+    """
 
     projectconfig = loadconfig(projectroot)
 
+    if cache:
+        __enablecache(projectconfig['root'])
+
     __loadplugins(projectconfig['root'])
     __configloader(projectconfig['configpath'])
+    __loadindexes()
 
     if outputscheme is not None:
         __registeroption('outputscheme', outputscheme) # TODO confirm outputscheme exists
@@ -58,11 +76,14 @@ def projectloader(projectroot, dbg=False, outputscheme=None):
     # loading output parser can only occur after all classes are loaded
 
     __outputparser(outputscheme=outputscheme) #TODO make this a functional style call <-- return namespace from __loadclasses
-    return process(projectconfig['dataroot']) # returns the project data
+    return process(projectconfig['dataroot'], jobs=jobs) # returns the project data
 
 def __registeroption(key, value):
     registerruntimeoption(key, value)
 
+def __enablecache(projectroot):
+    registerParseCache(ParseCache(os.path.join(projectroot, CACHEDIR)))
+
 def __loadplugins(configpath, verbose=False, silent=False):
     loadplugins(configpath, verbose=verbose, silent=silent)
 
@@ -70,11 +91,45 @@ def __configloader(configpath):
     configloader(configpath)
 
 def __loadclasses(classpath, verbose=False, silent=False, dbg=False):
+    # parsed class files are kept in the .gtool-cache of the project (next to classpath) by content hash
+    _cachedir = os.path.join(os.path.dirname(os.path.normpath(classpath)), CACHEDIR)
+    _cachepath = os.path.join(_cachedir, CLASSCACHEFILE)
+    _cached = readClassCache(_cachepath)
+    _keys = []
+
+    # classes are compiled into the cache when [classes] in gtool.cfg sets compile: yes
+    _compile = __classesoption('compile')
+
+    # equal values of attributes share an instance when [classes] in gtool.cfg sets intern: yes
+    if __classesoption('intern') and interntable() is None:
+        registerInternTable({})
+    _compiled = [] if _compile else None
+    _kwargs = {'verbose': verbose, 'silent': silent, 'dbg': dbg, 'cachekeys': _keys,
+               'cachepath': _cachedir if _compile else None, 'compiled': _compiled}
+
     if os.path.isfile(classpath):
-        __loadclass(classpath, verbose=verbose, silent=silent, dbg=dbg)
+        __loadclass(classpath, **_kwargs)
     elif os.path.isdir(classpath):
         for classfile in [f for f in os.listdir(classpath) if os.path.isfile(os.path.join(classpath, f))]:
-            __loadclass(os.path.join(classpath, classfile), verbose=verbose, silent=silent, dbg=dbg)
+            __loadclass(os.path.join(classpath, classfile), **_kwargs)
+
+    if set(_keys) != _cached:
+        writeClassCache(_cachepath, _keys)
+
+    if _compile:
+        prunecompiled(_cachedir, _compiled)
+
+def __loadindexes():
+    # objects are indexed by the values of the attributes listed in [index] of gtool.cfg, e.g. status: value
+    for attribname, indextype in confignamespace().get('index', {}).items():
+        registerAttribIndex(attribname, indextype.strip().lower())
+
+def __classesoption(option):
+    _value = confignamespace().get('classes', {}).get(option, 'no')
+    try:
+        return bool(strtobool(_value))
+    except ValueError:
+        raise ValueError('%s in [classes] of gtool.cfg should be yes or no but got %s' % (option, _value))
 
 def __outputparser(outputscheme=None):
     globalnamespace = namespace()
@@ -106,13 +161,16 @@ def __outputparser(outputscheme=None):
         if _headers is not None:
             _formatterdict['headers'] = _headers
 
-        registerFormatter(k, _formatterdict)
+        registerFormatter(k, _formatterdict, outputscheme=outputscheme)
 
-def __loadclass(classpath, verbose=False, silent=False, dbg=False):
+def __loadclass(classpath, verbose=False, silent=False, dbg=False, cachekeys=None, cachepath=None, compiled=None):
     """
 
     :param configpath: path to config file
     :param dbg: set to ttue to debug config load
+    :param cachekeys: list to add the key of the parsed class file to (see classcachekey)
+    :param cachepath: cache folder to compile the classes into, None does not compile them
+    :param compiled: list to add the paths of the sources of compiled classes to
     :return: True
     """
 
@@ -124,7 +182,9 @@ def __loadclass(classpath, verbose=False, silent=False, dbg=False):
     else:
         raise FileNotFoundError('%s does not exist' % classpath)
     # TODO capture exceptions
-    classData = readClass(classString + '\n') #TODO get rid of \n by fixing attribute parser
+    classData = readClassCached(classString + '\n') #TODO get rid of \n by fixing attribute parser
+    if cachekeys is not None:
+        cachekeys.append(classcachekey(classString + '\n'))
     if dbg is True:
         debug(classData)
     # TODO capture exceptions
@@ -132,7 +192,9 @@ def __loadclass(classpath, verbose=False, silent=False, dbg=False):
     classDict = classData
     for classname, classconfig in classDict.items():
         # TODO capture exceptions
-        generateClass(classname, classconfig, verbose=verbose)
+        _class = generateClass(classname, classconfig, verbose=verbose, cachepath=cachepath)
+        if compiled is not None and getattr(_class, '__compiled__', None) is not None:
+            compiled.append(_class.__compiled__)
     f.close()
     if not verbose and not silent:
         print('Registering %s user classes (use verbose mode to list them).' % len(classDict))
@@ -178,8 +240,28 @@ def __loadaggregator(aggregatorpath, verbose=False, dbg=False):
         registerAggregator(_id, _config, verbose=verbose)
     f.close()
 
-def process(datapath):
-    return StructureFactory.treewalk(datapath)
+def process(datapath, jobs=None):
+    """
+    Walks the data folder and returns the project structure.
+
+    :param jobs: if more than 1, the data files are read, parsed and validated up front by a pool of that many
+    worker processes. Objects are still built (and registered) here when the structure is consumed.
+    """
+    _structure = StructureFactory.treewalk(datapath)
+    if jobs is not None and jobs > 1:
+        prefetch(_structure, confignamespace()['config']['root'], jobs)
+    return _structure
+
+def loadobjects(structure):
+    """
+    Loads every object of a project structure and computes their deferred methods, so that the objects are
+    complete before they are rendered (output plugins otherwise load them, and read their methods, while
+    rendering). Requires an object memo (see gtool.core.filewalker.registerObjectMemo) for the objects to be
+    reused by the renders.
+    """
+    structure.dataasobject
+    for obj in list(nodenamespace().values()):
+        obj.resolvemethods()
 
 def debug(classdata):
     print('--- class debug ---')
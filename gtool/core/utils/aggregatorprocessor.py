@@ -1,5 +1,6 @@
 import pyparsing as p
-from gtool.core.types.core import AttrSelector, FullPathSelector, AttrByObjectSelector
+from gtool.core.types.core import (AttrSelector, FullPathSelector, AttrByObjectSelector, AttrValueSelector,
+                                  AttrRangeSelector)
 
 """
 DESIGN NOTE: Aggregates are not data and therefore live outside the data structure
@@ -15,7 +16,8 @@ def process(configstring):
     AGGREGATORNAME::
     *name = friendly name
     *function = function that will be used
-    *select = @attr1 | /tf1/@attr | @attr1//objtype <-- selector
+    *select = @attr1 | /tf1/@attr | /risks/*/@attr | /risks/**/@attr | @attr1//objtype | @attr1=value |
+              @attr1>=value <-- selector
 
     TOTAL1::
     *name = Sum of Sam
@@ -33,6 +35,21 @@ def process(configstring):
     *function = List
     *select = /tf1/@attr
 
+    TOTAL2::
+    *name = Sum of Sue
+    *function = sum
+    *select = /risks/**/@score
+
+    OPEN1::
+    *name = Olive Open
+    *function = listing
+    *select = @status=open
+
+    LIKELY1::
+    *name = Larry Likely
+    *function = sum
+    *select = @likelihood>=4
+
     """
 
 
@@ -72,7 +89,10 @@ def process(configstring):
     return _retlist
 
 def parseSelector(selectorstring):
-    # *select = @attr1 | /tf1/@attr | @attr1//objtype
+    # *select = @attr1 | /tf1/@attr | @attr1//objtype | @attr1=value | @attr1>=value (also >, < and <=)
+    # paths may use * for any one segment and ** for any number of segments, e.g. /risks/*/@attr1
+    # values are "quoted strings" or the rest of the selector, they are converted to the type of the attribute
+    # when the objects are selected (see AttrValueSelector)
 
     """
     def enumtype(*args,**kwargs): #s, l, t, selectortype=None):
@@ -92,22 +112,33 @@ def parseSelector(selectorstring):
     def attrbyobjtype():
         return AttrByObjectSelector() #'ATTRBYOBJECT'
 
+    def attrvaluetype():
+        return AttrValueSelector() #'ATTRVALUE'
+
+    def attrrangetype():
+        return AttrRangeSelector() #'ATTRRANGE'
+
     def attrexpr(selectorstring=None):
         attrmatch = p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums))
         return attrmatch.searchString(selectorstring)[0][0]
 
     def expr(selectorstring=None, returntype=False):
         attrmatch = p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums))
-        fullpathmatch = p.Combine(p.OneOrMore(p.Literal('/') + p.Word(p.alphanums))) + p.Literal(
+        fullpathmatch = p.Combine(p.OneOrMore(p.Literal('/') + p.Word(p.alphanums + '_-.*?'))) + p.Literal(
             '/').suppress() + p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums))
         attrbyobjmatch = p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums)) + p.Literal('//').suppress() + p.Word(p.alphanums)
+        valuematch = p.QuotedString('"') | p.Regex(r'\S(.*\S)?')
+        attrvaluematch = p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums)) + p.Literal('=').suppress() + valuematch
+        attrrangematch = p.Combine(p.Literal('@').suppress() + p.Word(p.alphanums)) + p.oneOf('>= <= > <') + valuematch
 
-        matchgroup = (fullpathmatch | attrbyobjmatch | attrmatch)
+        matchgroup = (fullpathmatch | attrrangematch | attrvaluematch | attrbyobjmatch | attrmatch)
 
         if returntype:
             attrmatch.setParseAction(attrtype)
             fullpathmatch.setParseAction(fullpathtype)
             attrbyobjmatch.setParseAction(attrbyobjtype)
+            attrvaluematch.setParseAction(attrvaluetype)
+            attrrangematch.setParseAction(attrrangetype)
 
         return matchgroup.parseString(selectorstring)
 
@@ -117,7 +148,7 @@ def parseSelector(selectorstring):
 
     return {
             'type': _selectortype[0],
-            'config': _selectorconfig[:2], #TODO unclear why [0] returns only a subset of the matches
+            'config': _selectorconfig[:3], #TODO unclear why [0] returns only a subset of the matches
             'attribute': _selectorattr
     }
 
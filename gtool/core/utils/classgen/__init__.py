@@ -1,10 +1,12 @@
 from distutils.util import strtobool
 
 from gtool.core.namespace import registerClass
-from gtool.core.types.attributes import attribute
+from gtool.core.types.attributes import attributeschema
 #from .methods import * # TODO already moved methods into DynamicType
 from gtool.core.types.core import DynamicType
+from gtool.core.parsecache import fingerprint
 from collections import OrderedDict
+from .compiler import compileClass
 
 class factory(object):
     """
@@ -68,14 +70,18 @@ class factory(object):
     @staticmethod
     def attributes(className, classDict):
         attribsDict = {}
-        attribsDict['__list_slots__'] = {}
+        attribsDict['__attribute_schema__'] = OrderedDict()
         # TODO this could be computed by a method dynamically by looking for funcs/props that start with X
         attribsDict['__dynamic_properties__'] = []
         attribsDict['__mandatory_properties__'] = []
         #attribsDict['__missing_mandatory_properties__'] = []
         #attribsDict['__missing_optional_properties__'] = []
         #print('*' * 30)
+        basenames = dir(DynamicType)
         for attributeName, attributeValues in classDict['attributes'].items():
+            if attributeName in basenames:
+                # attributes are read through properties of the class, they cannot replace what DynamicType defines
+                raise AttributeError('The dynamic class %s cannot have an attribute called %s' % (className, attributeName))
             paramDict = {}
             if attributeValues['list']:
                 paramDict['singleton'] = False
@@ -94,9 +100,9 @@ class factory(object):
             except ValueError:
                 raise ValueError('When parsing the required option for %s::%s got a value that could not be converted to a boolean' % (className, attributeName))
 
-            # TODO would be better if the attribute was initialized by __init__
-            attribsDict['__list_slots__'][attributeName] = \
-                attribute(
+            # shared by all objects of the class, DynamicType.__init__ makes the attributes of an object from it
+            attribsDict['__attribute_schema__'][attributeName] = \
+                attributeschema(
                     #typeclass=globals()[attributeValues['type']],
                     typeclass=attributeValues['type'], # send over the name without accessing globals, let attribute handle that
                     singleton=paramDict['singleton'],
@@ -117,6 +123,26 @@ class factory(object):
         #print('in classgen %s __mandatory_properties__:' % className, attribsDict['__mandatory_properties__'])
         return attribsDict
 
+    @staticmethod
+    def accessors(classesDict):
+        """
+        Properties that read (and set) the attributes and read the method results of an object, so that they are
+        found by the usual attribute lookup
+
+        :param classesDict: dict as returned by generateClassesDict
+        :return: dict of name -> property
+        """
+        _retdict = {}
+        for index, attributeName in enumerate(classesDict['__dynamic_properties__']):
+            _retdict[attributeName] = property(
+                lambda self, _index=index: self.__values__[_index],
+                lambda self, item, _index=index: self.__values__[_index].__set__(item))
+
+        for methodname in classesDict['__methods__']:
+            _retdict[methodname] = property(lambda self, _name=methodname: self.__methodresult__(_name))
+
+        return _retdict
+
     @staticmethod
     def metasmaker(classDict):
         _retDict = OrderedDict()
@@ -124,13 +150,19 @@ class factory(object):
             _retDict['__metas__'] = classDict['metas']
         return _retDict
 
+    @staticmethod
+    def fingerprintmaker(classDict):
+        # used by the parse cache to tie cached data to this exact class definition
+        return {'__fingerprint__': fingerprint(classDict)}
+
     @staticmethod
     def maker(className, classDict, **kwargs):
         # TODO kwargs is never used... do we need it?
 
         return factory.merge_dicts(factory.attributes(className, classDict),
                                    factory.methodbinder(className, classDict),
-                                   factory.metasmaker(classDict)
+                                   factory.metasmaker(classDict),
+                                   factory.fingerprintmaker(classDict)
                                    )
 
     @staticmethod
@@ -139,11 +171,27 @@ class factory(object):
 
     @staticmethod
     def generateClass(className, classDict):
-        return type(className, (DynamicType,), factory.generateClassesDict(className, classDict))
+        _classesdict = factory.generateClassesDict(className, classDict)
+        # objects keep their state in the __slots__ of DynamicType only
+        return type(className, (DynamicType,), factory.merge_dicts(_classesdict,
+                                                                   factory.accessors(_classesdict),
+                                                                   {'__slots__': ()}))
 
 
-def generateClass(className, classDict, verbose=False):
-    _newclass = factory.generate(className, classDict)
+def generateClass(className, classDict, verbose=False, cachepath=None):
+    """
+    :param cachepath: cache folder of the project to compile the class into (see gtool.core.utils.classgen.compiler),
+    None generates the class without compiling it
+    :return: the new class, a compiled class has the path of its source in __compiled__
+    """
+    _newclass = None
+    if cachepath is not None:
+        _newclass, _source = compileClass(className, factory.generateClassesDict(className, classDict), cachepath)
+        _newclass.__compiled__ = _source
+        if verbose:
+            print('[VERBOSE] Compiled Dynamic Class %s to %s' % (className, _source))
+    if _newclass is None:
+        _newclass = factory.generate(className, classDict)
     registerClass(className, _newclass)
     if verbose:
         print('[VERBOSE] Registering Dynamic Class:', className)
@@ -0,0 +1,187 @@
+"""
+Schema compiler: turns a class definition into the python source of a DynamicType subclass that is specialized
+for it, with a property per attribute and method and a loads that has the attribute names and the mandatory
+attributes of the class written out. The source is written to the project cache once, python keeps the compiled
+.pyc next to it.
+"""
+import hashlib
+import importlib.util
+import keyword
+import os
+
+COMPILERVERSION = 4
+COMPILEDDIR = 'compiled'
+
+TEMPLATE = '''\
+# generated by gtool.core.utils.classgen.compiler (version {version}) for the class {classname}, do not edit
+from gtool.core.types.core import DynamicType, parseLoadstring
+from gtool.core.noderegistry import registerObject
+from gtool.core.parsecache import parsecache
+
+# position of the attributes in __values__
+INDEX = {index!r}
+
+
+def generate(classesdict):
+
+    class {classname}(DynamicType):
+
+        __slots__ = ()
+
+{properties}
+        def loads(self, loadstring, softload=False, context=None):
+            self.__context__ = context
+
+            # reuse the converted values of an unchanged file if a parse cache is registered
+            _cache = parsecache()
+            _file = context.get('file', None) if context is not None else None
+            _cacheable = _cache is not None and _file is not None
+
+            ret = None
+            if _cacheable:
+                ret = _cache.fetch(_file, {classname!r}, self.__fingerprint__, loadstring)
+            _cached = ret is not None
+            if not _cached:
+                ret = parseLoadstring(loadstring)
+            # values loaded by a prefetch worker were validated there
+            _validate = not (_cached and _cache.prefetched(_file, {classname!r}))
+
+{checks}
+            _values = self.__values__
+            _schemas = self.__attribute_schema__
+            _converted = {{}}
+            for attrname, attrval in ret.items():
+                if attrname not in INDEX:
+                    raise AttributeError('attribute "%s" found in load string from %s '
+                                         'but not in {classname} class definition file' %
+                                         (attrname, self.__context__['file']))
+                try:
+                    _schema = _schemas[attrname]
+                    _type = _schema.__lazyloadclass__()
+                    _convert = _schema.converter or _schema.__convert__
+                    _converted[attrname] = attrval if _cached else [_convert(s.strip()) for s in attrval]
+                    _values[INDEX[attrname]].__load__([_type(v) for v in _converted[attrname]], validate=_validate)
+                except Exception as err:
+                    raise TypeError('got an error when trying to load data for {classname} from %s: %s'
+                                    % (self.__context__['file'], err))
+
+            if _cacheable and not _cached:
+                _cache.store(_file, {classname!r}, self.__fingerprint__, loadstring, _converted)
+
+            for k, v in self.__methods__.items():
+                self.loadmethod(k, v)
+
+            registerObject(self.__context__['file'], self)
+
+            return True if len(ret) > 0 else False
+
+    for key, value in classesdict.items():
+        setattr({classname}, key, value)
+{extraproperties}
+    return {classname}
+'''
+
+ATTRIBUTEPROPERTY = '''\
+property(
+{indent}    lambda self: self.__values__[{index}],
+{indent}    lambda self, item: self.__values__[{index}].__set__(item))'''
+
+METHODPROPERTY = '''\
+property(
+{indent}    lambda self: self.__methodresult__({name!r}))'''
+
+MANDATORYCHECK = '''\
+            if {name!r} not in ret:
+                if softload is False:
+                    raise AttributeError('attribute {name} required by {classname} class definition file but not found '
+                                         'in %s' % self.__context__['file'])
+                if softload is True:
+                    self.__missing_mandatory_properties__.append({name!r})
+'''
+
+OPTIONALCHECK = '''\
+            if {name!r} not in ret:
+                self.__missing_optional_properties__.append({name!r})
+'''
+
+
+def classsource(className, classesdict):
+    """
+    :param classesdict: class dict as made by gtool.core.utils.classgen.factory
+    :return: python source of a module with a generate(classesdict) function that makes the class
+    """
+    _attributes = list(classesdict['__dynamic_properties__'])
+    _methods = list(classesdict['__methods__'].keys())
+
+    _properties = []
+    _extraproperties = []
+    for names, template in ((_attributes, ATTRIBUTEPROPERTY), (_methods, METHODPROPERTY)):
+        for index, name in enumerate(names):
+            if name.isidentifier() and not keyword.iskeyword(name):
+                _properties.append('        %s = %s\n' % (name, template.format(name=name, index=index,
+                                                                                  indent=' ' * 8)))
+            else:
+                # names such as 1st cannot be written in a class body
+                _extraproperties.append('    setattr(%s, %r, %s)\n' % (className, name,
+                                                                       template.format(name=name, index=index,
+                                                                                       indent=' ' * 4)))
+
+    _checks = [(MANDATORYCHECK if name in classesdict['__mandatory_properties__'] else OPTIONALCHECK)
+               .format(name=name, classname=className) for name in _attributes]
+
+    return TEMPLATE.format(version=COMPILERVERSION,
+                           classname=className,
+                           index={name: index for index, name in enumerate(_attributes)},
+                           properties=''.join(_properties),
+                           checks=''.join(_checks),
+                           extraproperties=''.join(_extraproperties))
+
+
+def compileClass(className, classesdict, cachepath):
+    """
+    Makes the compiled class of a class definition. The source is written to <cachepath>/compiled once per
+    definition and version of the compiler.
+
+    :param classesdict: class dict as made by gtool.core.utils.classgen.factory
+    :param cachepath: cache folder of the project
+    :return: tuple of the class and the path of its source
+    """
+    _source = classsource(className, classesdict)
+    _digest = hashlib.sha1(_source.encode('utf-8')).hexdigest()[:16]
+    _modulename = '%s_%s' % (className.lower(), _digest)
+    _path = os.path.join(cachepath, COMPILEDDIR, '%s.py' % _modulename)
+
+    if not os.path.isfile(_path):
+        # worker processes may compile the same class at the same time
+        os.makedirs(os.path.dirname(_path), exist_ok=True)
+        _temp = '%s.%s.tmp' % (_path, os.getpid())
+        with open(_temp, mode='w', encoding='utf-8') as f:
+            f.write(_source)
+        os.replace(_temp, _path)
+
+    _spec = importlib.util.spec_from_file_location('gtool.compiled.%s' % _modulename, _path)
+    _module = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_module)
+    return _module.generate(classesdict), _path
+
+
+def prunecompiled(cachepath, keep):
+    """
+    Removes the sources (and compiled files) of classes that are not in use anymore
+
+    :param keep: paths of the sources to keep
+    """
+    _folder = os.path.join(cachepath, COMPILEDDIR)
+    if not os.path.isdir(_folder):
+        return
+    _keep = [os.path.splitext(os.path.basename(path))[0] for path in keep]
+    _candidates = [os.path.join(_folder, f) for f in os.listdir(_folder)]
+    if os.path.isdir(os.path.join(_folder, '__pycache__')):
+        _candidates += [os.path.join(_folder, '__pycache__', f)
+                        for f in os.listdir(os.path.join(_folder, '__pycache__'))]
+    for candidate in _candidates:
+        if os.path.isfile(candidate) and os.path.basename(candidate).split('.')[0] not in _keep:
+            try:
+                os.remove(candidate)
+            except OSError:
+                pass
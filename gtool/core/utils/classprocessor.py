@@ -1,209 +1,301 @@
 import pyparsing as p
 import collections
+import copy
+import hashlib
+import json
+import os
 
 # Statics
 # TODO make this proper object or wrap inside a module
 MODE_KEYWORD_MULTIPLE = 'multiple'
 MODE_KEYWORD_SINGLE = 'single'
+CLASSCACHEFILE = 'classes.json'
+CLASSCACHEVERSION = 1
+__CLASS_CACHE = '__classcache'
+__GRAMMARS = '__grammarcache'
 
+def classcachename():
+    return __CLASS_CACHE
 
-def readClass(configString):
-
-    def caps(string, location, tokens):
-        return str.capitalize(tokens[0])
-
-    def isList(string, location, tokens):
-        return True
-
-    def classParser():
-        # --- class parser ---
-        classColon = p.Literal('::').suppress()
-        className = p.Word(p.alphas.upper()).setResultsName('classname')
-        classDef = className + classColon + p.LineEnd().suppress()
-        return classDef
-
-    def _classParser():
-        # --- class parser ---
-        classColon = p.Literal('::').suppress()
-        className = p.Word(p.alphas.upper())
-        classDef = className + classColon + p.LineEnd().suppress()
-        return classDef
-
-    def metaParser():
-        # --- meta parser ---
-        metaIndicator = p.LineStart() + p.Suppress(p.Literal('*'))
-        metaName = p.Word(p.alphanums).setResultsName('metaname')
-        metaSeparator = p.Suppress(p.Literal('='))
-
-        # TODO force case insensitivity in attributeMode keyword match
-        # TODO add debug names
-        # TODO add a conditional debug flag
-
-        metavalue = p.Combine(p.restOfLine() + p.Suppress(p.LineEnd())).setResultsName('metavalue')
-
-        metaList = p.Dict(p.Group(metaIndicator +
-                                metaName +
-                                metaSeparator +
-                                metavalue
-                                ))
-        return metaList
-
-    def _metaParser():
-        # --- meta parser ---
-        metaIndicator = p.LineStart() + p.Suppress(p.Literal('*'))
-        metaName = p.Word(p.printables)
-        metaSeparator = p.Suppress(p.Literal('='))
-
-        # TODO force case insensitivity in attributeMode keyword match
-        # TODO add debug names
-        # TODO add a conditional debug flag
-
-        metavalue = p.Combine(p.restOfLine() + p.Suppress(p.LineEnd()))
-
-        metaList = metaIndicator + metaName + metaSeparator + metavalue
-        return metaList
-
-    def _funcParser():
-        # --- func attribute parser ---
-
-        # TODO add debug names
-        # TODO add a conditional debug flag
-
-        bracedString = p.Combine(p.Regex(r"{(?:[^{\n\r\\]|(?:{})|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*") + "}").setName(
-            "string enclosed in braces")
-
-        funcIndicator = p.Literal('!')
-        funcIndicator.setName('indicator')
-
-        funcName = p.Word(p.alphanums)
-        funcName.setName('name')
-        funcSeparator = p.Suppress(p.Literal('::'))
-        funcSeparator.setName('separator')
+def grammarsname():
+    return __GRAMMARS
 
-        funcModule = p.Word(p.printables, excludeChars='(')
-        funcModule.setName('module')
-        funcDemarcStart = p.Literal("(")
-        funcDemarcStart.setName('demarcstart')
+def classcachekey(configString):
+    return hashlib.sha1(configString.encode('utf-8')).hexdigest()
 
-        funcDemarcEnd = p.Literal(")")
-        funcDemarcEnd.setName('demarcend')
-
-        funcMiddle = p.nestedExpr() #(p.sglQuotedString() | bracedString()) # | p.dblQuotedString())
-        funcMiddle.setName('middle')
+def readClassCached(configString):
+    """
+    readClass with the results kept for the life of the process by content hash, so that class files shared by
+    several projects loaded into one interpreter are parsed once. Every call returns its own copy as the generated
+    classes keep references to parts of it.
 
-        funcPattern = p.LineStart() + p.Suppress(funcIndicator) + funcName + p.Suppress(funcSeparator) + \
-                      funcModule + funcMiddle + \
-                      p.Suppress(p.Optional(p.LineEnd())) #funcModule + p.Suppress(funcDemarcStart) + p.Optional(funcMiddle) + p.Suppress(funcDemarcEnd) + \
+    The parse results of pyparsing are returned as lists so that the definitions can be stored on disk
+    (see readClassCache and writeClassCache).
+    """
+    _key = classcachekey(configString)
+    _cache = globals()[classcachename()]
+    if _key not in _cache:
+        _cache[_key] = __aslists(readClass(configString))
+    return copy.deepcopy(_cache[_key])
 
-        return funcPattern
+def readClassCache(cachepath):
+    """
+    Adds the class definitions stored in a cache file by writeClassCache to the definitions kept by
+    readClassCached. A file written by another version of gtool is ignored.
 
-    def attributeParser():
-        # --- attribute parser ---
-        attributeIndicator = p.LineStart() + p.Suppress(p.Literal('@'))
-        attributeName = p.Word(p.alphanums).setResultsName('attributename')
-        attributeSeparator = p.Suppress(p.Literal('::'))
+    :return: set of the keys (see classcachekey) in the file
+    """
+    import gtool
 
-        # TODO force case insensitivity in attributeMode keyword match
-        # TODO add debug names
-        # TODO add a conditional debug flag
+    try:
+        with open(cachepath, mode='r', encoding='utf-8') as f:
+            _stored = json.load(f, object_pairs_hook=collections.OrderedDict)
+    except (OSError, ValueError):
+        return set()
 
-        attributeMode = (
-                            p.Word(MODE_KEYWORD_SINGLE) | p.Word(MODE_KEYWORD_MULTIPLE)
-                        ).setResultsName('attributemode') + p.Literal(':').suppress()
+    if not isinstance(_stored, dict) or _stored.get('version', None) != CLASSCACHEVERSION or \
+            _stored.get('gtool', None) != gtool.__version__:
+        return set()
 
-        attributeType = (p.Word(p.alphanums).setResultsName('attributetype')).setParseAction(caps)
+    _cache = globals()[classcachename()]
+    for key, classes in _stored.get('classes', {}).items():
+        _cache.setdefault(key, classes)
+    return set(_stored.get('classes', {}).keys())
 
-        attributePosargs = p.ZeroOrMore(
-            (
-                p.Word(p.alphanums) |
-                p.Combine(
-                    p.Literal('[') + p.SkipTo(']') + p.Literal(']')
-                )
-            ) + ~p.FollowedBy(p.Literal('=')) +
-            p.Optional(p.Literal(',').suppress())
-        ).setResultsName('posargs')
-
-        attributeKwargs = p.ZeroOrMore(
-            p.Group(
-                p.Word(p.alphanums).setResultsName('keyword') +
-                p.Literal('=').suppress() +
-                (
-                    p.Word(p.alphanums) | p.Combine(
-                        p.Literal('[') + p.SkipTo(']') + p.Literal(']')
-                    )
-                ).setResultsName('value') +
-                p.Optional(p.Literal(',').suppress())
+def writeClassCache(cachepath, keys):
+    """
+    Stores the class definitions of class files (by their keys, see classcachekey) read by readClassCached
+    """
+    import gtool
+
+    _stored = {'version': CLASSCACHEVERSION,
+               'gtool': gtool.__version__,
+               'classes': {key: globals()[classcachename()][key] for key in keys}}
+    # the cache only saves time, a project folder that cannot be written to is not an error
+    try:
+        os.makedirs(os.path.dirname(cachepath), exist_ok=True)
+        with open(cachepath, mode='w', encoding='utf-8') as f:
+            json.dump(_stored, f)
+    except OSError:
+        pass
+
+def __aslists(item):
+    if isinstance(item, p.ParseResults):
+        return item.asList()
+    if isinstance(item, collections.OrderedDict):
+        return collections.OrderedDict((k, __aslists(v)) for k, v in item.items())
+    if isinstance(item, dict):
+        return {k: __aslists(v) for k, v in item.items()}
+    if isinstance(item, (list, tuple)):
+        return [__aslists(i) for i in item]
+    return item
+
+def caps(string, location, tokens):
+    return str.capitalize(tokens[0])
+
+def isList(string, location, tokens):
+    return True
+
+def classParser():
+    # --- class parser ---
+    classColon = p.Literal('::').suppress()
+    className = p.Word(p.alphas.upper()).setResultsName('classname')
+    classDef = className + classColon + p.LineEnd().suppress()
+    return classDef
+
+def _classParser():
+    # --- class parser ---
+    classColon = p.Literal('::').suppress()
+    className = p.Word(p.alphas.upper())
+    classDef = className + classColon + p.LineEnd().suppress()
+    return classDef
+
+def metaParser():
+    # --- meta parser ---
+    metaIndicator = p.LineStart() + p.Suppress(p.Literal('*'))
+    metaName = p.Word(p.alphanums).setResultsName('metaname')
+    metaSeparator = p.Suppress(p.Literal('='))
+
+    # TODO force case insensitivity in attributeMode keyword match
+    # TODO add debug names
+    # TODO add a conditional debug flag
+
+    metavalue = p.Combine(p.restOfLine() + p.Suppress(p.LineEnd())).setResultsName('metavalue')
+
+    metaList = p.Dict(p.Group(metaIndicator +
+                            metaName +
+                            metaSeparator +
+                            metavalue
+                            ))
+    return metaList
+
+def _metaParser():
+    # --- meta parser ---
+    metaIndicator = p.LineStart() + p.Suppress(p.Literal('*'))
+    metaName = p.Word(p.printables)
+    metaSeparator = p.Suppress(p.Literal('='))
+
+    # TODO force case insensitivity in attributeMode keyword match
+    # TODO add debug names
+    # TODO add a conditional debug flag
+
+    metavalue = p.Combine(p.restOfLine() + p.Suppress(p.LineEnd()))
+
+    metaList = metaIndicator + metaName + metaSeparator + metavalue
+    return metaList
+
+def _funcParser():
+    # --- func attribute parser ---
+
+    # TODO add debug names
+    # TODO add a conditional debug flag
+
+    bracedString = p.Combine(p.Regex(r"{(?:[^{\n\r\\]|(?:{})|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*") + "}").setName(
+        "string enclosed in braces")
+
+    funcIndicator = p.Literal('!')
+    funcIndicator.setName('indicator')
+
+    funcName = p.Word(p.alphanums)
+    funcName.setName('name')
+    funcSeparator = p.Suppress(p.Literal('::'))
+    funcSeparator.setName('separator')
+
+    funcModule = p.Word(p.printables, excludeChars='(')
+    funcModule.setName('module')
+    funcDemarcStart = p.Literal("(")
+    funcDemarcStart.setName('demarcstart')
+
+    funcDemarcEnd = p.Literal(")")
+    funcDemarcEnd.setName('demarcend')
+
+    funcMiddle = p.nestedExpr() #(p.sglQuotedString() | bracedString()) # | p.dblQuotedString())
+    funcMiddle.setName('middle')
+
+    funcPattern = p.LineStart() + p.Suppress(funcIndicator) + funcName + p.Suppress(funcSeparator) + \
+                  funcModule + funcMiddle + \
+                  p.Suppress(p.Optional(p.LineEnd())) #funcModule + p.Suppress(funcDemarcStart) + p.Optional(funcMiddle) + p.Suppress(funcDemarcEnd) + \
+
+    return funcPattern
+
+def attributeParser():
+    # --- attribute parser ---
+    attributeIndicator = p.LineStart() + p.Suppress(p.Literal('@'))
+    attributeName = p.Word(p.alphanums).setResultsName('attributename')
+    attributeSeparator = p.Suppress(p.Literal('::'))
+
+    # TODO force case insensitivity in attributeMode keyword match
+    # TODO add debug names
+    # TODO add a conditional debug flag
+
+    attributeMode = (
+                        p.Word(MODE_KEYWORD_SINGLE) | p.Word(MODE_KEYWORD_MULTIPLE)
+                    ).setResultsName('attributemode') + p.Literal(':').suppress()
+
+    attributeType = (p.Word(p.alphanums).setResultsName('attributetype')).setParseAction(caps)
+
+    attributePosargs = p.ZeroOrMore(
+        (
+            p.Word(p.alphanums) |
+            p.Combine(
+                p.Literal('[') + p.SkipTo(']') + p.Literal(']')
             )
-        ).setResultsName('kwargs')
-
-        attributeArgs = (
-            p.Literal('(').suppress() +
-            attributePosargs +
-            attributeKwargs +
-            p.Literal(')').suppress()
-        ).setResultsName('attributeargs')
-
-        attributeList = p.Group(attributeIndicator +
-                                attributeName +
-                                attributeSeparator +
-                                attributeMode +
-                                attributeType +
-                                p.Optional(attributeArgs)
-                                )
-        return attributeList
-
-    def _attributeParser():
-        # --- attribute parser ---
-        attributeIndicator = p.LineStart() + p.Suppress(p.Literal('@'))
-        attributeName = p.Word(p.alphanums).setResultsName('attributename')
-        attributeSeparator = p.Suppress(p.Literal('::'))
-
-
-        # TODO force case insensitivity in attributeMode keyword match
-        # TODO add debug names
-        # TODO add a conditional debug flag
-
-        attributeMode = (
-                            p.Word(MODE_KEYWORD_SINGLE) | p.Word(MODE_KEYWORD_MULTIPLE)
-                        ).setResultsName('attributemode') + p.Literal(':').suppress()
-
-        attributeType = (p.Word(p.alphanums).setResultsName('attributetype')).setParseAction(caps)
-
-        attributePosargs = p.ZeroOrMore(
+        ) + ~p.FollowedBy(p.Literal('=')) +
+        p.Optional(p.Literal(',').suppress())
+    ).setResultsName('posargs')
+
+    attributeKwargs = p.ZeroOrMore(
+        p.Group(
+            p.Word(p.alphanums).setResultsName('keyword') +
+            p.Literal('=').suppress() +
             (
-                p.Word(p.alphanums) |
-                p.Combine(
+                p.Word(p.alphanums) | p.Combine(
                     p.Literal('[') + p.SkipTo(']') + p.Literal(']')
                 )
-            ) + ~p.FollowedBy(p.Literal('=')) +
+            ).setResultsName('value') +
             p.Optional(p.Literal(',').suppress())
-        ).setResultsName('posargs')
-
-        kwargprintables = p.printables.translate(str.maketrans('', '', '=,[]()'))
-
-        attributeKwargs = p.ZeroOrMore(
-            p.Group(
-                p.Word(p.alphanums).setResultsName('keyword') +
-                p.Literal('=').suppress() +
-                (
-                    p.Word(kwargprintables) | p.Combine(
-                        p.Literal('[').suppress() + p.SkipTo(']') + p.Literal(']').suppress()
-                    )
-                ).setResultsName('value') +
-                p.Optional(p.Literal(',').suppress()) #TODO figure out how to make quotes work as enclosers instead of []
+        )
+    ).setResultsName('kwargs')
+
+    attributeArgs = (
+        p.Literal('(').suppress() +
+        attributePosargs +
+        attributeKwargs +
+        p.Literal(')').suppress()
+    ).setResultsName('attributeargs')
+
+    attributeList = p.Group(attributeIndicator +
+                            attributeName +
+                            attributeSeparator +
+                            attributeMode +
+                            attributeType +
+                            p.Optional(attributeArgs)
+                            )
+    return attributeList
+
+def _attributeParser():
+    # --- attribute parser ---
+    attributeIndicator = p.LineStart() + p.Suppress(p.Literal('@'))
+    attributeName = p.Word(p.alphanums).setResultsName('attributename')
+    attributeSeparator = p.Suppress(p.Literal('::'))
+
+
+    # TODO force case insensitivity in attributeMode keyword match
+    # TODO add debug names
+    # TODO add a conditional debug flag
+
+    attributeMode = (
+                        p.Word(MODE_KEYWORD_SINGLE) | p.Word(MODE_KEYWORD_MULTIPLE)
+                    ).setResultsName('attributemode') + p.Literal(':').suppress()
+
+    attributeType = (p.Word(p.alphanums).setResultsName('attributetype')).setParseAction(caps)
+
+    attributePosargs = p.ZeroOrMore(
+        (
+            p.Word(p.alphanums) |
+            p.Combine(
+                p.Literal('[') + p.SkipTo(']') + p.Literal(']')
             )
-        ).setResultsName('kwargs')
+        ) + ~p.FollowedBy(p.Literal('=')) +
+        p.Optional(p.Literal(',').suppress())
+    ).setResultsName('posargs')
 
-        attributeArgs = (
-            p.Literal('(').suppress() +
-            attributePosargs +
-            attributeKwargs +
-            p.Literal(')').suppress()
-        ).setResultsName('attributeargs')
+    kwargprintables = p.printables.translate(str.maketrans('', '', '=,[]()'))
+
+    attributeKwargs = p.ZeroOrMore(
+        p.Group(
+            p.Word(p.alphanums).setResultsName('keyword') +
+            p.Literal('=').suppress() +
+            (
+                p.Word(kwargprintables) | p.Combine(
+                    p.Literal('[').suppress() + p.SkipTo(']') + p.Literal(']').suppress()
+                )
+            ).setResultsName('value') +
+            p.Optional(p.Literal(',').suppress()) #TODO figure out how to make quotes work as enclosers instead of []
+        )
+    ).setResultsName('kwargs')
+
+    attributeArgs = (
+        p.Literal('(').suppress() +
+        attributePosargs +
+        attributeKwargs +
+        p.Literal(')').suppress()
+    ).setResultsName('attributeargs')
+
+    attributeList = attributeIndicator + attributeName + attributeSeparator + \
+                    attributeMode + attributeType + p.Optional(attributeArgs)
+    return attributeList
+
+def __grammars():
+    # the grammars are built once per process, when the first class file is parsed
+    if globals()[grammarsname()] is None:
+        globals()[grammarsname()] = {'class': _classParser(),
+                                     'meta': _metaParser(),
+                                     'attribute': _attributeParser(),
+                                     'method': _funcParser()}
+    return globals()[grammarsname()]
 
-        attributeList = attributeIndicator + attributeName + attributeSeparator + \
-                        attributeMode + attributeType + p.Optional(attributeArgs)
-        return attributeList
+def readClass(configString):
 
     def _generateAttributes(attributes):
 
@@ -240,7 +332,7 @@ def readClass(configString):
 
         configblocks = []
 
-        for x in _classParser().scanString(configstring):
+        for x in _grammars['class'].scanString(configstring):
             _classblocklist_start.append(x[1])
 
         _classblocklist_start.append(len(configstring)-1)
@@ -258,14 +350,14 @@ def readClass(configString):
             _classname = None
 
             #print('\n--- class ---')
-            for x in _classParser().scanString(block):
+            for x in _grammars['class'].scanString(block):
                 #print(x[0])
                 _classname = x[0][0]
                 #_parsedconfig[_classname] = {}
 
             #print('--- meta ---')
             _metadict = {}
-            for x in _metaParser().scanString(block):
+            for x in _grammars['meta'].scanString(block):
                 #print(x[0])
                 _metadict[x[0][0]] = x[0][1]
             _parsedconfig['metas'] = _metadict
@@ -273,7 +365,7 @@ def readClass(configString):
             #print('--- attributes ---')
             _attributedict = {}
             _attribparseresultslist = []
-            for x in _attributeParser().scanString(block):
+            for x in _grammars['attribute'].scanString(block):
                 #print(x)
                 _attributedict[x[0][0]] = x[0][1:]
                 _attribparseresultslist.append(x[0])
@@ -287,7 +379,7 @@ def readClass(configString):
             A normal dict get's read randomly and will result in attribute errors when you call
             """
             _methodsdict = collections.OrderedDict()
-            for x in _funcParser().scanString(block):
+            for x in _grammars['method'].scanString(block):
                 #print(x[0])
 
                 #check if method contains a config string
@@ -330,6 +422,8 @@ def readClass(configString):
 
     # --- full parser ---
 
+    _grammars = __grammars()
+
     #parseconfig(configString)
 
     """
@@ -428,4 +522,6 @@ def processClass(config):
     #print('classdict:', classDict)
     return classDict
 
-
+#--- initialize namespace
+globals()[classcachename()] = dict()
+globals()[grammarsname()] = None
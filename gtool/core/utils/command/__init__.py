@@ -1,5 +1,8 @@
 import click
 from .process import processproject
+from .watch import watchproject, RELOAD
+from .serve import serveproject
+from .processmany import processmany, OK
 from .listelements import listelements
 from gtool.core.utils.scaffold import newproject
 import sys, os
@@ -7,8 +10,8 @@ import sys, os
 if sys.version_info[:2] < (3, 5):
     raise ImportError("Python 3.5 or later is required for G.Tool (%d.%d detected)." % sys.version_info[:2])
 
-#TODO read from central version file (such as \projecttemplate)
-VERSION='Version 0.1.12 BETA'
+from gtool import __version__
+VERSION='Version %s BETA' % __version__
 
 def __create__():
     pass
@@ -24,11 +27,13 @@ def cli():
                 type=click.Path(exists=True, file_okay=False, resolve_path=True))
 @click.option('--scheme',
               prompt=True,
-              help='[REQUIRED] one of the output schemes specified in gtool.cfg. '
-                   'For outsceme output.1 write "gtool --scheme 1"')
+              help='[REQUIRED] one or more (comma separated) of the output schemes specified in gtool.cfg. '
+                   'For outsceme output.1 write "gtool --scheme 1", for output.1 and output.2 write '
+                   '"gtool --scheme 1,2"')
 @click.option('--output',
               type=click.Path(exists=False, file_okay=True, resolve_path=False),
-              help='[OPTIONAL] location to output data (may be required by some output schemes)')
+              help='[OPTIONAL] location to output data (may be required by some output schemes). '
+                   'For more than one scheme either one location per scheme (comma separated) or a directory')
 @click.option('--verbose',
               is_flag=True,
               help='[OPTIONAL] makes gtool more chatty')
@@ -38,15 +43,163 @@ def cli():
 @click.option('--debug',
               is_flag=True,
               help='[OPTIONAL] not implemented yet')
-def process(path, scheme, output, verbose, silent, debug):
-    """gtool PROCESS will read a project folder located at the provided PATH location and generate an output."""
+@click.option('--cache',
+              is_flag=True,
+              help='[OPTIONAL] reuse parsed data of unchanged files (stored in .gtool-cache in the project folder)')
+@click.option('--jobs',
+              type=click.IntRange(min=1),
+              default=1,
+              help='[OPTIONAL] number of worker processes used to read and parse the data files')
+@click.option('--threads',
+              type=click.IntRange(min=1),
+              default=1,
+              help='[OPTIONAL] number of output schemes rendered at the same time')
+def process(path, scheme, output, verbose, silent, debug, cache, jobs, threads):
+    """gtool PROCESS will read a project folder located at the provided PATH location and generate an output.
+    Several output schemes are generated from a single read of the project."""
     #processproject(path, scheme, output, verbose, silent, debug)
     processproject(path=path,
                    output=output,
                    scheme=scheme,
                    verbose=verbose,
                    silent=silent,
-                   debug=debug)
+                   debug=debug,
+                   cache=cache,
+                   jobs=jobs,
+                   threads=threads)
+    sys.exit(0)
+
+@click.command(short_help="Process a project into final output whenever its data changes")
+@click.argument('path',
+                default='.',
+                type=click.Path(exists=True, file_okay=False, resolve_path=True))
+@click.option('--scheme',
+              prompt=True,
+              help='[REQUIRED] one or more (comma separated) of the output schemes specified in gtool.cfg. '
+                   'For outsceme output.1 write "gtool --scheme 1", for output.1 and output.2 write '
+                   '"gtool --scheme 1,2"')
+@click.option('--output',
+              type=click.Path(exists=False, file_okay=True, resolve_path=False),
+              help='[OPTIONAL] location to output data (may be required by some output schemes). '
+                   'For more than one scheme either one location per scheme (comma separated) or a directory')
+@click.option('--verbose',
+              is_flag=True,
+              help='[OPTIONAL] makes gtool more chatty')
+@click.option('--silent',
+              is_flag=True,
+              help='[OPTIONAL] suppress all output except results (cannot use in combination with --verbose')
+@click.option('--debug',
+              is_flag=True,
+              help='[OPTIONAL] not implemented yet')
+@click.option('--cache',
+              is_flag=True,
+              help='[OPTIONAL] reuse parsed data of unchanged files (stored in .gtool-cache in the project folder)')
+@click.option('--interval',
+              type=click.FloatRange(min=0.1),
+              default=1.0,
+              help='[OPTIONAL] seconds between checks for changed files')
+def watch(path, scheme, output, verbose, silent, debug, cache, interval):
+    """gtool WATCH will read a project folder located at the provided PATH location, generate an output and
+    generate it again whenever a data file changes. Only changed files are read again. Changes to classes,
+    aggregates, plugins or gtool.cfg reload the whole project."""
+    try:
+        result = watchproject(path=path,
+                              output=output,
+                              scheme=scheme,
+                              verbose=verbose,
+                              silent=silent,
+                              debug=debug,
+                              cache=cache,
+                              interval=interval)
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+    if result == RELOAD:
+        # start over in a fresh interpreter as the registries cannot be loaded twice
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+    sys.exit(0)
+
+@click.command(short_help="Keep a project loaded and process it into output on request")
+@click.argument('path',
+                default='.',
+                type=click.Path(exists=True, file_okay=False, resolve_path=True))
+@click.option('--scheme',
+              prompt=True,
+              help='[REQUIRED] one of the output schemes specified in gtool.cfg. '
+                   'For outsceme output.1 write "gtool --scheme 1"')
+@click.option('--host',
+              default='127.0.0.1',
+              help='[OPTIONAL] address to listen on (defaults to localhost only)')
+@click.option('--port',
+              type=click.IntRange(min=0, max=65535),
+              default=8421,
+              help='[OPTIONAL] port to listen on')
+@click.option('--outputdir',
+              type=click.Path(exists=True, file_okay=False, resolve_path=True),
+              help='[OPTIONAL] directory the output parameter of requests is relative to, requests with an output '
+                   'are refused without it')
+@click.option('--verbose',
+              is_flag=True,
+              help='[OPTIONAL] makes gtool more chatty')
+@click.option('--silent',
+              is_flag=True,
+              help='[OPTIONAL] suppress all output except results (cannot use in combination with --verbose')
+@click.option('--debug',
+              is_flag=True,
+              help='[OPTIONAL] not implemented yet')
+@click.option('--cache',
+              is_flag=True,
+              help='[OPTIONAL] reuse parsed data of unchanged files (stored in .gtool-cache in the project folder)')
+def serve(path, scheme, host, port, outputdir, verbose, silent, debug, cache):
+    """gtool SERVE will read a project folder located at the provided PATH location once and generate an output
+    for every POST request to http://HOST:PORT/render. The optional parameters output (a location in OUTPUTDIR to
+    output data to) and subtree (e.g. /folder/file) select where to write the output and which part of the project
+    to process. Only data files that changed since the last request are read again. Requests addressed to other
+    hosts than localhost or HOST are refused."""
+    try:
+        result = serveproject(path=path,
+                              scheme=scheme,
+                              host=host,
+                              port=port,
+                              outputdir=outputdir,
+                              verbose=verbose,
+                              silent=silent,
+                              debug=debug,
+                              cache=cache)
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+    if result == RELOAD:
+        # start over in a fresh interpreter as the registries cannot be loaded twice
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+    sys.exit(0)
+
+@click.command(short_help="Process the projects listed in a manifest into final output")
+@click.argument('manifest',
+                type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.option('--jobs',
+              type=click.IntRange(min=1),
+              default=1,
+              help='[OPTIONAL] number of worker processes used to process projects in parallel')
+@click.option('--report',
+              type=click.Path(exists=False, file_okay=True, resolve_path=False),
+              help='[OPTIONAL] location to write a summary of timings and failures to (json)')
+@click.option('--verbose',
+              is_flag=True,
+              help='[OPTIONAL] makes gtool more chatty')
+@click.option('--silent',
+              is_flag=True,
+              help='[OPTIONAL] suppress all output (cannot use in combination with --verbose')
+@click.option('--debug',
+              is_flag=True,
+              help='[OPTIONAL] include the traceback of failures in the summary')
+def process_many(manifest, jobs, report, verbose, silent, debug):
+    """gtool PROCESS-MANY will process every project listed in the MANIFEST (an ini file with one section per
+    project setting its path, scheme and optionally output and cache). Each project is loaded with registries
+    of its own, plugins and class files are imported and parsed once per worker process."""
+    results = processmany(manifest, jobs=jobs, verbose=verbose, silent=silent, debug=debug, report=report)
+    if results is None or any(result['status'] != OK for result in results):
+        sys.exit(1)
     sys.exit(0)
 
 @click.command(short_help="Create a new project using the standard template")
@@ -90,6 +243,9 @@ def list_elements(path, list_type):
         sys.exit(1)
 
 cli.add_command(process, name='process')
+cli.add_command(watch, name='watch')
+cli.add_command(serve, name='serve')
+cli.add_command(process_many, name='process-many')
 cli.add_command(create, name='create')
 cli.add_command(version, name='version')
 cli.add_command(list_elements, name='list')
@@ -5,22 +5,17 @@ from gtool.core.utils import (loadconfig,
                               __loadclasses,
                               __loadaggregators
                               )
-from gtool.core.plugin import pluginnamespace
+from gtool.core.plugin import pluginnamespace, pluginbases
 from gtool.core.namespace import namespace as classnamespace
-import gtool.core.types.core as coretypes
-from gtool.core.types.output import Output
 from gtool.core.aggregatorregistry import aggregatornamespace
 import sys
-import inspect
 
 #'aggregates', 'classes', 'outputplugins', 'types', 'methods', 'plugins'
 
 def listaggregates():
     # TODO add errors
-    _base = inspect.getmro(coretypes.Aggregator)[0]
-
-    for k, v in pluginnamespace().items():
-        if _base in inspect.getmro(v):
+    for k in pluginnamespace():
+        if 'Aggregator' in pluginbases(k):
             print(k.title())
 
     return True
@@ -34,37 +29,31 @@ def listclasses():
 def listoutputplugins():
     #TODO add errors
 
-    _base = inspect.getmro(Output)[0]
-
-    for k,v in pluginnamespace().items():
-        if _base in inspect.getmro(v):
+    for k in pluginnamespace():
+        if 'Output' in pluginbases(k):
             print(k)
 
     return True
 
 def listtypes():
     # TODO add errors
-    _base = inspect.getmro(coretypes.CoreType)[0]
-
-    for k, v in pluginnamespace().items():
-        if _base in inspect.getmro(v):
+    for k in pluginnamespace():
+        if 'CoreType' in pluginbases(k):
             print(k.title())
 
     return True
 
 def listmethods():
     # TODO add errors
-    _base = inspect.getmro(coretypes.FunctionType)[0]
-
-    for k, v in pluginnamespace().items():
-        if _base in inspect.getmro(v):
+    for k in pluginnamespace():
+        if 'FunctionType' in pluginbases(k):
             print(k.title())
 
     return True
 
 def listplugins():
     # TODO add errors
-    for k, v in pluginnamespace().items():
+    for k in pluginnamespace():
         print(k)
     return True
 
@@ -2,16 +2,73 @@ import click
 from gtool.core.utils import (loadconfig,
                               __loadplugins,
                               __configloader,
+                              __loadindexes,
                               __loadclasses,
                               __loadaggregators,
                               __outputparser,
                               __registeroption,
-                              process)
+                              __enablecache,
+                              process,
+                              loadobjects as __loadobjects)
 from gtool.core.plugin import pluginnamespace
+from gtool.core.parsecache import parsecache
+from gtool.core.filewalker import objectmemo, registerObjectMemo
 from gtool.core.utils.config import partialnamespace
+from gtool.core.utils.runtime import runtimeoverride
+from concurrent.futures import ThreadPoolExecutor
 import sys
+import os
 
-def processproject(path=None, scheme=None, output=None, verbose=False, silent=False, debug=False):
+def processproject(path=None, scheme=None, output=None, verbose=False, silent=False, debug=False, cache=False, jobs=None,
+                   threads=None):
+    """
+    :param scheme: output scheme or comma separated list of output schemes, all of them are rendered from the
+    same loaded objects
+    :param output: location to output data to, for several schemes a comma separated list with one location per
+    scheme or a directory (see outputtargets)
+    :param threads: number of schemes rendered at the same time
+    """
+
+    _schemes = outputschemes(scheme)
+
+    if len(_schemes) > 1 and objectmemo() is None:
+        # every scheme renders the same objects
+        registerObjectMemo({})
+
+    projectconfig = loadproject(path=path, scheme=scheme, verbose=verbose, silent=silent, debug=debug, cache=cache)
+
+    dataobject = loaddata(projectconfig, verbose=verbose, debug=debug, jobs=jobs)
+
+    _outputs = outputtargets(_schemes, output=output, debug=debug)
+    _results = renderschemes(dataobject, _schemes, _outputs, verbose=verbose, debug=debug, threads=threads)
+
+    if parsecache() is not None:
+        try:
+            parsecache().save(prune=True)
+        except Exception as err:
+            if debug:
+                raise
+            # a cache that cannot be written only costs time on the next run
+            click.echo('Could not write the parse cache: %s' % err)
+
+    for _output, _result in zip(_outputs, _results):
+        if verbose:
+            click.echo('[VERBOSE] Rendering output to %s...' % _output if _output is not None else "standard out")
+        elif not silent and _output is not None:
+            click.echo('Output written to %s' % _output)
+
+        printresult(_result)
+
+    if not silent:
+        click.echo('Done')
+
+def loadproject(path=None, scheme=None, verbose=False, silent=False, debug=False, cache=False):
+    """
+    Loads the configuration, plugins, classes and aggregators of a project and registers the output scheme.
+    Errors are reported and end the program.
+
+    :return: project configuration as returned by loadconfig
+    """
 
     if verbose and silent:
         click.echo('cannot use both the --verbose and --silent options together.')
@@ -35,6 +92,19 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
                    'during the error: %s' % err)
         sys.exit(status=1)
 
+    if cache:
+        try:
+            if verbose:
+                click.echo('[VERBOSE] Enabling the parse cache in %s...' % projectconfig['root'])
+            __enablecache(projectconfig['root'])
+        except Exception as err:
+            if dbg:
+                raise
+            click.echo('While enabling the parse cache '
+                       'an error occurred. The following message was received '
+                       'during the error: %s' % err)
+            sys.exit(1)
+
     try:
         if verbose:
             click.echo('[VERBOSE] Loading plugins from code base and %s\\plugins...' % projectconfig['root'])
@@ -59,6 +129,18 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
                    'during the error: %s' % err)
         sys.exit(1)
 
+    try:
+        if verbose:
+            click.echo('[VERBOSE] Registering the attribute indexes in [index]...')
+        __loadindexes()
+    except Exception as err:
+        if dbg:
+            raise
+        click.echo('While registering the attribute indexes '
+                   'an error occurred. The following message was received '
+                   'during the error: %s' % err)
+        sys.exit(1)
+
     try:
         if verbose:
             click.echo('[VERBOSE] Loading user defined classes from %s...' % projectconfig['classes'])
@@ -87,8 +169,11 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
     if verbose:
         click.echo('[VERBOSE] Registering run time options...')
 
+    _schemes = outputschemes(scheme)
+
     try:
-        __registeroption('outputscheme', scheme)
+        # the first scheme is the default, renders override it with their own scheme
+        __registeroption('outputscheme', _schemes[0])
     except Exception as err:
         if dbg:
             raise
@@ -108,22 +193,86 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
                    'The following message was received during the error: %s' % err)
         sys.exit(1)
 
+    # a scheme may be listed more than once to render it to several locations
+    for _scheme in [_scheme for i, _scheme in enumerate(_schemes) if _scheme not in _schemes[:i]]:
+        try:
+            __outputparser(outputscheme=_scheme)
+        except Exception as err:
+            if dbg:
+                raise
+            click.echo('While registering output schemes for user configured classes '
+                       'an error occurred. The following message was received '
+                       'during the error: %s' % err)
+            sys.exit(1)
+
+    return projectconfig
+
+def outputschemes(scheme):
+    """
+    :param scheme: output scheme, comma separated list of output schemes or list of output schemes
+    :return: list of output schemes
+    """
+    if isinstance(scheme, (list, tuple)):
+        return list(scheme)
+    if scheme is None:
+        return [None]
+    return [_scheme.strip() for _scheme in scheme.split(',')]
+
+def outputtargets(schemes, output=None, debug=False):
+    """
+    Works out where each output scheme renders to. output is either a comma separated list with one location per
+    scheme or a directory. In a directory each scheme is written to a file named after the scheme with the file
+    extension of its output plugin, schemes whose plugin does not write files render to standard out.
+    Errors are reported and end the program.
+
+    :return: list of output locations (or None) in the order of schemes
+    """
+    if output is None:
+        return [None for _scheme in schemes]
+    elif len(schemes) == 1:
+        return [output]
+
+    _outputs = [_output.strip() for _output in output.split(',')]
+    if len(_outputs) == len(schemes):
+        return _outputs
+    elif len(_outputs) > 1:
+        click.echo('Got %s output locations for %s output schemes, please provide one location per scheme '
+                   'or a directory.' % (len(_outputs), len(schemes)))
+        sys.exit(1)
+
     try:
-        __outputparser(outputscheme=scheme)
+        os.makedirs(output, exist_ok=True)
     except Exception as err:
-        if dbg:
+        if debug:
             raise
-        click.echo('While registering output schemes for user configured classes '
-                   'an error occurred. The following message was received '
-                   'during the error: %s' % err)
+        click.echo('While creating the output directory %s an error occurred. '
+                   'The following message was received during the error: %s' % (output, err))
         sys.exit(1)
 
+    _ret = []
+    for _scheme in schemes:
+        _plugin = partialnamespace('output').get(_scheme, {}).get('plugin', None)
+        _extension = getattr(pluginnamespace().get(_plugin.upper(), None), 'extension', None) \
+            if _plugin is not None else None
+        _ret.append(os.path.join(output, _scheme + _extension) if _extension is not None else None)
+    return _ret
+
+def loaddata(projectconfig, verbose=False, debug=False, jobs=None):
+    """
+    Walks the data folder of a loaded project. Errors are reported and end the program.
+
+    :return: project structure (objects are loaded when the output plugin consumes it)
+    """
+
+    dbg = debug
     dataobject = None
 
     try:
         if verbose:
             click.echo('[VERBOSE] Loading data from %s...' % projectconfig['dataroot'])
-        dataobject = process(projectconfig['dataroot'])
+            if jobs is not None and jobs > 1:
+                click.echo('[VERBOSE] Parsing data files with %s worker processes...' % jobs)
+        dataobject = process(projectconfig['dataroot'], jobs=jobs)
     except Exception as err:
         if dbg:
             raise
@@ -132,6 +281,65 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
                    'during the error: %s' % err)
         sys.exit(1)
 
+    return dataobject
+
+def loadobjects(dataobject, verbose=False, debug=False):
+    """
+    Loads every object of a project structure and computes their deferred methods (see
+    gtool.core.utils.loadobjects). Errors are reported and end the program.
+    """
+
+    try:
+        if verbose:
+            click.echo('[VERBOSE] Loading the objects...')
+        __loadobjects(dataobject)
+    except Exception as err:
+        if debug:
+            raise
+        click.echo('While loading the objects an error occurred. '
+                   'The following message was received '
+                   'during the error: %s' % err)
+        sys.exit(1)
+
+def renderschemes(dataobject, schemes, outputs, verbose=False, debug=False, threads=None):
+    """
+    Renders several output schemes from the same objects, see renderproject
+
+    :param outputs: output location per scheme
+    :param threads: number of schemes rendered at the same time
+    :return: list of results in the order of schemes
+    """
+
+    if len(schemes) > 1 or objectmemo() is not None:
+        # objects that are rendered more than once are completed first, so that every render sees the same
+        # objects whatever the order they render in. Objects are also registered while they load, so they have
+        # to be loaded before threads share them
+        loadobjects(dataobject, verbose=verbose, debug=debug)
+
+    if threads is None or threads < 2:
+        return [renderproject(dataobject, scheme=scheme, output=output, verbose=verbose, debug=debug)
+                for scheme, output in zip(schemes, outputs)]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        _futures = [executor.submit(renderproject, dataobject, scheme=scheme, output=output, verbose=verbose,
+                                    debug=debug)
+                    for scheme, output in zip(schemes, outputs)]
+        return [future.result() for future in _futures]
+
+def renderproject(dataobject, scheme=None, output=None, verbose=False, debug=False):
+    """
+    Runs the output plugin of an output scheme over a project structure. Errors are reported and end the program.
+
+    :return: the result of the output plugin
+    """
+
+    # plugins and formatters look the scheme up in the runtime options
+    with runtimeoverride('outputscheme', scheme):
+        return __renderproject(dataobject, scheme=scheme, output=output, verbose=verbose, debug=debug)
+
+def __renderproject(dataobject, scheme=None, output=None, verbose=False, debug=False):
+
+    dbg = debug
     outputprocessor = None
 
     if verbose:
@@ -140,13 +348,13 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
     outputschemeconfig = partialnamespace('output').get(scheme, None)
 
     if outputschemeconfig is None:
-        click.echo('Could not find [output.%s] in gtool.cfg.')
+        click.echo('Could not find [output.%s] in gtool.cfg.' % scheme)
         sys.exit(1)
 
     outputschemeplugin = outputschemeconfig.get('plugin', None)
 
     if outputschemeplugin is None:
-        click.echo('an output plugin is not specified in [output.%s] in gtool.cfg.')
+        click.echo('an output plugin is not specified in [output.%s] in gtool.cfg.' % scheme)
         sys.exit(1)
 
     try:
@@ -175,17 +383,12 @@ def processproject(path=None, scheme=None, output=None, verbose=False, silent=Fa
                    'during the error: %s' % err)
         sys.exit(1)
 
-    if verbose:
-        click.echo('[VERBOSE] Rendering output to %s...' % output if output is not None else "standard out")
-    elif not silent and output is not None:
-        click.echo('Output written to %s' % output)
+    return result
 
+def printresult(result):
     if not isinstance(result, bool):
         if not isinstance(result, str) and hasattr(result, '__iter__'):
             for row in result:
                 print(row)
         else:
             print(result)
-
-    if not silent:
-        click.echo('Done')
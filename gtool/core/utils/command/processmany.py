@@ -0,0 +1,170 @@
+import click
+import configparser
+import contextlib
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from gtool.core.project import Project
+from .process import outputschemes, outputtargets
+
+OK = 'ok'
+FAILED = 'failed'
+
+def readmanifest(manifestpath):
+    """
+    Reads a manifest of projects. Every section is a project, relative paths are relative to the manifest:
+
+        [DEFAULT]
+        scheme: 1
+
+        [risks]
+        path: projects\\risks
+        scheme: 1,2
+        output: output\\risks
+        cache: yes
+
+    path is required, scheme is required unless set in [DEFAULT], output (a location per scheme or a directory,
+    see outputtargets) and cache are optional.
+
+    :return: list of dicts with the keys name, path, scheme, output and cache
+    """
+    config = configparser.ConfigParser()
+    with open(manifestpath, mode='r') as f:
+        config.read_file(f)
+
+    _root = os.path.dirname(os.path.abspath(manifestpath))
+    _ret = []
+    for section in config.sections():
+        _options = config[section]
+        for option in ('path', 'scheme'):
+            if _options.get(option, None) is None:
+                raise ValueError('[%s] in %s does not set a %s' % (section, manifestpath, option))
+
+        _output = _options.get('output', None)
+        if _output is not None:
+            _output = ','.join(os.path.normpath(os.path.join(_root, output.strip())) for output in _output.split(','))
+
+        _ret.append({'name': section,
+                     'path': os.path.normpath(os.path.join(_root, _options['path'])),
+                     'scheme': _options['scheme'],
+                     'output': _output,
+                     'cache': _options.getboolean('cache', fallback=False)})
+    return _ret
+
+def processentry(entry, debug=False):
+    """
+    Loads and renders a project of a manifest with registries of its own (see gtool.core.project.Project).
+    Runs in the worker processes of processmany, every worker loads as many projects as it is given.
+
+    :param entry: dict as returned by readmanifest
+    :return: dict with the name, status, load and render times (ms), outputs and error of the project
+    """
+    _ret = {'name': entry['name'],
+            'path': entry['path'],
+            'status': OK,
+            'load': None,
+            'render': None,
+            'outputs': [],
+            'error': None}
+
+    # messages of the project (and errors reported by the command line helpers) go to the report
+    _messages = io.StringIO()
+    with contextlib.redirect_stdout(_messages):
+        _start = time.monotonic()
+        try:
+            project = Project(entry['path'], cache=entry['cache']).load()
+            _ret['load'] = (time.monotonic() - _start) * 1000
+
+            _start = time.monotonic()
+            _schemes = outputschemes(entry['scheme'])
+            with project:
+                _outputs = outputtargets(_schemes, output=entry['output'], debug=True)
+            for scheme, output in zip(_schemes, _outputs):
+                project.render(scheme, output=output)
+                _ret['outputs'].append(output)
+            _ret['render'] = (time.monotonic() - _start) * 1000
+        except SystemExit:
+            _ret['status'] = FAILED
+            _ret['error'] = _messages.getvalue().strip()
+        except Exception as err:
+            _ret['status'] = FAILED
+            if debug:
+                _ret['error'] = traceback.format_exc()
+            else:
+                _ret['error'] = '%s' % (err.args[0] if isinstance(err, KeyError) and len(err.args) > 0 else err)
+
+    return _ret
+
+def processmany(manifest, jobs=None, verbose=False, silent=False, debug=False, report=None):
+    """
+    Loads and renders every project of a manifest (see readmanifest). With more than one job the projects are
+    processed by a pool of worker processes, each worker imports gtool, its plugins and the libraries they use
+    once and parses a class file that several projects share once.
+
+    :param jobs: number of worker processes
+    :param report: location to write the summary to as json
+    :return: list of the results of processentry in the order of the manifest
+    """
+
+    if verbose and silent:
+        click.echo('cannot use both the --verbose and --silent options together.')
+        return None
+
+    try:
+        entries = readmanifest(manifest)
+    except Exception as err:
+        if debug:
+            raise
+        click.echo('While reading the manifest %s an error occurred. The following message was received '
+                   'during the error: %s' % (manifest, err))
+        return None
+
+    if not silent:
+        click.echo('Processing %s projects from %s...' % (len(entries), manifest))
+
+    _start = time.monotonic()
+    _results = []
+
+    def _done(result):
+        _results.append(result)
+        if verbose or (not silent and result['status'] != OK):
+            click.echo('[%s] %s' % (result['status'].upper(), result['name']))
+
+    if jobs is None or jobs < 2:
+        for entry in entries:
+            _done(processentry(entry, debug=debug))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(processentry, entries, [debug] * len(entries)):
+                _done(result)
+
+    _elapsed = time.monotonic() - _start
+
+    if not silent:
+        printsummary(_results, _elapsed)
+
+    if report is not None:
+        with open(report, mode='w') as f:
+            json.dump({'elapsed': _elapsed * 1000, 'projects': _results}, f, indent=4)
+
+    return _results
+
+def printsummary(results, elapsed):
+    _failed = [result for result in results if result['status'] != OK]
+
+    def _ms(value):
+        return '-' if value is None else '%.0f' % value
+
+    _width = max([len(result['name']) for result in results] + [len('project')])
+    click.echo('%s  %-6s  %8s  %8s' % ('project'.ljust(_width), 'status', 'load ms', 'render ms'))
+    for result in results:
+        click.echo('%s  %-6s  %8s  %8s' % (result['name'].ljust(_width), result['status'],
+                                            _ms(result['load']), _ms(result['render'])))
+
+    for result in _failed:
+        click.echo('\n%s failed: %s' % (result['name'], result['error']))
+
+    click.echo('\nProcessed %s projects in %.1f s, %s failed' % (len(results), elapsed, len(_failed)))
@@ -0,0 +1,275 @@
+import click
+import contextlib
+import io
+import os
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from gtool.core.filewalker import StructureFactory, objectmemo, registerObjectMemo
+from gtool.core.parsecache import parsecache
+from gtool.core.utils.watcher import snapshot
+from gtool.core.project import usescheme
+from .process import loadproject, loaddata, renderschemes, printresult, outputschemes
+from .watch import RELOAD, projectsnapshot, refreshdata
+
+# Host header values always answered by the server, besides the host it listens on
+LOCALHOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+
+def subtree(structure, uri):
+    """
+    Finds the node of a project structure at uri, e.g. /folder/file, names are matched without case. The root
+    of a structure is at / and a node is returned wrapped in a root container so that it renders like a
+    whole project.
+
+    :return: StructureFactory.Container
+    """
+    _node = structure
+    for name in [n for n in uri.strip('/').split('/') if n != '']:
+        _children = [child for child in _node.children if child.name.lower() == name.lower()] \
+            if isinstance(_node, StructureFactory.Container) else []
+        if len(_children) == 0:
+            raise KeyError('%s does not exist in the project' % uri)
+        _node = _children[0]
+
+    if isinstance(_node, StructureFactory.Container):
+        return _node
+
+    # the node keeps its parent, only the wrapper refers to it
+    _ret = StructureFactory.Container(name='*', fileobject=_node.fileobject)
+    _ret.__children__ = [_node]
+    return _ret
+
+
+class ProjectServer(HTTPServer):
+    """
+    Keeps a project loaded and renders it for every request. Requests are handled one at a time as the
+    registries are shared by all of them.
+
+    POST /render?scheme=1&output=path&subtree=/folder/file
+
+    renders the project (or the subtree) with an output scheme of gtool.cfg, by default the first scheme the
+    server was started with, and answers with the result, or with a confirmation if an output path is given.
+    The parameters may also be sent as a form in the body of the request. Output paths are relative to the
+    output directory the server was started with and cannot leave it, without one the output parameter is
+    refused. Only requests addressed to localhost (or to the host the server listens on) are answered. Data
+    files that changed since the last request are loaded again before rendering, a change to classes,
+    aggregates, plugins or gtool.cfg stops the server so that it can be started again. Aggregates of a subtree
+    are computed over all objects loaded so far.
+    """
+
+    def __init__(self, address, projectconfig, scheme, outputdir=None, verbose=False, silent=False, debug=False):
+        super(ProjectServer, self).__init__(address, RenderHandler)
+        self.projectconfig = projectconfig
+        self.scheme = outputschemes(scheme)[0]
+        self.outputdir = os.path.realpath(outputdir) if outputdir is not None else None
+        self.hosts = LOCALHOSTS | {address[0].lower()}
+        self.verbose = verbose
+        self.silent = silent
+        self.debug = debug
+        self.reload = False
+        self.projectsnapshot = projectsnapshot(projectconfig)
+        self.datasnapshot = snapshot(projectconfig['dataroot'])
+        self.dataobject = loaddata(projectconfig, verbose=verbose, debug=debug)
+
+    def outputpath(self, output):
+        """
+        :return: output resolved in the output directory of the server
+        :raises PermissionError: if the server has no output directory or output is outside of it
+        """
+        if self.outputdir is None:
+            raise PermissionError('The server was started without an output directory, output cannot be written')
+        _path = os.path.realpath(os.path.join(self.outputdir, output))
+        if os.path.commonpath([self.outputdir, _path]) != self.outputdir or _path == self.outputdir:
+            raise PermissionError('%s is not a file in the output directory of the server' % output)
+        return _path
+
+    def refresh(self):
+        """
+        :return: number of changed data files, None if the project has to be loaded from scratch
+        """
+        if projectsnapshot(self.projectconfig) != self.projectsnapshot:
+            self.reload = True
+            return None
+
+        self.dataobject, self.datasnapshot, _changed = refreshdata(self.projectconfig,
+                                                                   self.dataobject,
+                                                                   self.datasnapshot,
+                                                                   verbose=self.verbose,
+                                                                   debug=self.debug)
+        return len(_changed)
+
+    def render(self, scheme=None, output=None, uri=None):
+        """
+        :return: tuple of a success flag and the text written by the output plugin and the error handlers
+        """
+        _text = io.StringIO()
+        with contextlib.redirect_stdout(_text):
+            try:
+                _structure = self.dataobject if uri is None else subtree(self.dataobject, uri)
+                result, = renderschemes(_structure, [scheme], [output], verbose=self.verbose, debug=self.debug)
+            except SystemExit:
+                # renderproject reported the error
+                return False, _text.getvalue()
+            except Exception as err:
+                if self.debug:
+                    raise
+                click.echo('While rendering the project an error occurred. '
+                           'The following message was received during the error: %s' % err)
+                return False, _text.getvalue()
+
+            if parsecache() is not None:
+                # entries of reused objects are not seen again, so the cache is not pruned
+                parsecache().save()
+
+            if output is not None:
+                click.echo('Output written to %s' % output)
+            printresult(result)
+
+        return True, _text.getvalue()
+
+
+def hostname(value):
+    """
+    :return: the host of a Host header or of an Origin, without the scheme and port, in lower case
+    """
+    _value = value.strip().lower()
+    if '://' in _value:
+        _value = _value.split('://', 1)[1]
+    _value = _value.split('/', 1)[0]
+    if _value.startswith('['):
+        # [::1]:8421
+        return _value[1:].split(']', 1)[0]
+    return _value.rsplit(':', 1)[0] if _value.count(':') == 1 else _value
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if not self.allowed():
+            return
+        self.respond(405, 'Use POST to render', headers={'Allow': 'POST'})
+
+    def do_POST(self):
+        if not self.allowed():
+            return
+
+        _url = urlparse(self.path)
+        if _url.path.rstrip('/') != '/render':
+            self.respond(404, 'Unknown request %s, use /render' % _url.path)
+            return
+
+        _length = int(self.headers.get('Content-Length', 0) or 0)
+        _body = self.rfile.read(_length).decode('utf-8') if _length > 0 else ''
+        _query = {k: v[-1] for k, v in parse_qs(_url.query).items()}
+        _query.update({k: v[-1] for k, v in parse_qs(_body).items()})
+        _scheme = _query.get('scheme', self.server.scheme)
+
+        _output = None
+        if 'output' in _query:
+            try:
+                _output = self.server.outputpath(_query['output'])
+            except PermissionError as err:
+                self.respond(403, '%s' % err)
+                return
+
+        try:
+            # formatters of schemes other than those the server was started with are registered on first use
+            usescheme(_scheme)
+        except KeyError as err:
+            self.respond(404, '%s' % err.args[0])
+            return
+
+        _start = time.monotonic()
+        _changed = self.server.refresh()
+        if _changed is None:
+            self.respond(503, 'Classes, aggregates, plugins or gtool.cfg changed, the server is reloading the project')
+            return
+
+        if 'subtree' in _query:
+            try:
+                subtree(self.server.dataobject, _query['subtree'])
+            except KeyError as err:
+                self.respond(404, '%s' % err.args[0])
+                return
+
+        _success, _text = self.server.render(scheme=_scheme, output=_output, uri=_query.get('subtree', None))
+        self.respond(200 if _success else 500, _text)
+
+        if not self.server.silent:
+            click.echo('Rendered %s%s (%s changed files, %.0f ms)' % (
+                _scheme,
+                ' %s' % _query['subtree'] if 'subtree' in _query else '',
+                _changed,
+                (time.monotonic() - _start) * 1000))
+
+    def allowed(self):
+        """
+        Refuses requests for other hosts (e.g. a web page that rebinds its name to this machine) and requests
+        sent by web pages of other hosts
+
+        :return: True if the request may be handled, the request is answered otherwise
+        """
+        _host = self.headers.get('Host', None)
+        if _host is None or hostname(_host) not in self.server.hosts:
+            self.respond(403, 'Requests must be addressed to localhost')
+            return False
+        _origin = self.headers.get('Origin', None)
+        if _origin is not None and hostname(_origin) not in self.server.hosts:
+            self.respond(403, 'Requests from %s are not allowed' % _origin)
+            return False
+        return True
+
+    def respond(self, status, text, headers=None):
+        _body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(_body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(_body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            click.echo('[VERBOSE] %s' % (format % args))
+
+
+def serveproject(path=None, scheme=None, host='127.0.0.1', port=8421, outputdir=None, verbose=False, silent=False,
+                 debug=False, cache=False, requests=None):
+    """
+    Loads a project once and renders it on request over http (see ProjectServer).
+
+    :param outputdir: directory the output of requests is written to, None refuses requests with an output
+
+    :param requests: number of requests to handle before returning, None serves until interrupted
+    :return: RELOAD if a class, aggregate, plugin or config file changed and the project has to be loaded from
+    scratch, True otherwise
+    """
+
+    if objectmemo() is None:
+        registerObjectMemo({})
+
+    projectconfig = loadproject(path=path, scheme=scheme, verbose=verbose, silent=silent, debug=debug, cache=cache)
+
+    server = ProjectServer((host, port), projectconfig, scheme, outputdir=outputdir, verbose=verbose, silent=silent,
+                           debug=debug)
+
+    if not silent:
+        click.echo('Serving %s on http://%s:%s/render (press Ctrl+C to stop)...' % (path, host,
+                                                                                 server.server_address[1]))
+
+    _handled = 0
+    try:
+        while not server.reload and (requests is None or _handled < requests):
+            server.handle_request()
+            _handled += 1
+    finally:
+        server.server_close()
+
+    if server.reload:
+        if not silent:
+            click.echo('Classes, aggregates, plugins or gtool.cfg changed, reloading the project...')
+        return RELOAD
+
+    return True
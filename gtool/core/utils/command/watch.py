@@ -0,0 +1,124 @@
+import click
+import time
+from gtool.core.filewalker import objectmemo, registerObjectMemo
+from gtool.core.parsecache import parsecache
+from gtool.core.utils.watcher import snapshot, changes, invalidate
+from .process import loadproject, loaddata, renderschemes, printresult, outputschemes, outputtargets
+
+RELOAD = 'reload'
+
+def watchproject(path=None, scheme=None, output=None, verbose=False, silent=False, debug=False, cache=False,
+                 interval=1.0, iterations=None):
+    """
+    Loads a project once and renders it every time a data file is changed, added or removed. Files are polled
+    for changes in mtime and size. Only the top level nodes that contain a changed file are loaded again, all
+    other objects are reused.
+
+    Objects are not re-evaluated when an object they refer to changes (e.g. method results).
+
+    :param interval: seconds between two polls
+    :param iterations: number of polls before returning, None polls until interrupted
+    :return: RELOAD if a class, aggregate, plugin or config file changed and the project has to be loaded from
+    scratch, True otherwise
+    """
+
+    if objectmemo() is None:
+        registerObjectMemo({})
+
+    projectconfig = loadproject(path=path, scheme=scheme, verbose=verbose, silent=silent, debug=debug, cache=cache)
+
+    _schemes = outputschemes(scheme)
+    _outputs = outputtargets(_schemes, output=output, debug=debug)
+
+    def _render(dataobject, changed):
+        _start = time.monotonic()
+        try:
+            results = renderschemes(dataobject, _schemes, _outputs, verbose=verbose, debug=debug)
+        except SystemExit:
+            # renderproject reported the error, keep watching so that it can be fixed
+            return False
+
+        if parsecache() is not None:
+            # entries of reused objects are not seen again, so the cache is not pruned
+            parsecache().save()
+
+        if not silent:
+            _summary = '(%s changed files, %.0f ms)' % (changed, (time.monotonic() - _start) * 1000)
+            _written = [_output for _output in _outputs if _output is not None]
+            if len(_written) > 0:
+                click.echo('Output written to %s %s' % (', '.join(_written), _summary))
+            else:
+                click.echo('Rendered %s' % _summary)
+
+        for result in results:
+            printresult(result)
+        return True
+
+    _projectsnapshot = projectsnapshot(projectconfig)
+    _datasnapshot = snapshot(projectconfig['dataroot'])
+
+    dataobject = loaddata(projectconfig, verbose=verbose, debug=debug)
+    _render(dataobject, len(_datasnapshot))
+
+    if not silent:
+        click.echo('Watching %s for changes (press Ctrl+C to stop)...' % path)
+
+    _polls = 0
+    while iterations is None or _polls < iterations:
+        _polls += 1
+        time.sleep(interval)
+
+        if projectsnapshot(projectconfig) != _projectsnapshot:
+            if not silent:
+                click.echo('Classes, aggregates, plugins or gtool.cfg changed, reloading the project...')
+            return RELOAD
+
+        dataobject, _datasnapshot, _changed = refreshdata(projectconfig, dataobject, _datasnapshot,
+                                                          verbose=verbose, debug=debug)
+        if len(_changed) == 0:
+            continue
+        _render(dataobject, len(_changed))
+
+    return True
+
+
+def projectsnapshot(projectconfig):
+    """
+    Snapshot of the files that are registered once per project (classes, gtool.cfg, plugins and aggregators)
+    """
+    return snapshot(projectconfig['classes'],
+                    projectconfig['configpath'],
+                    projectconfig['plugin'],
+                    projectconfig['aggregators'])
+
+
+def refreshdata(projectconfig, dataobject, datasnapshot, verbose=False, debug=False):
+    """
+    Walks the data folder again if a data file was changed, added or removed since datasnapshot was taken and
+    forgets the objects of the nodes that contain the changed files (see gtool.core.utils.watcher.invalidate).
+
+    :param dataobject: project structure walked when datasnapshot was taken
+    :param datasnapshot: snapshot of the data folder
+    :return: tuple of the project structure, the new snapshot and the set of changed paths, which is empty if
+    nothing changed or the data folder could not be walked again (the snapshot is datasnapshot then, so that the
+    changes are picked up again by the next call)
+    """
+    _current = snapshot(projectconfig['dataroot'])
+    _changed = changes(datasnapshot, _current)
+    if len(_changed) == 0:
+        return dataobject, datasnapshot, _changed
+
+    if verbose:
+        for changedpath in sorted(_changed):
+            click.echo('[VERBOSE] Changed: %s' % changedpath)
+
+    try:
+        _structure = loaddata(projectconfig, verbose=verbose, debug=debug)
+    except SystemExit:
+        # loaddata reported the error, stale objects are still forgotten and the folder is walked again by the
+        # next call as the changes are compared to the old snapshot
+        invalidate(_changed, dataobject)
+        return dataobject, datasnapshot, set()
+
+    invalidate(_changed, dataobject, _structure)
+    return _structure, _current, _changed
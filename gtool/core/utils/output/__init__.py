@@ -5,7 +5,7 @@ from gtool.core.filewalker import StructureFactory
 from gtool.core.utils.misc import striptoclassname
 from gtool.core.utils.runtime import runtimenamespace
 from gtool.core.utils.config import partialnamespace
-from gtool.core.plugin import pluginnamespace
+from gtool.core.plugin import pluginnamespace, pluginbases
 #import gtool.core.types.output as outputtypes
 
 def outputconfigname(outputscheme=str()):
@@ -179,7 +179,7 @@ def checkalignment(project):
             _nonmatching = '\n '.join(reversematch(project=project, matchstring=i))
             _outputplugin = partialnamespace('output')[runtimenamespace()['outputscheme']]['plugin']
             # have to compare strings instead of using isinstance to avoid circular imports
-            _treeoutputplugins = '* ' + '\n *'.join(['%s' % k for k,v in pluginnamespace().items() if 'TreeOutput' in str(v.__bases__)])
+            _treeoutputplugins = '* ' + '\n *'.join(['%s' % k for k in pluginnamespace() if 'TreeOutput' in pluginbases(k)])
             _exception = 'Found an object structure {0} ' \
                          'that does not align with the longest object structure {1}. ' \
                          'The non-aligned objects can be found at:\n{2}. ' \
@@ -273,20 +273,33 @@ def formatters():
 # a shared globals ala...
 # http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
 
-def registerFormatter(formatterName, formatter):
+def registerFormatter(formatterName, formatter, outputscheme=None):
+    """
+    Registers the formatter of a class for an output scheme, formatters of different schemes are kept side by
+    side. The scheme defaults to the outputscheme runtime option.
+    """
     #print(globals())
     if not isinstance(formatter, dict):
         raise TypeError('Expected a dictionary for formatter arg but got a %s' % type(formatter))
 
-    if formatterName in globals()[formatters()]:
+    if formatterName in formatternamespace(outputscheme):
         # this error will occur for a misconfig or a security event
         raise KeyError('One formatter tried to overwrite an existing one. Formatter name: %s' % formatterName)
     else:
-        globals()[formatters()][formatterName] = formatter
+        formatternamespace(outputscheme)[formatterName] = formatter
         return True
 
-def formatternamespace():
-    return globals()[formatters()]
+def formatternamespace(outputscheme=None):
+    """
+    :param outputscheme: defaults to the outputscheme runtime option (which may be overridden per thread)
+    :return: dict of class name -> formatter for the output scheme
+    """
+    if outputscheme is None:
+        outputscheme = runtimenamespace().get('outputscheme', None)
+    return globals()[formatters()].setdefault(outputscheme, dict())
+
+def formatterschemes():
+    return [scheme for scheme in globals()[formatters()] if scheme is not None]
 
 #--- initialize namespace
 
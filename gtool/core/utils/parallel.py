@@ -0,0 +1,101 @@
+import os
+import multiprocessing
+import warnings
+
+from gtool.core.filewalker import StructureFactory
+from gtool.core.namespace import namespace
+from gtool.core.parsecache import ParseCache, parsecache, registerParseCache
+
+
+def loadables(structure):
+    """
+    Lists the nodes of a project structure that load into top level objects. Nested objects are
+    loaded by these nodes and are not listed.
+
+    :param structure: StructureFactory node as returned by StructureFactory.treewalk
+    :return: list of (kind, path, name) tuples
+    """
+    _ret = []
+    if isinstance(structure, StructureFactory.Container):
+        for child in structure.children:
+            _ret.extend(loadables(child))
+    elif isinstance(structure, StructureFactory.CNode):
+        _ret.append(('cnode', structure.path, structure.name))
+    elif isinstance(structure, StructureFactory.Node):
+        _ret.append(('node', structure.path, structure.name))
+    return _ret
+
+
+def __initworker(projectroot):
+    # forked workers inherit the registries of the parent, spawned workers need to load the project
+    if len(namespace()) == 0:
+        from gtool.core.utils import loadconfig, __loadplugins, __configloader, __loadclasses
+        projectconfig = loadconfig(projectroot)
+        __loadplugins(projectconfig['root'], silent=True)
+        __configloader(projectconfig['configpath'])
+        __loadclasses(projectconfig['classes'], silent=True)
+
+    if parsecache() is None:
+        registerParseCache(ParseCache())
+
+
+def __loadworker(loadable):
+    """
+    Reads, parses and validates a single top level node and returns the parsed attribute maps of the
+    node and all of its nested objects. A node that fails is not handed to the parent, which loads it
+    again and reports the error as usual.
+
+    :return: (entries, error) with the entries as returned by ParseCache.export, error is None if the node loaded
+    """
+    kind, path, name = loadable
+    try:
+        if kind == 'cnode':
+            _directory = StructureFactory.Directory(nodename=os.path.basename(path), nodepath=path)
+            StructureFactory.__treewalk__(_directory)
+            _node = StructureFactory.CNode(fileobject=_directory, name=name)
+        else:
+            _file = StructureFactory.File(nodename=os.path.basename(path), nodepath=path)
+            _node = StructureFactory.Node(fileobject=_file, name=name)
+        _node.dataasobject
+    except Exception as err:
+        # entries read before the error may not have been validated, they are dropped with the node
+        parsecache().export()
+        return [], '%s: %s' % (path, err)
+    return parsecache().export(), None
+
+
+def prefetch(structure, projectroot, jobs):
+    """
+    Farms reading, parsing and validating the data files of a project out to a pool of worker processes.
+    The parsed attribute maps are handed to the parse cache of this process so that the objects (and the
+    node registry) are built here without parsing, hashing or validating any file again (see
+    ParseCache.prefetched). Nodes that fail in a worker are loaded here as if there were no workers and a
+    warning lists them.
+
+    :param structure: project structure as returned by StructureFactory.treewalk
+    :param projectroot: root of the project, used by workers that need to load the project themselves
+    :param jobs: number of worker processes
+    :return: (prefetched, errors) the number of top level nodes that were prefetched and the list of errors of
+    the nodes that were not
+    """
+    _loadables = loadables(structure)
+    if len(_loadables) == 0:
+        return 0, []
+
+    if parsecache() is None:
+        registerParseCache(ParseCache())
+
+    _errors = []
+    _chunksize = max(1, len(_loadables) // (jobs * 4))
+    with multiprocessing.Pool(processes=jobs, initializer=__initworker, initargs=(projectroot,)) as pool:
+        for entries, error in pool.imap_unordered(__loadworker, _loadables, chunksize=_chunksize):
+            if error is None:
+                parsecache().merge(entries, prefetched=True)
+            else:
+                _errors.append(error)
+
+    if len(_errors) > 0:
+        warnings.warn('%s of %s data nodes could not be prefetched and are loaded without the workers:\n%s' %
+                      (len(_errors), len(_loadables), '\n'.join(sorted(_errors))))
+
+    return len(_loadables) - len(_errors), _errors
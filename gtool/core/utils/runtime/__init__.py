@@ -1,9 +1,17 @@
+import threading
+from collections import ChainMap
+from contextlib import contextmanager
+
 # --- static ---
 __NAMESPACE = 'runtimeoptions' # TODO singleton pattern for multiple global directories --> dynamicClasses, URN, instancenames (type aware), plugins
+__OVERRIDES = 'runtimeoverrides'
 
 def namespacename():
     return __NAMESPACE
 
+def overridesname():
+    return __OVERRIDES
+
 # a shared globals ala...
 # http://stackoverflow.com/questions/15959534/python-visibility-of-global-variables-in-imported-modules
 
@@ -18,9 +26,29 @@ def registerruntimeoption(optionname, optionvalue):
 
         return True
 
+@contextmanager
+def runtimeoverride(optionname, optionvalue):
+    """
+    Overrides a runtime option for the current thread until the with block ends, e.g. to render one
+    output scheme per thread:
+
+        with runtimeoverride('outputscheme', '2'):
+            ...
+    """
+    _local = globals()[overridesname()]
+    _previous = getattr(_local, 'options', None)
+    _local.options = dict(_previous or {}, **{optionname: optionvalue})
+    try:
+        yield
+    finally:
+        _local.options = _previous
+
 def runtimenamespace():
-    return globals()[namespacename()]
+    _overrides = getattr(globals()[overridesname()], 'options', None)
+    if _overrides is None:
+        return globals()[namespacename()]
+    return ChainMap(_overrides, globals()[namespacename()])
 
 #--- initialize namespace
 globals()[namespacename()] = dict()
-
+globals()[overridesname()] = threading.local()
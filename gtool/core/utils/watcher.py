@@ -0,0 +1,86 @@
+import os
+
+from gtool.core.filewalker import objectmemo
+from gtool.core.noderegistry import getObjectsByUriPrefix, unregisterObject, stripToUri
+from gtool.core.utils.parallel import loadables
+
+
+def snapshot(*roots):
+    """
+    Records the mtime and size of every file below roots. Names starting with ! are skipped, as they are by
+    StructureFactory.treewalk. A root may also be a single file, roots that do not exist are ignored.
+
+    :return: dict of path -> (mtime_ns, size)
+    """
+    _ret = {}
+
+    def _walk(path):
+        with os.scandir(path) as inodes:
+            for inode in inodes:
+                if inode.name.startswith('!'):
+                    continue
+                if inode.is_file():
+                    _stat = inode.stat()
+                    _ret[inode.path] = (_stat.st_mtime_ns, _stat.st_size)
+                elif inode.is_dir():
+                    _walk(inode.path)
+
+    for root in roots:
+        if os.path.isdir(root):
+            _walk(root)
+        elif os.path.isfile(root):
+            _stat = os.stat(root)
+            _ret[root] = (_stat.st_mtime_ns, _stat.st_size)
+    return _ret
+
+
+def changes(before, after):
+    """
+    Compares two snapshots
+
+    :return: set of the paths that were changed, added or removed
+    """
+    _ret = set(path for path in after if before.get(path, None) != after[path])
+    _ret.update(path for path in before if path not in after)
+    return _ret
+
+
+def invalidate(paths, *structures):
+    """
+    Forgets the objects of every top level node of the given project structures that contains one of paths,
+    so that the next render loads them again. The objects, including their nested objects, are removed from
+    the object memo and from the node registry.
+
+    :param paths: changed, added or removed file paths (see changes)
+    :param structures: project structures as returned by StructureFactory.treewalk, usually the one the
+    paths were loaded from and the one walked after the change
+    :return: set of the paths of the nodes that were invalidated
+    """
+    _loadables = set(nodepath for structure in structures for kind, nodepath, name in loadables(structure))
+
+    # a path belongs to the top level node at the path itself or at one of its parent directories
+    _nodes = set()
+    for path in paths:
+        _path = path
+        while True:
+            if _path in _loadables:
+                _nodes.add(_path)
+                break
+            _parent = os.path.dirname(_path)
+            if _parent == _path or _parent == '':
+                break
+            _path = _parent
+
+    _memo = objectmemo()
+    for nodepath in _nodes:
+        if _memo is not None:
+            _memo.pop(nodepath, None)
+
+        # the objects of the node and its nested objects are below the URI of the node, this also catches objects
+        # of nodes that failed half way through loading and were never memoized
+        for obj in getObjectsByUriPrefix(stripToUri(nodepath)):
+            if _memo is not None:
+                _memo.pop(obj.__context__['file'], None)
+            unregisterObject(obj)
+
+    return _nodes
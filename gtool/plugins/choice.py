@@ -2,19 +2,33 @@ from gtool.core.types.core import CoreType
 
 class Choice(CoreType):
 
+    __slots__ = ()
+    __validators__ = ('choices',)
+    __checkonly__ = True
+
+    def __internkey__(self):
+        return self.__value__
+
     def __validate__(self, valuedict):
+        return self.__validator__(valuedict)(self)
+
+    @classmethod
+    def __validator__(cls, valuedict):
         _choices = valuedict.get('choices', None)
         choices = [c.strip() for c in _choices.split(',')] if _choices is not None else None
-        if self.__value__ not in choices:
-            raise ValueError('Was expecting either one of %s but got a %s' % (choices, self.__value__))
-        return True
+        _lookup = frozenset(choices) if choices is not None else None
+
+        def validate(item):
+            if item.__value__ not in _lookup:
+                raise ValueError('Was expecting either one of %s but got a %s' % (choices, item.__value__))
+            return True
+        return validate
 
     @classmethod
     def __converter__(cls):
         return str
 
     def __init__(self, *args, **kwargs):
-        self.__validators__ = ['choices']
         super().__init__(*args, valuetype=str, **kwargs)
 
 def load():
@@ -1,11 +1,16 @@
 from gtool.core.types.output import GridOutput
 from gtool.core.types.matrix import Matrix
 import csv
+import contextlib
+import os
+from types import GeneratorType
 from gtool.core.filewalker import StructureFactory
 
 
 class Csv(GridOutput):
 
+    extension = '.csv'
+
     def __output__(self, projectstructure, output=None):
         if output is None:
             raise ValueError('An output argument was expected')
@@ -19,17 +24,15 @@ class Csv(GridOutput):
                 raise Exception
             if all(isinstance(c, StructureFactory.Container) for c in projectstructure.children):
                 for child in projectstructure.children:
-                    _outputdict[child.name] = super(Csv, self).__output__(child)
+                    _outputdict[child.name] = self.rows(child)
             else:
                 raise Exception
         except Exception:
             csvname = '_' if projectstructure.name == '*' else projectstructure.name
-            _outputdict[csvname] = super(Csv, self).__output__(projectstructure)
+            _outputdict[csvname] = self.rows(projectstructure)
 
-        try:
-            self.__writecsv__(filename=output,outputdict=_outputdict)
-        except Exception as err:
-            raise Exception(err)
+        # the grids are rendered while they are written, errors are not wrapped so that they keep their type
+        self.__writecsv__(filename=output,outputdict=_outputdict)
 
         return True
 
@@ -52,24 +55,37 @@ class Csv(GridOutput):
 
         _sheets = len(outputdict.items())
 
-        for csvname, grid in sorted(outputdict.items()):
-
-            if _sheets > 1:
-                _filename = filenameprefix + underscore + csvname + extension
-            else:
-                _filename = filenameprefix + extension
-
-            print('writing to', _filename)
-
-            if not isinstance(grid, Matrix):
-                raise TypeError('Expected a Matrix but got a %s' % type(grid))
-
-            with open(_filename, 'w', newline='') as csvfile:
-                csvwriter = csv.writer(csvfile, delimiter=',', quotechar='|', quoting=csv.QUOTE_MINIMAL)
-                #TODO fix quoting - unclear why it quotes when it does
-                for row in grid:
-                    csvwriter.writerow(row)
-                csvfile.close()
+        # every sheet is written next to its file and the files are only replaced once all sheets are complete, so
+        # that an error while rendering does not leave partial (or a mix of old and new) files behind
+        _written = []
+        try:
+            for csvname, grid in sorted(outputdict.items()):
+
+                if _sheets > 1:
+                    _filename = filenameprefix + underscore + csvname + extension
+                else:
+                    _filename = filenameprefix + extension
+
+                print('writing to', _filename)
+
+                if not isinstance(grid, (Matrix, GeneratorType)):
+                    raise TypeError('Expected a Matrix or a row generator but got a %s' % type(grid))
+
+                _temp = '%s.%s.tmp' % (_filename, os.getpid())
+                _written.append((_temp, _filename))
+                with open(_temp, 'w', newline='') as csvfile:
+                    csvwriter = csv.writer(csvfile, delimiter=',', quotechar='|', quoting=csv.QUOTE_MINIMAL)
+                    #TODO fix quoting - unclear why it quotes when it does
+                    csvwriter.writerows(grid)
+
+            for _temp, _filename in list(_written):
+                os.replace(_temp, _filename)
+                _written.remove((_temp, _filename))
+        except BaseException:
+            for _temp, _filename in _written:
+                with contextlib.suppress(OSError):
+                    os.remove(_temp)
+            raise
 
         return True
 
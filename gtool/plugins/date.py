@@ -1,6 +1,41 @@
-from datetime import datetime
+import re
+from datetime import date, datetime
 from gtool.core.types.core import CoreType
 
+# the patterns strptime uses for the numeric directives, formats made of these only are parsed without strptime
+NUMERICDIRECTIVES = {'Y': r'(?P<Y>\d\d\d\d)',
+                     'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+                     'd': r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'}
+
+
+def dateparser(dateformat):
+    """
+    Prepares the parsing of dates in a format once
+
+    :return: function that parses a string like datetime.strptime(string, dateformat).date()
+    """
+    _pieces = re.split(r'(%.)', dateformat)
+    _directives = [piece[1] for piece in _pieces[1::2]]
+
+    if any(directive not in NUMERICDIRECTIVES for directive in _directives) or \
+            len(set(_directives)) != len(_directives):
+        return lambda value: datetime.strptime(value, dateformat).date()
+
+    # literal text is matched the way strptime matches it
+    _pattern = ''.join(NUMERICDIRECTIVES[piece[1]] if i % 2 else re.sub(r'(\\\s)+', r'\\s+', re.escape(piece))
+                       for i, piece in enumerate(_pieces))
+    _regex = re.compile(_pattern, re.IGNORECASE)
+
+    def parse(value):
+        _found = _regex.match(value)
+        if _found is None:
+            raise ValueError('time data %r does not match format %r' % (value, dateformat))
+        if len(value) != _found.end():
+            raise ValueError('unconverted data remains: %s' % value[_found.end():])
+        _groups = _found.groupdict()
+        return date(int(_groups.get('Y', 1900)), int(_groups.get('m', 1)), int(_groups.get('d', 1)))
+    return parse
+
 
 class Date(CoreType):
 
@@ -25,23 +60,40 @@ class Date(CoreType):
     https://www.tutorialspoint.com/python/time_strptime.htm
     """
 
+    __slots__ = ('dateformat', 'datedisplayformat', '__datevalue__')
+    __validators__ = ('dateformat', 'displayformat')
+
+    def __internkey__(self):
+        # the displayed value does not tell apart dates that are displayed without the day etc.
+        return (self.__value__, getattr(self, '__datevalue__', None), self.dateformat, self.datedisplayformat)
+
     def __validate__(self, valuedict):
+        return self.__validator__(valuedict)(self)
 
+    @classmethod
+    def __validator__(cls, valuedict):
         _dateformat = valuedict.get('dateformat', None)
-        if _dateformat is not None and  isinstance(_dateformat, str):
-            self.dateformat = _dateformat
+        dateformat = _dateformat if _dateformat is not None and isinstance(_dateformat, str) else None
 
         _displayformat = valuedict.get('displayformat', None)
-        if _displayformat is not None and isinstance(_displayformat, str):
-            self.datedisplayformat = _displayformat
+        displayformat = _displayformat if _displayformat is not None and isinstance(_displayformat, str) else None
+
+        # the parser of the format is prepared once per attribute
+        _parse = dateparser(dateformat) if dateformat is not None else None
 
-        try:
-            self.__datevalue__ = datetime.strptime(self.__value__, self.dateformat).date()
-        except ValueError:
-            raise
+        def validate(item):
+            if dateformat is not None:
+                item.dateformat = dateformat
+            if displayformat is not None:
+                item.datedisplayformat = displayformat
 
-        self.__value__ = self.__datevalue__.strftime(self.datedisplayformat)
-        return True
+            if _parse is not None:
+                item.__datevalue__ = _parse(item.__value__)
+            else:
+                item.__datevalue__ = datetime.strptime(item.__value__, item.dateformat).date()
+            item.__value__ = item.__datevalue__.strftime(item.datedisplayformat)
+            return True
+        return validate
 
     @classmethod
     def __converter__(cls):
@@ -53,7 +105,6 @@ class Date(CoreType):
     """
 
     def __init__(self, *args, **kwargs):
-        self.__validators__ = ['dateformat', 'displayformat']
         self.dateformat = '%x'
         self.datedisplayformat = '%x'
         super().__init__(*args, valuetype=str, **kwargs)
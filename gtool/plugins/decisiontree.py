@@ -7,6 +7,8 @@ import pydot
 
 class Decisiontree(TreeOutput):
 
+    extension = '.dot'
+
     def __init__(self):
 
         def getconfigelement(config, key, scheme):
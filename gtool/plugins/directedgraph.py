@@ -8,6 +8,8 @@ from distutils.util import strtobool
 
 class Directedgraph(TreeOutput):
 
+    extension = '.gml'
+
     def __init__(self):
 
         _scheme = runtimenamespace().get('outputscheme', None)
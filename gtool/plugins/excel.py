@@ -1,11 +1,16 @@
 from gtool.core.types.output import GridOutput
 from gtool.core.types.matrix import Matrix
 import xlsxwriter
+import contextlib
+import os
+from types import GeneratorType
 from gtool.core.filewalker import StructureFactory
 
 
 class Excel(GridOutput):
 
+    extension = '.xlsx'
+
     def __output__(self, projectstructure, output=None):
         if output is None:
             raise ValueError('An output argument was expected')
@@ -19,17 +24,15 @@ class Excel(GridOutput):
                 raise Exception
             if all(isinstance(c, StructureFactory.Container) for c in projectstructure.children):
                 for child in projectstructure.children:
-                    _outputdict[child.name] = super(Excel, self).__output__(child)
+                    _outputdict[child.name] = self.rows(child)
             else:
                 raise Exception
         except Exception:
             worksheetname = '_' if projectstructure.name == '*' else projectstructure.name
-            _outputdict[worksheetname] = super(Excel, self).__output__(projectstructure)
+            _outputdict[worksheetname] = self.rows(projectstructure)
 
-        try:
-            self.__writexls__(filename=output,outputdict=_outputdict)
-        except Exception as err:
-            raise Exception(err)
+        # the grids are rendered while they are written, errors are not wrapped so that they keep their type
+        self.__writexls__(filename=output,outputdict=_outputdict)
 
         return True
 
@@ -47,16 +50,30 @@ class Excel(GridOutput):
 
         #TODO check location and filename are valid
 
-        workbook = xlsxwriter.Workbook(filename)
+        # the workbook is written next to filename and only replaces it once it is complete, so that an error while
+        # rendering does not leave a partial (or no longer valid) workbook behind
+        _temp = '%s.%s.tmp' % (filename, os.getpid())
 
-        for sheet, grid in sorted(outputdict.items()):
-            worksheet = workbook.add_worksheet(name=sheet[:32]) #worksheet name cannot be more than 32 chars long
-            if not isinstance(grid, Matrix):
-                raise TypeError('Expected a Matrix but got a %s' % type(grid))
-            for i, row in enumerate(grid):
-                worksheet.write_row(i, 0, row)
+        # rows are written in order, constant memory mode flushes each row to disk as soon as the next one starts
+        workbook = xlsxwriter.Workbook(_temp, {'constant_memory': True})
 
-        workbook.close()
+        try:
+            for sheet, grid in sorted(outputdict.items()):
+                worksheet = workbook.add_worksheet(name=sheet[:32]) #worksheet name cannot be more than 32 chars long
+                if not isinstance(grid, (Matrix, GeneratorType)):
+                    raise TypeError('Expected a Matrix or a row generator but got a %s' % type(grid))
+                for i, row in enumerate(grid):
+                    worksheet.write_row(i, 0, row)
+            workbook.close()
+            os.replace(_temp, filename)
+        except BaseException:
+            # closing also removes the temporary files constant memory mode keeps per worksheet
+            with contextlib.suppress(Exception):
+                if not workbook.fileclosed:
+                    workbook.close()
+            with contextlib.suppress(OSError):
+                os.remove(_temp)
+            raise
 
         return True
 
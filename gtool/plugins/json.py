@@ -1,18 +1,28 @@
 from gtool.core.types.output import TreeOutput
+from gtool.core.noderegistry import objectUri
 import json
+import io
+
+INDENT = ' ' * 4
 
 
 class Json(TreeOutput):
+    """
+    Writes the project as a single JSON document (the default) or, with "mode: ndjson" in the output scheme,
+    as newline delimited JSON with one top level object per line followed by one line per aggregate.
 
-    def __output__(self, projectstructure, output=None):
+    Objects are converted and written one at a time, the converted tree is never held in memory as a whole.
+    """
+
+    extension = '.json'
 
-        _jsonoutput = super(Json, self).__output__(projectstructure)
+    def __output__(self, projectstructure, output=None):
 
         if output is None:
-            return _jsonoutput
+            return self.outputprocessor(self.tree(projectstructure))
         else:
             with open(output, mode='w') as f:
-                f.write(_jsonoutput)
+                self.stream(self.tree(projectstructure), f)
                 f.close()
             return True  # TODO inconsistent return json object vs true
 
@@ -22,19 +32,96 @@ class Json(TreeOutput):
     def convert(self, obj):
         return super(Json, self).convert(obj)
 
+    def mode(self):
+        _mode = self.__outputconfig__().get('mode', None)
+        _mode = 'json' if _mode is None else _mode.strip().lower()
+        if _mode not in ('json', 'ndjson'):
+            raise ValueError('Unknown json output mode "%s", expected json or ndjson' % _mode)
+        return _mode
+
     def outputprocessor(self, projectstructure):
 
-        def _sub(tree):
-            if isinstance(tree, list):
-                return [_sub(item) for item in tree]
+        _output = io.StringIO()
+        self.stream(projectstructure, _output)
+
+        return _output.getvalue()
+
+    def stream(self, projectstructure, f):
+        """
+        Writes the tree returned by TreeOutput.tree to the file like object f
+
+        :param projectstructure: dict or list containing DynamicType objects
+        :param f: file like object opened for writing text
+        :return: None
+        """
+        if self.mode() == 'ndjson':
+            self.__ndjson__(projectstructure, f)
+        else:
+            self.__json__(projectstructure, f)
+
+    def __json__(self, projectstructure, f):
+        # produces the same text as json.dumps(tree, sort_keys=True, indent=4) on the converted tree
+        _encoder = json.JSONEncoder(sort_keys=True, indent=4)
+
+        def _encode(value, level):
+            # iterencode indents from level 0, strings never contain a raw newline
+            for chunk in _encoder.iterencode(value):
+                f.write(chunk.replace('\n', '\n' + INDENT * level))
+
+        def _sub(tree, level):
+            if isinstance(tree, (dict, list)) and len(tree) == 0:
+                f.write('{}' if isinstance(tree, dict) else '[]')
             elif isinstance(tree, dict):
-                return {k: _sub(v) for k, v in tree.items()}
+                f.write('{')
+                for i, key in enumerate(sorted(tree)):
+                    f.write('%s\n%s%s: ' % (',' if i > 0 else '', INDENT * (level + 1), _encoder.encode(key)))
+                    _sub(tree[key], level + 1)
+                f.write('\n%s}' % (INDENT * level))
+            elif isinstance(tree, list):
+                f.write('[')
+                for i, item in enumerate(tree):
+                    f.write('%s\n%s' % (',' if i > 0 else '', INDENT * (level + 1)))
+                    _sub(item, level + 1)
+                f.write('\n%s]' % (INDENT * level))
+            else:
+                _encode(self.convert(tree), level)
+
+        # aggregates are computed up front as they sort before the data
+        _aggregates = self.integrateaggregates({})
+
+        if not isinstance(projectstructure, dict) or len(_aggregates) == 0:
+            _sub(projectstructure, 0)
+            return
+
+        f.write('{')
+        _keys = sorted(list(projectstructure.keys()) + list(_aggregates.keys()))
+        for i, key in enumerate(_keys):
+            f.write('%s\n%s%s: ' % (',' if i > 0 else '', INDENT, _encoder.encode(key)))
+            if key in _aggregates:
+                _encode(_aggregates[key], 1)
+            else:
+                _sub(projectstructure[key], 1)
+        f.write('\n}')
+
+    def __ndjson__(self, projectstructure, f):
+
+        def _sub(tree):
+            if isinstance(tree, dict):
+                for key in sorted(tree):
+                    _sub(tree[key])
+            elif isinstance(tree, list):
+                for item in tree:
+                    _sub(item)
             else:
-                return self.convert(tree)
+                f.write(json.dumps({'uri': objectUri(tree), 'data': self.convert(tree)}, sort_keys=True))
+                f.write('\n')
 
-        _tree = self.integrateaggregates(_sub(projectstructure))
+        _sub(projectstructure)
 
-        return json.dumps(_tree, sort_keys=True, indent=4)
+        for aggregate in self.aggregates() or []:
+            for name, result in aggregate.items():
+                f.write(json.dumps({'aggregate': name, 'result': result}, sort_keys=True))
+                f.write('\n')
 
 
 def load():
@@ -2,25 +2,38 @@ from gtool.core.types.core import CoreType
 
 class Real(CoreType):
 
+    __slots__ = ()
+    __validators__ = ('min', 'max')
+    __checkonly__ = True
+
+    def __internkey__(self):
+        return self.__value__
+
     def __validate__(self, valuedict):
+        return self.__validator__(valuedict)(self)
+
+    @classmethod
+    def __validator__(cls, valuedict):
         _min = valuedict.get('min', None)
         _max = valuedict.get('max', None)
         min = float(_min) if _min is not None else None
         max = float(_max) if _max is not None else None
-        if min is not None:
-            if self.__value__ < min:
-                raise ValueError('Values must be not be lower than %s but we got %s' % (min, self.__value__))
-        if max is not None:
-            if self.__value__ > max:
-                raise ValueError('Values must not be higher than %s but we got %s' % (max, self.__value__))
-        return True
+
+        def validate(item):
+            if min is not None:
+                if item.__value__ < min:
+                    raise ValueError('Values must be not be lower than %s but we got %s' % (min, item.__value__))
+            if max is not None:
+                if item.__value__ > max:
+                    raise ValueError('Values must not be higher than %s but we got %s' % (max, item.__value__))
+            return True
+        return validate
 
     @classmethod
     def __converter__(cls):
         return float
 
     def __init__(self, *args, **kwargs):
-        self.__validators__ = ['min', 'max']
         super().__init__(*args, valuetype=float, **kwargs)
 
 def load():
@@ -5,6 +5,13 @@ class Ref(CoreType):
     Ref expects an absolute reference in the form of /node1/node2. The reference must start with a / and end with an alpha value
     """
 
+    __slots__ = ()
+    __validators__ = () # Ref doesn't have validation options
+    __checkonly__ = True
+
+    def __internkey__(self):
+        return self.__value__
+
     def isReference(self, ref):
         separator = '/'
         emptysplit = ''
@@ -46,7 +53,6 @@ class Ref(CoreType):
 
     def __init__(self, *args, **kwargs):
         # TODO should validate that the ref actually exists
-        self.__validators__ = [] # Ref doesn't have validation options
         super().__init__(*args, valuetype=str, **kwargs)
 
 def load():
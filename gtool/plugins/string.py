@@ -2,21 +2,34 @@ from gtool.core.types.core import CoreType
 
 class String(CoreType):
 
+    __slots__ = ()
+    __validators__ = ('maxlength',)
+    __checkonly__ = True
+
+    def __internkey__(self):
+        return self.__value__
+
     def __validate__(self, valuedict):
+        return self.__validator__(valuedict)(self)
+
+    @classmethod
+    def __validator__(cls, valuedict):
         _maxlength = valuedict.get('maxlength', None)
         maxlength = int(_maxlength) if _maxlength is not None else None
-        if maxlength is not None:
-            if len(self.__value__) > maxlength:
-                raise ValueError('Was expecting a string no more than %s chars long '
-                                 'but the string had a length of %s' % (maxlength, len(self.__value__)))
-        return True
+
+        def validate(item):
+            if maxlength is not None:
+                if len(item.__value__) > maxlength:
+                    raise ValueError('Was expecting a string no more than %s chars long '
+                                     'but the string had a length of %s' % (maxlength, len(item.__value__)))
+            return True
+        return validate
 
     @classmethod
     def __converter__(cls):
         return str
 
     def __init__(self, *args, **kwargs):
-        self.__validators__ = ['maxlength']
         super().__init__(*args, valuetype=str, **kwargs)
 
 def load():
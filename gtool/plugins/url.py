@@ -8,25 +8,38 @@ from gtool.core.types.core import CoreType
 
 class Url(CoreType):
 
+    __slots__ = ()
+    __validators__ = ('public',)
+    __checkonly__ = True
+
+    def __internkey__(self):
+        return self.__value__
+
     def __validate__(self, valuedict):
+        return self.__validator__(valuedict)(self)
+
+    @classmethod
+    def __validator__(cls, valuedict):
         _public = valuedict.get('public', None)
         if _public is None:
             public = 0 # False
         else:
             public = strtobool('%s' % _public)
             warnings.warn('public check does not currently work due a problem in the underlying validators library')
-        try:
-            url(self.__value__, public=public) # TODO public / private test doesn't work
-        except ValidationFailure:
-            raise ValueError('Was expecting a valid %s but got %s' % ('public URL' if public else 'URL', len(self.__value__)))
-        return True
+
+        def validate(item):
+            try:
+                url(item.__value__, public=public) # TODO public / private test doesn't work
+            except ValidationFailure:
+                raise ValueError('Was expecting a valid %s but got %s' % ('public URL' if public else 'URL', len(item.__value__)))
+            return True
+        return validate
 
     @classmethod
     def __converter__(cls):
         return str
 
     def __init__(self, *args, **kwargs):
-        self.__validators__ = ['public']
         super().__init__(*args, valuetype=str, **kwargs)
 
 def load():
@@ -3,6 +3,8 @@ import yaml
 
 class Yaml(TreeOutput):
 
+    extension = '.yaml'
+
     def __output__(self, projectstructure, output=None):
 
         _yamloutput = super(Yaml, self).__output__(projectstructure)
@@ -4,6 +4,9 @@ from gtool.core.utils.output import checkalignment
 from gtool.core.plugin import pluginnamespace
 import sys
 from gtool.core.utils.command.process import processproject
+from gtool.core.utils.command.watch import watchproject
+from gtool.core.utils.command.serve import subtree
+from gtool.core.utils.command.processmany import processmany
 
 
 def debug(config):
@@ -2268,6 +2271,7 @@ def test47():
     [VERBOSE] loading plug-in: xattrib
     [VERBOSE] loading plug-in: yaml
     [VERBOSE] Loading project config from test\test47\gtool.cfg...
+    [VERBOSE] Registering the attribute indexes in [index]...
     [VERBOSE] Loading user defined classes from test\test47\classes...
     [VERBOSE] Registering Dynamic Class: NODES
     [VERBOSE] Registering Dynamic Class: ANDS
@@ -2376,6 +2380,7 @@ def test48():
     [VERBOSE] loading plug-in: xattrib
     [VERBOSE] loading plug-in: yaml
     [VERBOSE] Loading project config from test\test48\gtool.cfg...
+    [VERBOSE] Registering the attribute indexes in [index]...
     [VERBOSE] Loading user defined classes from test\test48\classes...
     [VERBOSE] Registering Dynamic Class: TESTCLASSSFOURTEEN
     [VERBOSE] Registering Dynamic Class: SUBA
@@ -2705,8 +2710,1127 @@ def test56():
 
     print('--- test %s ends ---' % testnumber)
 
+    # expected output (vulnerabilities are listed in the order of the data folder), the ones without a cvss.txt
+    # get a single empty CVSSv2 Score cell
+    """
+    ---- testing 56 begins ----
+    ['Vulnerability ID', 'IP or URL', 'Type', 'Categorization', 'CVSSv2 Score', 'CWE Score', 'Reported', 'Description', 'Fixed']
+    ['42357', '10.0.0.17', 'Infrastructure', 'RCE', '', '53.0', '04/18/2016', 'As called mr needed praise at. Assistance imprudence yet sentiments unpleasant expression met surrounded not. Be at talked ye though secure nearer.', 'No']
+    ['42354', 'internalapp.local/admin', 'Application', 'SQLi', '', '90.0', '04/15/2016', 'Doubtful on an juvenile as of servants insisted.Judge why maids led sir whose guest drift her point.', 'No']
+    ['42356', 'otherapp.local', 'Application', 'XSS', '', '53.0', '04/17/2016', 'For norland produce age wishing. To figure on it spring season up. Her provision acuteness had excellent two why intention.', 'Yes']
+    ['42355', 'internalapp.local/portal', 'Application', 'XSS', '', '45.0', '04/16/2016', 'Him comparison especially friendship was who sufficient attachment favourable how.Luckily but minutes ask picture man perhaps are inhabit. How her good all sang more why.', 'No']
+    ['42353', '10.0.0.17', 'Infrastructure', 'Patch', '6.1', '', '12/21/2015', 'Yourself required no at thoughts delicate landlord it be. Branched dashwood do is whatever it. Farther be chapter at visited married in it pressed. By distrusts procuring be oh frankness existence believing instantly if', 'No']
+    [None, None, None, None, None, None, None, None, None]
+    [None, None, None, None, None, 'CWE Mean', None, None, None]
+    [None, None, None, None, None, 60.25, None, None, None]
+    --- test 56 ends ---
+    """
+def test57():
+    testnumber = "57"
+    outputscheme = '1'
+    output = None
+    projectpath = 'test\\test54\\'
+    print('test %s tests if the parse cache returns the same output as test 54 (run it twice to read from the cache)' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    verbose = False
+    silent = True
+    debug = False
+
+    processproject(path=projectpath,
+                   output=None,
+                   scheme=outputscheme,
+                   verbose=verbose,
+                   silent=silent,
+                   debug=debug,
+                   cache=True)
+
+    print('--- test %s ends ---' % testnumber)
+
     # expected output
     """
-    ---- testing 55 begins ----
-    --- test 55 ends ---
-    """
\ No newline at end of file
+    ---- testing 57 begins ----
+    ['ref', 'created', 'description', 'score']
+    ['12345', 'October 31 2016', 'hello world!', '1.2']
+    ['12346', 'October 31 2016', 'hello world 2!', '5.8']
+    ['12347', 'October 31 2016', 'hello world 3!', '6.4']
+    --- test 57 ends ---
+    """
+
+def test58():
+    testnumber = "58"
+    outputscheme = '1'
+    output = 'test\\test55\\test58.xlsx'
+    projectpath = 'test\\test55\\'
+    print('test %s tests if parsing data files in worker processes returns the same output as a single process' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    verbose = False
+    silent = True
+    debug = True
+
+    processproject(path=projectpath,
+                   output=output,
+                   scheme=outputscheme,
+                   verbose=verbose,
+                   silent=silent,
+                   debug=debug,
+                   jobs=2)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 58 begins ----
+    --- test 58 ends ---
+    """
+
+
+def test59():
+    testnumber = "59"
+    outputscheme = 'ndjson'
+    print('test %s tests json output in ndjson mode (one object per line followed by the aggregates)' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    sf = projectloader('test\\test42\\', dbg=False, outputscheme=outputscheme)
+
+    print('--- explore results ---')
+
+    o = pluginnamespace()['JSON']()
+
+    _ret = o.output(sf)
+
+    print(_ret)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 59 begins ----
+    --- explore results ---
+    {"data": {"num1": 10, "num2": 20, "test1": 30, "text1": "/tf2/@num1"}, "uri": "/tf1"}
+    {"data": {"num1": 15, "num2": 25, "test1": 40, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"aggregate": "Sum of Sam", "result": 25}
+    {"aggregate": "Adam Average", "result": 22.5}
+    {"aggregate": "Larry List", "result": [40, 30]}
+
+    --- test 59 ends ---
+    """
+
+
+def test60():
+    testnumber = "60"
+    outputscheme = '1'
+    print('test %s tests if the row sink returns the same rows as the grid output of test 42a' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    sf = projectloader('test\\test42\\', dbg=False, outputscheme=outputscheme)
+
+    print('--- explore results ---')
+
+    o = pluginnamespace()['GRID']()
+
+    for row in o.rows(sf):
+        print(row)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 60 begins ----
+    --- explore results ---
+    ['num1', 'num2', 'test1', 'test2', 'test3']
+    ['10', '20', '30', '15', '15']
+    ['15', '25', '40', '15', '10']
+    [None, None, None, None, None]
+    ['Sum of Sam', 'Adam Average', 'Larry List', None, None]
+    [25, 22.5, 30, None, None]
+    [None, None, 40, None, None]
+    --- test 60 ends ---
+    """
+
+
+def test61():
+    testnumber = "61"
+    print('test %s validates that rows added when the matrix grows are independent of each other' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool.core.types.matrix import Matrix
+
+    m = Matrix(startwidth=2, startheight=2)
+
+    for i in range(6):
+        m.insert(cursor=(0, i), datalist=['row %s' % i])
+
+    m.insert_rows(1, rows=2)
+    m.insert(cursor=(1, 2), datalist=['inserted'])
+    m.trim()
+
+    for row in m:
+        print(row)
+
+    print('m v util:', m.__v_utilization__())
+    print('m h util:', m.__h_utilization__())
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 61 begins ----
+    ['row 0', None]
+    [None, None]
+    [None, 'inserted']
+    ['row 1', None]
+    ['row 2', None]
+    ['row 3', None]
+    ['row 4', None]
+    ['row 5', None]
+    m v util: 8
+    m h util: 1
+    --- test 61 ends ---
+    """
+
+
+def test62():
+    testnumber = "62"
+    outputscheme = 'ndjson'
+    projectpath = 'test\\test42\\'
+    print('test %s tests if watching a project renders it once and then polls without reloading unchanged objects' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    _ret = watchproject(path=projectpath,
+                        scheme=outputscheme,
+                        silent=True,
+                        interval=0.1,
+                        iterations=2)
+
+    print('watch returned:', _ret)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 62 begins ----
+    {"data": {"num1": 10, "num2": 20, "test1": 30, "test2": 15, "test3": 15, "text1": "/tf2/@num1"}, "uri": "/tf1"}
+    {"data": {"num1": 15, "num2": 25, "test1": 40, "test2": 15, "test3": 10, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"aggregate": "Sum of Sam", "result": 25}
+    {"aggregate": "Adam Average", "result": 22.5}
+    {"aggregate": "Larry List", "result": [40, 30]}
+
+    watch returned: True
+    --- test 62 ends ---
+    """
+
+
+def test63():
+    testnumber = "63"
+    outputscheme = 'ndjson'
+    print('test %s tests if a subtree of a project renders like a whole project (as requested from gtool serve)' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    sf = projectloader('test\\test42\\', dbg=False, outputscheme=outputscheme)
+
+    print('--- explore results ---')
+
+    o = pluginnamespace()['JSON']()
+
+    print(o.output(subtree(sf, '/TF2')))
+
+    try:
+        subtree(sf, '/tf2/num1')
+    except KeyError as err:
+        print(err)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 63 begins ----
+    --- explore results ---
+    {"data": {"num1": 15, "num2": 25, "test1": 40, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"aggregate": "Sum of Sam", "result": 15}
+    {"aggregate": "Adam Average", "result": 25.0}
+    {"aggregate": "Larry List", "result": [40]}
+
+    '/tf2/num1 does not exist in the project'
+    --- test 63 ends ---
+    """
+
+
+def test64():
+    testnumber = "64"
+    print('test %s tests if two projects can be loaded into one interpreter and rendered with more than one scheme' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+
+    a = Project('test\\test42\\').load()
+    b = Project('test\\test53\\').load()
+
+    print('--- explore results ---')
+
+    print(a.render('ndjson'))
+    for row in b.render('2'):
+        print(row)
+    print(a.render('ndjson') == a.render('ndjson'))
+
+    print(sorted(a.classes))
+    print(sorted(b.classes))
+    print(sorted(a.objects))
+    print(a.object('/tf1'))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 64 begins ----
+    --- explore results ---
+    {"data": {"num1": 10, "num2": 20, "test1": 30, "test2": 15, "test3": 15, "text1": "/tf2/@num1"}, "uri": "/tf1"}
+    {"data": {"num1": 15, "num2": 25, "test1": 40, "test2": 15, "test3": 10, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"aggregate": "Sum of Sam", "result": 25}
+    {"aggregate": "Adam Average", "result": 22.5}
+    {"aggregate": "Larry List", "result": [40, 30]}
+
+    ['Ref', 'Description', 'Risk', 'Impact', 'Likelihood', 'Remediation', 'Remediation Status']
+    ['1', 'An individual human stock could gain sufficient awareness of the Matrix so as to be able to manipulate and became "The One"', 'H', 'M', 'maybe', 'Continue to kill any human stock that show signs of recognizing what the matrix is', 'Open']
+    ['2', 'An agent program could copy itself repeatedly into human stock', 'H', 'L', 'L', 'Write control code the prevents agents from copying themselves', 'Closed']
+    ['3', 'Zion may find a way to destroy the Matrix from the outside', 'H', 'M', 'H', 'Find Zion and destroy it (again)', 'Open']
+    ['4', 'Fanboys might make unlicensed content inspired by the matrix', 'H', 'H', 'H', 'Lawyers!!!', 'Closed']
+    True
+    ['CLASSONE']
+    ['RISK']
+    ['/tf1', '/tf2']
+    CLASSONE: {'num1': [10], 'num2': [20], 'text1': [/tf2/@num1]}
+    --- test 64 ends ---
+    """
+
+
+def test65():
+    testnumber = "65"
+    outputscheme = '1,ndjson'
+    projectpath = 'test\\test42\\'
+    print('test %s tests if several output schemes are rendered in threads from a single load of the project' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    processproject(path=projectpath,
+                   scheme=outputscheme,
+                   silent=True,
+                   threads=2)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 65 begins ----
+    {
+        "Aggregrates": [
+            {
+                "Sum of Sam": 25
+            },
+            {
+                "Adam Average": 22.5
+            },
+            {
+                "Larry List": [
+                    40,
+                    30
+                ]
+            }
+        ],
+        "Data": {
+            "tf1": {
+                "num1": 10,
+                "num2": 20,
+                "test1": 30,
+                "test2": 15,
+                "test3": 15
+            },
+            "tf2": {
+                "num1": 15,
+                "num2": 25,
+                "test1": 40,
+                "test2": 15,
+                "test3": 10
+            }
+        }
+    }
+    {"data": {"num1": 10, "num2": 20, "test1": 30, "test2": 15, "test3": 15, "text1": "/tf2/@num1"}, "uri": "/tf1"}
+    {"data": {"num1": 15, "num2": 25, "test1": 40, "test2": 15, "test3": 10, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"aggregate": "Sum of Sam", "result": 25}
+    {"aggregate": "Adam Average", "result": 22.5}
+    {"aggregate": "Larry List", "result": [40, 30]}
+
+    --- test 65 ends ---
+    """
+
+def test66():
+    testnumber = "66"
+    manifest = 'test\\test66\\manifest.cfg'
+    print('test %s tests if the projects of a manifest are processed with registries of their own and failures are reported' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    results = processmany(manifest, silent=True)
+    for result in results:
+        print(result['name'], result['status'], result['error'])
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 66 begins ----
+    test42 ok None
+    test53 failed Could not find [output.3] in gtool.cfg
+    --- test 66 ends ---
+    """
+
+def test67():
+    testnumber = "67"
+    print('test %s tests if plugins are indexed when a project is loaded and imported when they are first used' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.plugin import pluginbases
+
+    project = Project('test\\test42\\').load()
+
+    print('--- explore results ---')
+
+    print(project.plugins.loaded('NUMBER'))
+    print(project.plugins.loaded('JSON'))
+    print(project.render('ndjson') is not None)
+    print(project.plugins.loaded('JSON'))
+    print(project.plugins.loaded('DIRECTEDGRAPH'))
+    with project:
+        print(pluginbases('DIRECTEDGRAPH'))
+        print(pluginbases('JSON'))
+        print(pluginbases('NUMBER'))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 67 begins ----
+    --- explore results ---
+    False
+    False
+    True
+    True
+    False
+    ['TreeOutput', 'Output']
+    ['TreeOutput', 'Output']
+    ['CoreType']
+    --- test 67 ends ---
+    """
+
+def test68():
+    testnumber = "68"
+    print('test %s tests if parsed class files are reused from the project cache' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from os.path import isfile, join
+    from gtool import Project
+
+    projectpath = 'test\\test42\\'
+    a = Project(projectpath).load()
+    b = Project(projectpath).load()
+
+    print('--- explore results ---')
+
+    print(isfile(join(projectpath, '.gtool-cache', 'classes.json')))
+    print(sorted(a.classes) == sorted(b.classes))
+    print([a.classes[k].__fingerprint__ == b.classes[k].__fingerprint__ for k in sorted(a.classes)])
+    print(a.render('ndjson') == b.render('ndjson'))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 68 begins ----
+    --- explore results ---
+    True
+    True
+    [True]
+    True
+    --- test 68 ends ---
+    """
+
+
+def test69():
+    testnumber = "69"
+    print('test %s tests if classes compiled into the project cache load and render like generated classes' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from os import listdir
+    from os.path import join
+    from gtool import Project
+
+    compiled = Project('test\\test69\\').load()
+    generated = Project('test\\test42\\').load()
+
+    print('--- explore results ---')
+
+    print(hasattr(compiled.classes['CLASSONE'], '__compiled__'))
+    print(hasattr(generated.classes['CLASSONE'], '__compiled__'))
+    print(len([f for f in listdir(join('test\\test69\\', '.gtool-cache', 'compiled')) if f.endswith('.py')]))
+    print(compiled.render('ndjson') == generated.render('ndjson'))
+    print('%s' % compiled.object('/tf1').num1 == '%s' % generated.object('/tf1').num1)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 69 begins ----
+    --- explore results ---
+    True
+    False
+    1
+    True
+    True
+    --- test 69 ends ---
+    """
+
+
+def test70():
+    testnumber = "70"
+    print('test %s tests if the objects of a class share the attribute schemas and only keep their values' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+
+    project = Project('test\\test42\\').load()
+    project.render('ndjson')
+    a = project.object('/tf1')
+    b = project.object('/tf2')
+
+    print('--- explore results ---')
+
+    print(hasattr(a, '__dict__'))
+    print(sorted(type(a).__attribute_schema__) == sorted(a.dynamicproperties))
+    print(all(x.__schema__ is y.__schema__ for x, y in zip(a.__values__, b.__values__)))
+    print(a.num1 is a.num1, a.num1 is b.num1)
+    print(a.num1, b.num1, a.test1, b.test1)
+    print(list(a.__list_slots__))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 70 begins ----
+    --- explore results ---
+    False
+    True
+    True
+    True False
+    [10] [15] 30 40
+    ['num1', 'num2', 'text1']
+    --- test 70 ends ---
+    """
+
+
+def test71():
+    testnumber = "71"
+    print('test %s tests if attribute types are resolved once and kept by the attribute schemas' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+
+    project = Project('test\\test42\\').load()
+    schema = project.classes['CLASSONE'].__attribute_schema__['num1']
+
+    print('--- explore results ---')
+
+    print(schema.typeobject)
+    project.render('ndjson')
+    print(schema.typeobject is project.plugins['NUMBER'], schema.converter, schema.dynamic, schema.validationrequired)
+    print(project.object('/tf1').num1.isdynamic, schema.attribute().__convert__('12') + 1)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 71 begins ----
+    --- explore results ---
+    None
+    True <class 'int'> False True
+    False 13
+    --- test 71 ends ---
+    """
+
+
+def test72():
+    testnumber = "72"
+    print('test %s tests the validators made once per attribute by the type plugins' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.types.attributes import attributeschema
+
+    project = Project('test\\test42\\').load()
+
+    print('--- explore results ---')
+
+    with project:
+        def check(typename, kwargs, *values):
+            schema = attributeschema(typeclass=typename, singleton=False, kwargs=kwargs, parent='TEST',
+                                     attributename=typename.lower())
+            _type = schema.attrtype
+            for value in values:
+                attribute = schema.attribute()
+                try:
+                    attribute.load([_type(schema.__convert__(value))])
+                    print(typename, value, attribute)
+                except ValueError as err:
+                    print(typename, value, err)
+            return schema
+
+        check('Choice', [('choices', 'open, closed')], 'open', 'maybe')
+        check('Number', [('min', '0'), ('max', '10')], '5', '11', '-1')
+        check('Real', [('max', '1.5')], '1.5', '1.6')
+        check('String', [('maxlength', '3')], 'abc', 'abcd')
+        schema = check('Date', [('dateformat', '%Y-%m-%d'), ('displayformat', '%d/%m/%Y')], '2020-01-31', '31-01-2020')
+        print(schema.validator is schema.__validator__())
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 72 begins ----
+    --- explore results ---
+    Choice open [open]
+    Choice maybe For TEST::choice: Was expecting either one of ['open', 'closed'] but got a maybe
+    Number 5 [5]
+    Number 11 For TEST::number: Values must not be higher than 10 but we got 11
+    Number -1 For TEST::number: Values must be not be lower than 0 but we got -1
+    Real 1.5 [1.5]
+    Real 1.6 For TEST::real: Values must not be higher than 1.5 but we got 1.6
+    String abc [abc]
+    String abcd For TEST::string: Was expecting a string no more than 3 chars long but the string had a length of 4
+    Date 2020-01-31 [31/01/2020]
+    Date 31-01-2020 For TEST::date: time data '31-01-2020' does not match format '%Y-%m-%d'
+    True
+    --- test 72 ends ---
+    """
+
+
+def test73():
+    testnumber = "73"
+    print('test %s tests if equal values are shared by the objects of a project that interns values' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.interntable import interntable
+
+    project = Project('test\\test73\\').load()
+    project.render('ndjson')
+    tf1, tf2, tf3 = [project.object('/%s' % name) for name in ('tf1', 'tf2', 'tf3')]
+
+    print('--- explore results ---')
+
+    print(tf1.num1[0] is tf3.num1[0], tf2.num2[0] is tf3.num2[0], tf1.num2[0] is tf3.num2[0])
+    print(tf1.num1, tf1.num2, tf3.num1, tf3.num2, tf3.test1)
+    print(hasattr(tf1.num1[0], '__dict__'), type(tf1.num1[0]).__validators__)
+    with project:
+        print(len(interntable()))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 73 begins ----
+    --- explore results ---
+    True True False
+    [10] [20] [10] [25] 35
+    False ('min', 'max')
+    6
+    --- test 73 ends ---
+    """
+
+def test74():
+    testnumber = "74"
+    print('test %s tests if the attribute index keeps objects once, in the order they are registered' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.noderegistry import (searchByAttrib, searchByAttribAndObjectType, registerObject,
+                                         unregisterObject, objectUri)
+
+    project = Project('test\\test73\\').load()
+    project.render('ndjson')
+
+    print('--- explore results ---')
+
+    with project:
+        objects = searchByAttrib('NUM1')
+        print(len(objects), len(set(objectUri(obj) for obj in objects)))
+        print(len(searchByAttribAndObjectType('num2', 'classone')), searchByAttrib('missing'))
+        first = objects[0]
+        unregisterObject(first)
+        print([objectUri(obj) for obj in searchByAttrib('num1')] == [objectUri(obj) for obj in objects[1:]])
+        registerObject(first.__context__['file'], first)
+        print([objectUri(obj) for obj in searchByAttrib('num1')] == [objectUri(obj) for obj in objects[1:] + [first]])
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 74 begins ----
+    --- explore results ---
+    3 3
+    3 []
+    True
+    True
+    --- test 74 ends ---
+    """
+
+def test75():
+    testnumber = "75"
+    print('test %s tests if objects are found by the values of indexed and unindexed attributes' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.noderegistry import searchByAttribValue, searchByAttribRange, unregisterObject, registerObject
+
+    project = Project('test\\test75\\').load()
+    output = project.render('ndjson')
+
+    print('--- explore results ---')
+
+    print(output.splitlines()[-3:])
+    with project:
+        uris = lambda objects: [obj.__context__['file'][-7:-4] for obj in objects]
+        print(uris(searchByAttribValue('num2', 25)), uris(searchByAttribValue('TEXT1', ' /TF2/@num1')))
+        print(uris(searchByAttribRange('num2', low=20, includelow=False)), uris(searchByAttribRange('num1', high=15)))
+        print(uris(searchByAttribValue('num1', 10)), uris(searchByAttribRange('num1', low=11)))
+        tf3 = project.object('/tf3')
+        unregisterObject(tf3)
+        print(uris(searchByAttribValue('num2', 25)), uris(searchByAttribRange('num2', low=25)))
+        registerObject(tf3.__context__['file'], tf3)
+        print(uris(searchByAttribValue('num2', 25)), uris(searchByAttribRange('num2')))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 75 begins ----
+    --- explore results ---
+    ['{"aggregate": "Likely Total", "result": 50}', '{"aggregate": "Ten Total", "result": 20}', '{"aggregate": "Low Average", "result": 20.0}']
+    ['tf2', 'tf3'] ['tf1', 'tf3']
+    ['tf2', 'tf3'] ['tf1', 'tf3', 'tf2']
+    ['tf1', 'tf3'] ['tf2']
+    ['tf2'] ['tf2']
+    ['tf2', 'tf3'] ['tf1', 'tf2', 'tf3']
+    --- test 75 ends ---
+    """
+
+def test76():
+    testnumber = "76"
+    print('test %s tests if objects are found by path prefixes and patterns' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+    from gtool.core.noderegistry import (getObjectsByUriPrefix, getObjectsByUriPattern, unregisterObject,
+                                         registerObject, objectUri, uritrie, urisegments)
+
+    project = Project('test\\test76\\').load()
+    output = project.render('ndjson')
+
+    print('--- explore results ---')
+
+    print(output.splitlines()[-3:])
+    with project:
+        # objects are registered in the order the data folder is listed
+        uris = lambda objects: sorted(objectUri(obj) for obj in objects)
+        print(uris(getObjectsByUriPrefix('/RISKS/')), uris(getObjectsByUriPrefix('/ris')),
+              uris(getObjectsByUriPattern('/*/tf?')), uris(getObjectsByUriPattern('/**/tf2')))
+        tf2 = project.object('/risks/tf2')
+        unregisterObject(tf2)
+        print(uris(getObjectsByUriPrefix('/risks')), uris(getObjectsByUriPattern('/**')))
+        registerObject(tf2.__context__['file'], tf2)
+        print(uris(getObjectsByUriPattern('/risks/**')))
+
+    trie = uritrie()
+    for uri in ['/a', '/a/b', '/a/b/c', '/a/d/c', '/e/c']:
+        trie.insert(urisegments(uri), uri)
+    print(list(trie.node(['a']).objects()), list(trie.match(urisegments('/a/*/c'))),
+          list(trie.match(urisegments('/**/c'))), list(trie.match(urisegments('/a/**'))))
+    trie.remove(urisegments('/a/b/c'), '/a/b/c')
+    trie.remove(urisegments('/a/d/c'), '/a/d/c')
+    print(list(trie.children['a'].children), list(trie.objects()))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 76 begins ----
+    --- explore results ---
+    ['{"aggregate": "Subtree Total", "result": 25}', '{"aggregate": "Children Average", "result": 22.5}', '{"aggregate": "Path Listing", "result": [10]}']
+    ['/risks/tf1', '/risks/tf2'] [] ['/other/tf3', '/risks/tf1', '/risks/tf2'] ['/risks/tf2']
+    ['/risks/tf1'] ['/other/tf3', '/risks/tf1']
+    ['/risks/tf1', '/risks/tf2']
+    ['/a', '/a/b', '/a/b/c', '/a/d/c'] ['/a/b/c', '/a/d/c'] ['/a/b/c', '/a/d/c', '/e/c'] ['/a', '/a/b', '/a/b/c', '/a/d/c']
+    ['b'] ['/a', '/a/b', '/e/c']
+    --- test 76 ends ---
+    """
+
+def test77():
+    testnumber = "77"
+    print('test %s tests if aggregators with the same selector select once per output' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool import Project
+
+    project = Project('test\\test77\\').load()
+
+    calls = []
+    for aggregator in project.aggregators.values():
+        selecttype = aggregator['select']['type']
+        selecttype.__method__ = (lambda method: lambda *args: calls.append(args) or method(*args))(selecttype.__method__)
+
+    grid = project.render('2')
+    output = project.render('ndjson')
+
+    print('--- explore results ---')
+
+    rows = [row for row in grid]
+    # the listed values follow the order the data folder is listed in
+    print(rows[0], rows[5:10], sorted(row[0] for row in rows[10:]))
+    print(output.splitlines()[-3:-1], len(output.splitlines()))
+    print(len(calls), calls[0])
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 77 begins ----
+    --- explore results ---
+    ['num1', 'num2', 'test1'] [['Total', None, None], [35, None, None], ['Mean', None, None], [11.666666666666666, None, None], ['All', None, None]] [10, 10, 15]
+    ['{"aggregate": "Total", "result": 35}', '{"aggregate": "Mean", "result": 11.666666666666666}'] 6
+    2 ('num1', 'CLASSONE')
+    --- test 77 ends ---
+    """
+
+def test78():
+    outputscheme = '3'
+    testnumber = "78"
+    print('test %s tests if aggregates are the same on every csv sheet of a project' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+
+    sf = projectloader('test\\test78', dbg=False, outputscheme=outputscheme)
+
+    print('--- explore results ---')
+
+    o = pluginnamespace()['CSV']()
+
+    print(o.output(sf, output='..\\test78.csv'))
+    for sheet in ('a', 'b'):
+        with open('..\\test78_%s.csv' % sheet) as f:
+            rows = [row.strip(',') for row in f.read().splitlines()]
+        aggregates = rows[rows.index('Total'):]
+        # the listed values follow the order the data folder is listed in
+        print(sheet, aggregates[:3], sorted(aggregates[3:]))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 78 begins ----
+    --- explore results ---
+    writing to ..\\test78_a.csv
+    writing to ..\\test78_b.csv
+    True
+    a ['Total', '35', 'All'] ['10', '10', '15']
+    b ['Total', '35', 'All'] ['10', '10', '15']
+    --- test 78 ends ---
+    """
+
+def test79():
+    testnumber = "79"
+    outputscheme = 'ndjson'
+    projectpath = 'test\\test79\\'
+    print('test %s tests if the command line registers the [index] attributes and selects strings by numeric text' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool.core.noderegistry import valuenamespace, rangenamespace
+
+    processproject(path=projectpath,
+                   output=None,
+                   scheme=outputscheme,
+                   verbose=False,
+                   silent=True,
+                   debug=True)
+
+    print('--- explore results ---')
+
+    print(sorted(valuenamespace()), sorted(rangenamespace()))
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 79 begins ----
+    {"data": {"code": "42", "num1": 10, "num2": 20, "text1": "/tf2/@num1"}, "uri": "/tf1"}
+    {"data": {"code": "42.0", "num1": 15, "num2": 25, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    {"data": {"code": "42", "num1": 10, "num2": 25, "text1": "/tf2/@num1"}, "uri": "/tf3"}
+    {"aggregate": "Likely Total", "result": 50}
+    {"aggregate": "Ten Total", "result": 20}
+    {"aggregate": "Code Listing", "result": ["42", "42"]}
+    {"aggregate": "Dotted Code Listing", "result": ["42.0"]}
+    --- explore results ---
+    ['code', 'num2'] ['num2']
+    --- test 79 ends ---
+    """
+
+def test80():
+    testnumber = "80"
+    print('test %s tests if data files that fail in a worker process are reported and loaded again by the parent' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    import os
+    import warnings
+    from gtool.core.parsecache import parsecache
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        sf = projectloader('test\\test80\\', dbg=False, outputscheme='1', jobs=2)
+
+    print('--- explore results ---')
+
+    print([str(w.message).splitlines()[0] for w in caught])
+    print([(node.name, parsecache().prefetched(node.path, 'CLASSONE'))
+           for node in sorted(sf.children, key=lambda node: node.name)])
+    # dates are formatted while they are validated, so they are validated again
+    print([node.dataasobject.created for node in sf.children if node.name == 'tf1'])
+    try:
+        [node.dataasobject for node in sf.children if node.name == 'tf3']
+    except Exception as err:
+        print('tf3.txt' in '%s' % err, 'Values must not be higher than 20 but we got 30' in '%s' % err)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 80 begins ----
+    --- explore results ---
+    ['1 of 3 data nodes could not be prefetched and are loaded without the workers:']
+    [('tf1', True), ('tf2', True), ('tf3', False)]
+    [[October 31 2016]]
+    True True
+    --- test 80 ends ---
+    """
+
+def test81():
+    testnumber = "81"
+    outputscheme = 'ndjson'
+    projectpath = 'test\\test42\\'
+    print('test %s tests if gtool serve only renders POST requests to localhost and writes output into its output directory' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    import os
+    import tempfile
+    import threading
+    import http.client
+    from gtool.core.filewalker import objectmemo, registerObjectMemo
+    from gtool.core.utils.command.process import loadproject
+    from gtool.core.utils.command.serve import ProjectServer
+
+    if objectmemo() is None:
+        registerObjectMemo({})
+    projectconfig = loadproject(path=projectpath, scheme=outputscheme, silent=True)
+
+    with tempfile.TemporaryDirectory() as outputdir:
+        server = ProjectServer(('127.0.0.1', 0), projectconfig, outputscheme, outputdir=outputdir, silent=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        def request(method, url, body=None, headers=None):
+            _connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+            _connection.request(method, url, body=body, headers=headers or {})
+            _response = _connection.getresponse()
+            _ret = _response.status, _response.read().decode('utf-8').splitlines()
+            _connection.close()
+            return _ret
+
+        _form = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+        print('--- explore results ---')
+
+        print(request('GET', '/render'))
+        _status, _lines = request('POST', '/render?subtree=/tf2')
+        print(_status, _lines[0])
+        print(request('POST', '/render', headers={'Host': 'attacker.example:8421'}))
+        print(request('POST', '/render', headers={'Origin': 'http://attacker.example'}))
+        print(request('POST', '/render', body='output=../test81.json', headers=_form)[0])
+        print(request('POST', '/render', body='output=test81.json', headers=_form)[0],
+              os.path.isfile(os.path.join(outputdir, 'test81.json')))
+
+        server.shutdown()
+        server.server_close()
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 81 begins ----
+    --- explore results ---
+    (405, ['Use POST to render'])
+    200 {"data": {"num1": 15, "num2": 25, "test1": 40, "test2": 15, "test3": null, "text1": "/tf1/@num1"}, "uri": "/tf2"}
+    (403, ['Requests must be addressed to localhost'])
+    (403, ['Requests from http://attacker.example are not allowed'])
+    403
+    200 True
+    --- test 81 ends ---
+    """
+
+def test82():
+    testnumber = "82"
+    print('test %s tests if csv and excel outputs leave no partial files behind when rendering fails' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    import os
+    import tempfile
+    from gtool.plugins.csv import Csv
+    from gtool.plugins.excel import Excel
+
+    def rows(fail):
+        yield ['a', 'b']
+        if fail:
+            raise ValueError('rendering failed')
+        yield ['c', 'd']
+
+    print('--- explore results ---')
+
+    with tempfile.TemporaryDirectory() as outputdir:
+        with open(os.path.join(outputdir, 'test82_b.csv'), 'w') as f:
+            f.write('previous')
+
+        try:
+            Csv().__writecsv__(filename=os.path.join(outputdir, 'test82.csv'),
+                               outputdict={'a': rows(False), 'b': rows(True)})
+        except ValueError as err:
+            print(err)
+        with open(os.path.join(outputdir, 'test82_b.csv')) as f:
+            print(sorted(os.listdir(outputdir)), f.read())
+
+        try:
+            Excel().__writexls__(filename=os.path.join(outputdir, 'test82.xlsx'), outputdict={'a': rows(True)})
+        except ValueError as err:
+            print(err)
+        print(sorted(os.listdir(outputdir)))
+
+        Csv().__writecsv__(filename=os.path.join(outputdir, 'test82.csv'),
+                           outputdict={'a': rows(False), 'b': rows(False)})
+        Excel().__writexls__(filename=os.path.join(outputdir, 'test82.xlsx'), outputdict={'a': rows(False)})
+        with open(os.path.join(outputdir, 'test82_b.csv')) as f:
+            print(sorted(os.listdir(outputdir)), f.read().splitlines())
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 82 begins ----
+    --- explore results ---
+    writing to ...test82_a.csv
+    writing to ...test82_b.csv
+    rendering failed
+    ['test82_b.csv'] previous
+    rendering failed
+    ['test82_b.csv']
+    writing to ...test82_a.csv
+    writing to ...test82_b.csv
+    ['test82.xlsx', 'test82_a.csv', 'test82_b.csv'] ['a,b', 'c,d']
+    --- test 82 ends ---
+    """
+
+def test83():
+    testnumber = "83"
+    outputscheme = 'ndjson'
+    projectpath = 'test\\test83\\'
+    print('test %s tests if a changed file only invalidates its own objects and a failed walk keeps the old snapshot' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    import io
+    import os
+    import contextlib
+    from gtool.core.filewalker import objectmemo, registerObjectMemo
+    from gtool.core.noderegistry import nodenamespace
+    from gtool.core.utils.watcher import snapshot, invalidate
+    from gtool.core.utils.command.process import loadproject, loaddata
+    from gtool.core.utils.command.watch import refreshdata
+
+    if objectmemo() is None:
+        registerObjectMemo({})
+    projectconfig = loadproject(path=projectpath, scheme=outputscheme, silent=True)
+    dataobject = loaddata(projectconfig)
+    dataobject.dataasobject
+    datasnapshot = snapshot(projectconfig['dataroot'])
+
+    print('--- explore results ---')
+
+    print(sorted(nodenamespace()), len(objectmemo()))
+    _changed = [path for path in datasnapshot if os.path.basename(path) == 'tf1.txt']
+    print([os.path.basename(path) for path in invalidate(_changed, dataobject)])
+    print(sorted(nodenamespace()), len(objectmemo()))
+
+    # a data folder that cannot be walked (a file here) is reported and walked again by the next call
+    _broken = dict(projectconfig, dataroot=_changed[0])
+    with contextlib.redirect_stdout(io.StringIO()) as reported:
+        _structure, _snapshot, _changed = refreshdata(_broken, dataobject, datasnapshot)
+    print(reported.getvalue().startswith('While processing the data structure an error occurred'))
+    print(_structure is dataobject, _snapshot is datasnapshot, _changed)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 83 begins ----
+    --- explore results ---
+    ['/tf1', '/tf10', '/tf2'] 3
+    ['tf1.txt']
+    ['/tf10', '/tf2'] 2
+    True
+    True True set()
+    --- test 83 ends ---
+    """
+
+def test84():
+    testnumber = "84"
+    outputscheme = 'ndjson'
+    print('test %s tests if an output with aggregates leaves no object memo registered behind' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    from gtool.core.filewalker import objectmemo
+
+    sf = projectloader('test\\test42\\', dbg=False, outputscheme=outputscheme)
+
+    print('--- explore results ---')
+
+    o = pluginnamespace()['JSON']()
+
+    print(objectmemo())
+    print(o.output(sf).splitlines()[-3:])
+    print(objectmemo())
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 84 begins ----
+    --- explore results ---
+    None
+    ['{"aggregate": "Sum of Sam", "result": 25}', '{"aggregate": "Adam Average", "result": 22.5}', '{"aggregate": "Larry List", "result": [40, 30]}']
+    None
+    --- test 84 ends ---
+    """
+
+def test85():
+    testnumber = "85"
+    print('test %s validates that a matrix is indexed like a list but cannot be used as an index itself' % testnumber)
+    print('---- testing %s begins ----' % testnumber)
+    import operator
+    from gtool.core.types.matrix import Matrix
+
+    m = Matrix(startwidth=2, startheight=2)
+    m.insert(cursor=(0, 0), datalist=['a', 'b'])
+    m.insert(cursor=(0, 1), datalist=['c', 'd'])
+    m.trim()
+
+    print(m.getrow(-1), m.getcol(-2))
+    try:
+        m.getrow(2)
+    except IndexError as err:
+        print(err)
+    try:
+        operator.index(m)
+    except TypeError as err:
+        print(err)
+
+    print('--- test %s ends ---' % testnumber)
+
+    # expected output
+    """
+    ---- testing 85 begins ----
+    ['c', 'd'] ['a', 'c']
+    row 2 is outside of the matrix
+    'Matrix' object cannot be interpreted as an integer
+    --- test 85 ends ---
+    """
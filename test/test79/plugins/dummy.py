@@ -0,0 +1,10 @@
+class Dummy():
+
+    def __init__(self):
+        pass
+
+    def __test__(self):
+        pass
+
+def load():
+    return Dummy
\ No newline at end of file